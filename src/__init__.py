@@ -16,12 +16,54 @@ from .trip_planner_agent import (
     format_itinerary
 )
 
+from .activity_selection import select_activities
+from .routing import haversine_matrix, optimize_route
+from .candidate_scoring import (
+    CandidateBatch,
+    CandidateScores,
+    ScoringWeights,
+    score_candidates
+)
+
+from .pareto import non_dominated_sort, pareto_front
+from .poi_catalog import POI, POICatalog, POISearchTool, generate_synthetic_catalog
+from .time_windows import (
+    OpeningHoursIndex,
+    Violation,
+    check_day_plan,
+    check_days_batch,
+    check_plans_batch,
+    repair_day_plan
+)
+from .itinerary_editor import ItineraryEditor
+from .budget_ledger import BudgetLedger
+from .cost_simulation import CostRiskReport, simulate_costs, simulate_itinerary
+from .booking_providers import BookingFanOut, BookingProvider, FanOutResult, SimulatedProvider
+from .availability import AvailabilityCalendar, generate_synthetic_availability
+from .hotel_inventory import HotelInventory, HotelWeights, Property, generate_synthetic_inventory
+from .savings import Substitution, SubstitutionTable
+from .currency import FXTable, convert_itineraries, convert_itinerary, load_fx_table
+
 from .evaluation import (
     AgentEvaluator,
     EvaluationMetric,
     EvaluationResult,
-    run_evaluation_suite
+    EVALUATION_SCENARIOS,
+    EvaluationCache,
+    ItineraryColumns,
+    MetricTable,
+    ResourceThresholds,
+    ResultStream,
+    planner_fingerprint,
+    read_results,
+    score_columns,
+    summarize_results,
+    run_evaluation_suite,
+    run_scenarios
 )
+from .interest_matcher import InterestMatcher, compile_interests
+from .scenario_generator import ScenarioDistribution, generate_scenarios
+from .load_testing import LoadTestReport, run_load_test
 
 __version__ = "1.0.0"
 __author__ = "Trip Planner Assistant Team"
@@ -36,8 +78,65 @@ __all__ = [
     "SessionState",
     "CoordinatorAgent",
     "format_itinerary",
+    "select_activities",
+    "haversine_matrix",
+    "optimize_route",
+    "CandidateBatch",
+    "CandidateScores",
+    "ScoringWeights",
+    "score_candidates",
+    "non_dominated_sort",
+    "pareto_front",
+    "POI",
+    "POICatalog",
+    "POISearchTool",
+    "generate_synthetic_catalog",
+    "OpeningHoursIndex",
+    "Violation",
+    "check_day_plan",
+    "check_days_batch",
+    "check_plans_batch",
+    "repair_day_plan",
+    "ItineraryEditor",
+    "BudgetLedger",
+    "CostRiskReport",
+    "simulate_costs",
+    "simulate_itinerary",
+    "BookingFanOut",
+    "BookingProvider",
+    "FanOutResult",
+    "SimulatedProvider",
+    "AvailabilityCalendar",
+    "generate_synthetic_availability",
+    "HotelInventory",
+    "HotelWeights",
+    "Property",
+    "generate_synthetic_inventory",
+    "Substitution",
+    "SubstitutionTable",
+    "FXTable",
+    "convert_itineraries",
+    "convert_itinerary",
+    "load_fx_table",
     "AgentEvaluator",
     "EvaluationMetric",
     "EvaluationResult",
-    "run_evaluation_suite"
+    "EVALUATION_SCENARIOS",
+    "EvaluationCache",
+    "ItineraryColumns",
+    "MetricTable",
+    "ResourceThresholds",
+    "ResultStream",
+    "planner_fingerprint",
+    "read_results",
+    "score_columns",
+    "summarize_results",
+    "run_evaluation_suite",
+    "run_scenarios",
+    "InterestMatcher",
+    "compile_interests",
+    "ScenarioDistribution",
+    "generate_scenarios",
+    "LoadTestReport",
+    "run_load_test"
 ]
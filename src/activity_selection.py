@@ -0,0 +1,94 @@
+"""
+Budget-constrained activity selection
+0/1 knapsack over discretized costs, maximizing interest-match score
+"""
+
+import heapq
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_MAX_CAPACITY = 2048  # Upper bound on discretized budget cells
+
+
+def select_activities(costs: Sequence[float], scores: Sequence[float],
+                      budget: float, max_items: Optional[int] = None,
+                      resolution: float = 1.0,
+                      max_capacity: int = DEFAULT_MAX_CAPACITY) -> List[int]:
+    """Pick the candidate subset with the highest total score within budget.
+
+    Costs are rounded up to multiples of ``resolution`` (coarsened further so
+    the budget never spans more than ``max_capacity`` cells), so the chosen
+    subset always fits the real budget. ``max_items`` caps how many
+    candidates may be picked, e.g. the free slots in a day.
+
+    Returns indices into ``costs``/``scores`` in ascending order.
+    """
+    costs = np.asarray(costs, dtype=float)
+    scores = np.asarray(scores, dtype=float)
+    if budget < 0 or len(costs) == 0 or max_items == 0:
+        return []
+
+    candidates = np.flatnonzero(scores > 0)
+    if max_items is not None:
+        candidates = _prune_dominated(costs, scores, candidates, max_items)
+
+    step = max(resolution, budget / max_capacity)
+    capacity = int(np.floor(budget / step + 1e-9))
+    weights = np.ceil(costs[candidates] / step - 1e-9).astype(int)
+    fits = weights <= capacity
+    candidates, weights = candidates[fits], weights[fits]
+    if len(candidates) == 0:
+        return []
+
+    # dp[j, w]: best score using at most j items (row 0 = nothing picked) and
+    # at most w cost cells. Without an item cap a single row is reused.
+    if max_items is not None:
+        dp = np.zeros((max_items + 1, capacity + 1))
+        src, dst = slice(0, max_items), slice(1, max_items + 1)
+    else:
+        dp = np.zeros((1, capacity + 1))
+        src = dst = slice(0, 1)
+    take = np.zeros((len(candidates), dp[dst].shape[0], capacity + 1), dtype=bool)
+
+    for i, (weight, score) in enumerate(zip(weights, scores[candidates])):
+        candidate = dp[src, :capacity + 1 - weight] + score
+        improved = candidate > dp[dst, weight:]
+        dp[dst, weight:] = np.where(improved, candidate, dp[dst, weight:])
+        take[i, :, weight:] = improved
+
+    chosen = []
+    row = take.shape[1] - 1
+    cell = capacity
+    for i in range(len(candidates) - 1, -1, -1):
+        if take[i, row, cell]:
+            chosen.append(int(candidates[i]))
+            cell -= weights[i]
+            if max_items is not None:
+                if row == 0:
+                    break
+                row -= 1
+
+    return sorted(chosen)
+
+
+def _prune_dominated(costs: np.ndarray, scores: np.ndarray,
+                     candidates: np.ndarray, max_items: int) -> np.ndarray:
+    """Drop candidates beaten on cost and score by at least max_items others.
+
+    An optimal pick of at most max_items never needs such a candidate: one of
+    its dominators is always free to take its place.
+    """
+    order = candidates[np.lexsort((-scores[candidates], costs[candidates]))]
+    best: List[float] = []  # min-heap of the top max_items scores seen so far
+    kept = []
+    for index in order:
+        score = scores[index]
+        if len(best) < max_items:
+            heapq.heappush(best, score)
+            kept.append(index)
+        elif score > best[0]:
+            heapq.heapreplace(best, score)
+            kept.append(index)
+    return np.sort(np.asarray(kept, dtype=int))
@@ -0,0 +1,116 @@
+"""
+Accommodation availability calendars
+One bit per property and night; a stay is free when every bit of its window is set
+"""
+
+from datetime import date
+from typing import Optional, Union
+
+import numpy as np
+
+
+DEFAULT_HORIZON_NIGHTS = 366
+
+DateLike = Union[str, date]
+
+
+def _as_date(value: DateLike) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class AvailabilityCalendar:
+    """Free nights for many properties, packed eight nights per byte.
+
+    Bit n % 8 of byte n // 8 in a property's row is set when night n after
+    start is free. A date-range query packs the stay window the same way
+    and ANDs it against the few bytes it spans for every row at once.
+    Nights outside the calendar are unknown and treated as free.
+    """
+
+    def __init__(self, num_properties: int, start: DateLike,
+                 num_nights: int = DEFAULT_HORIZON_NIGHTS, available: bool = True):
+        self.start = _as_date(start)
+        self.num_nights = num_nights
+        fill = 0xFF if available else 0x00
+        self._bits = np.full((num_properties, (num_nights + 7) // 8), fill, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    @classmethod
+    def from_matrix(cls, start: DateLike, free: np.ndarray) -> "AvailabilityCalendar":
+        """Calendar from a (properties, nights) boolean matrix of free nights"""
+        free = np.asarray(free, dtype=bool)
+        calendar = cls(free.shape[0], start, free.shape[1])
+        calendar._bits = np.packbits(free, axis=1, bitorder="little")
+        return calendar
+
+    def to_matrix(self) -> np.ndarray:
+        """Free nights as a (properties, nights) boolean matrix"""
+        return np.unpackbits(self._bits, axis=1, count=self.num_nights,
+                             bitorder="little").astype(bool)
+
+    def is_available(self, rows, check_in: DateLike, check_out: DateLike) -> np.ndarray:
+        """Whether each property row is free every night from check_in up to check_out"""
+        rows = np.asarray(rows, dtype=np.intp)
+        window = self._window(check_in, check_out)
+        if window is None:
+            return np.ones(len(rows), dtype=bool)
+        lo, hi, mask = window
+        return np.all((self._bits[rows, lo:hi] & mask) == mask, axis=1)
+
+    def available_rows(self, rows, check_in: DateLike, check_out: DateLike) -> np.ndarray:
+        """The subset of rows free for the whole stay, order kept"""
+        rows = np.asarray(rows, dtype=np.intp)
+        return rows[self.is_available(rows, check_in, check_out)]
+
+    def set_available(self, row: int, check_in: DateLike, check_out: DateLike,
+                      available: bool = True):
+        """Mark a property free (or taken) for every night of a stay"""
+        window = self._window(check_in, check_out)
+        if window is None:
+            return
+        lo, hi, mask = window
+        if available:
+            self._bits[row, lo:hi] |= mask
+        else:
+            self._bits[row, lo:hi] &= ~mask
+
+    def book(self, row: int, check_in: DateLike, check_out: DateLike):
+        """Take a property for a stay; raises ValueError if any night is already taken"""
+        if not self.is_available([row], check_in, check_out)[0]:
+            raise ValueError(f"Property {row} is not free from {check_in} to {check_out}")
+        self.set_available(row, check_in, check_out, available=False)
+
+    def _window(self, check_in: DateLike, check_out: DateLike) -> Optional[tuple]:
+        """(first byte, end byte, packed mask) of the nights the calendar covers"""
+        first = (_as_date(check_in) - self.start).days
+        last = (_as_date(check_out) - self.start).days
+        if last <= first:
+            raise ValueError("check_out must be after check_in")
+        first, last = max(first, 0), min(last, self.num_nights)
+        if last <= first:
+            return None
+        lo, hi = first // 8, (last + 7) // 8
+        nights = np.zeros((hi - lo) * 8, dtype=bool)
+        nights[first - lo * 8:last - lo * 8] = True
+        return lo, hi, np.packbits(nights, bitorder="little")
+
+
+def generate_synthetic_availability(num_properties: int, start: DateLike,
+                                    num_nights: int = DEFAULT_HORIZON_NIGHTS,
+                                    occupancy: float = 0.6, mean_stay: float = 3.0,
+                                    seed: int = 0) -> AvailabilityCalendar:
+    """Calendar where bookings come in multi-night runs at roughly the given occupancy"""
+    rng = np.random.default_rng(seed)
+    # Two-state chain: a stay ends with probability 1 / mean_stay, and
+    # starts at the rate that keeps the long-run share of taken nights at occupancy
+    end_p = 1.0 / mean_stay
+    start_p = min(1.0, end_p * occupancy / max(1.0 - occupancy, 1e-9))
+    taken = rng.random(num_properties) < occupancy
+    free = np.empty((num_properties, num_nights), dtype=bool)
+    for night in range(num_nights):
+        flips = rng.random(num_properties)
+        taken = np.where(taken, flips >= end_p, flips < start_p)
+        free[:, night] = ~taken
+    return AvailabilityCalendar.from_matrix(start, free)
@@ -0,0 +1,260 @@
+"""
+Performance benchmarks for the Trip Planner Agent
+Times the hot paths, saves a JSON baseline and flags regressions against it
+"""
+
+import copy
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import structlog
+
+from evaluation import AgentEvaluator
+from scenario_generator import ScenarioDistribution, generate_scenarios
+from trip_planner_agent import CoordinatorAgent, MemoryBank, TripItinerary, format_itinerary
+
+logger = structlog.get_logger()
+
+
+DEFAULT_BASELINE_PATH = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.3  # Fail when a benchmark gets this much slower or hungrier
+MEMORY_BANK_SIZES = (10_000, 100_000, 1_000_000)
+BATCH_SIZE = 20
+MIN_SAMPLE_S = 0.001  # Fast benchmarks are looped so one sample lasts at least this long
+# Slowdowns smaller than this many milliseconds are timer noise, whatever their percentage
+NOISE_FLOOR_MS = 0.02
+
+# A benchmark is built once by its setup, then its returned callable is timed repeatedly
+Benchmark = Callable[[], Callable[[], object]]
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory of one benchmark"""
+    name: str
+    rounds: int
+    median_ms: float
+    p95_ms: float
+    min_ms: float
+    peak_kb: float  # Peak traced allocation during one extra untimed call
+    calls_per_round: int = 1
+
+
+@dataclass
+class Regression:
+    """A benchmark that got worse than its baseline by more than the threshold"""
+    name: str
+    measure: str  # 'median_ms' or 'peak_kb'
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1.0
+
+
+def _sample_requirements():
+    """One fixed five-day trip"""
+    return generate_scenarios(1, ScenarioDistribution(trip_days=(5, 5)), seed=11)[0][1]
+
+
+def _sample_itinerary(coordinator: Optional[CoordinatorAgent] = None) -> TripItinerary:
+    return (coordinator or CoordinatorAgent()).process_request(_sample_requirements())
+
+
+def bench_process_request() -> Callable[[], object]:
+    coordinator = CoordinatorAgent()
+    requirements = _sample_requirements()
+    return lambda: coordinator.process_request(requirements)
+
+
+def bench_batch_throughput() -> Callable[[], object]:
+    coordinator = CoordinatorAgent()
+    batch = [requirements for _, requirements in generate_scenarios(BATCH_SIZE, seed=12)]
+    return lambda: [coordinator.process_request(requirements) for requirements in batch]
+
+
+def bench_memory_bank(num_trips: int) -> Benchmark:
+    """get_similar_trips over num_trips stored itineraries spread across ten destinations"""
+    def setup():
+        coordinator = CoordinatorAgent()
+        templates = [coordinator.process_request(requirements)
+                     for _, requirements in generate_scenarios(10, seed=13)]
+        bank = MemoryBank()
+        # Shallow copies share days and bookings, so a million trips stay affordable
+        bank.past_trips = [copy.copy(templates[n % len(templates)]) for n in range(num_trips)]
+        destination = templates[0].requirements.destination.split(",")[0]
+        return lambda: bank.get_similar_trips(destination)
+    return setup
+
+
+def bench_serialization() -> Callable[[], object]:
+    itinerary = _sample_itinerary()
+    return lambda: json.dumps(asdict(itinerary), default=str)
+
+
+def bench_format_itinerary() -> Callable[[], object]:
+    itinerary = _sample_itinerary()
+    return lambda: format_itinerary(itinerary)
+
+
+def bench_evaluator_metrics() -> Callable[[], object]:
+    evaluator = AgentEvaluator()
+    itinerary = _sample_itinerary(evaluator.coordinator)
+    return lambda: (evaluator.evaluate_budget_adherence(itinerary),
+                    evaluator.evaluate_day_coverage(itinerary),
+                    evaluator.evaluate_activity_density(itinerary),
+                    evaluator.evaluate_preference_matching(itinerary),
+                    evaluator.evaluate_iteration_efficiency(itinerary))
+
+
+def default_benchmarks(memory_bank_sizes: Sequence[int] = MEMORY_BANK_SIZES) -> Dict[str, Benchmark]:
+    benchmarks: Dict[str, Benchmark] = {
+        "process_request": bench_process_request,
+        f"batch_throughput_{BATCH_SIZE}": bench_batch_throughput,
+    }
+    for size in memory_bank_sizes:
+        benchmarks[f"memory_bank_similar_{size}"] = bench_memory_bank(size)
+    benchmarks.update({
+        "itinerary_serialization": bench_serialization,
+        "format_itinerary": bench_format_itinerary,
+        "evaluator_metrics": bench_evaluator_metrics,
+    })
+    return benchmarks
+
+
+def time_benchmark(name: str, setup: Benchmark, min_rounds: int = 5,
+                   max_rounds: int = 200, min_time_s: float = 0.5) -> BenchmarkResult:
+    """Time a benchmark until it has min_time_s of samples or max_rounds rounds.
+    
+    Times are per call; a round repeats the call often enough to outlast timer noise.
+    """
+    fn = setup()
+    start = time.perf_counter()
+    fn()  # Warms caches and calibrates the round length
+    calls = max(1, int(MIN_SAMPLE_S / max(time.perf_counter() - start, 1e-9)))
+    samples = []
+    elapsed = 0.0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # Keep collector pauses out of individual samples
+    try:
+        while len(samples) < min_rounds or (elapsed < min_time_s and len(samples) < max_rounds):
+            start = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            sample = time.perf_counter() - start
+            samples.append(sample / calls)
+            elapsed += sample
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ms = np.array(samples) * 1000
+    result = BenchmarkResult(
+        name=name,
+        rounds=len(samples),
+        median_ms=float(np.median(ms)),
+        p95_ms=float(np.percentile(ms, 95)),
+        min_ms=float(ms.min()),
+        peak_kb=peak / 1024,
+        calls_per_round=calls
+    )
+    logger.info("benchmark.completed", **asdict(result))
+    return result
+
+
+def run_benchmarks(benchmarks: Optional[Dict[str, Benchmark]] = None,
+                   only: Optional[Sequence[str]] = None, **timing) -> List[BenchmarkResult]:
+    """Run benchmarks (all defaults unless given), optionally only the named ones"""
+    benchmarks = benchmarks if benchmarks is not None else default_benchmarks()
+    return [time_benchmark(name, setup, **timing)
+            for name, setup in benchmarks.items() if only is None or name in only]
+
+
+def save_baseline(results: Sequence[BenchmarkResult], path: str = DEFAULT_BASELINE_PATH):
+    """Write results as the new baseline"""
+    with open(path, "w") as f:
+        json.dump({r.name: asdict(r) for r in results}, f, indent=2)
+
+
+def load_baseline(path: str = DEFAULT_BASELINE_PATH) -> Dict[str, BenchmarkResult]:
+    with open(path) as f:
+        return {name: BenchmarkResult(**entry) for name, entry in json.load(f).items()}
+
+
+def find_regressions(results: Sequence[BenchmarkResult],
+                     baseline: Dict[str, BenchmarkResult],
+                     threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """Benchmarks whose median time or peak memory grew by more than threshold.
+
+    Benchmarks missing from the baseline are new and never regress.
+    """
+    regressions = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None:
+            continue
+        if (result.median_ms > before.median_ms * (1 + threshold)
+                and result.median_ms - before.median_ms > NOISE_FLOOR_MS):
+            regressions.append(Regression(result.name, "median_ms", before.median_ms, result.median_ms))
+        if before.peak_kb > 0 and result.peak_kb > before.peak_kb * (1 + threshold):
+            regressions.append(Regression(result.name, "peak_kb", before.peak_kb, result.peak_kb))
+    return regressions
+
+
+def print_benchmark_results(results: Sequence[BenchmarkResult],
+                            baseline: Optional[Dict[str, BenchmarkResult]] = None):
+    """Display results, with the change against baseline when there is one"""
+    print(f"{'Benchmark':<32} {'median':>10} {'p95':>10} {'peak':>10} {'vs base':>9}")
+    print("-" * 75)
+    for r in results:
+        change = ""
+        if baseline and r.name in baseline and baseline[r.name].median_ms > 0:
+            change = f"{(r.median_ms / baseline[r.name].median_ms - 1) * 100:+.0f}%"
+        print(f"{r.name:<32} {r.median_ms:>8.3f}ms {r.p95_ms:>8.3f}ms "
+              f"{r.peak_kb:>8.0f}KB {change:>9}")
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    """Run every benchmark; '--save' writes the baseline, otherwise compare against it.
+
+    Returns a non-zero exit status when any benchmark regressed.
+    """
+    path = os.environ.get("BENCHMARK_BASELINE", DEFAULT_BASELINE_PATH)
+    threshold = float(os.environ.get("BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD))
+    baseline = load_baseline(path) if os.path.exists(path) else None
+
+    results = run_benchmarks()
+    print_benchmark_results(results, baseline)
+
+    if "--save" in argv or baseline is None:
+        save_baseline(results, path)
+        print(f"\n✓ Baseline saved to {path}")
+        return 0
+    regressions = find_regressions(results, baseline, threshold)
+    for regression in regressions:
+        print(f"✗ {regression.name}: {regression.measure} {regression.baseline:.3f} → "
+              f"{regression.current:.3f} ({regression.change * 100:+.0f}%)")
+    if not regressions:
+        print(f"\n✓ No regressions beyond {threshold * 100:.0f}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    # Keep agent logging (and its formatting cost) out of the terminal
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(open(os.devnull, "w")))
+    sys.exit(main(sys.argv[1:]))
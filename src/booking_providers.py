@@ -0,0 +1,246 @@
+"""
+Booking provider fan-out
+Queries every registered provider concurrently, returns once enough good options arrive
+or a deadline passes, and hedges slow providers with a duplicate request
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+
+DEFAULT_MIN_OPTIONS = 3
+DEFAULT_DEADLINE_S = 1.0
+DEFAULT_HEDGE_AFTER_S = 0.2  # Used until a provider has latency history
+HEDGE_QUANTILE = 90  # Hedge once a request is slower than this share of past ones
+LATENCY_HISTORY = 50
+MAX_IN_FLIGHT = 2  # Requests per provider at once, across searches: one plus its hedge
+MIN_GOOD_RATING = 3.5
+
+Option = Dict[str, Any]  # name, type, price, rating and optionally url, features, currency
+
+
+class ProviderError(Exception):
+    """A provider failed to answer a search"""
+
+
+class BookingProvider(ABC):
+    """Source of booking options; subclasses implement search"""
+
+    name = "provider"
+
+    @abstractmethod
+    def search(self, requirements) -> List[Option]:
+        """Options for the requirements; raise ProviderError when there is no answer"""
+
+
+class SimulatedProvider(BookingProvider):
+    """Local stand-in returning fixed options after a random delay.
+
+    Latency is lognormal around median_ms, so a few requests are much slower
+    than the rest, and each request fails with probability failure_rate.
+    """
+
+    def __init__(self, name: str, options: Sequence[Option], median_ms: float = 50.0,
+                 latency_sigma: float = 0.5, failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.name = name
+        self.options = [dict(option) for option in options]
+        self.median_ms = median_ms
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def search(self, requirements) -> List[Option]:
+        with self._lock:
+            self.calls += 1
+            delay_s = self.median_ms * float(np.exp(self._rng.normal(0.0, self.latency_sigma))) / 1000
+            fails = self._rng.random() < self.failure_rate
+        time.sleep(delay_s)
+        if fails:
+            raise ProviderError(f"{self.name} did not respond")
+        return [dict(option, provider=self.name) for option in self.options]
+
+
+@dataclass
+class FanOutResult:
+    """Options gathered by one fan-out and what each provider did"""
+    options: List[Option] = field(default_factory=list)
+    responded: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    pending: List[str] = field(default_factory=list)  # Still running when we returned
+    hedged: List[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+
+def is_good_option(option: Option) -> bool:
+    return option.get("rating", 0.0) >= MIN_GOOD_RATING
+
+
+class BookingFanOut:
+    """Concurrent search over registered providers with first-N-wins and hedging.
+
+    Every provider is asked at once. As soon as min_options good options
+    have arrived, or the deadline passes, whatever has been collected is
+    returned and stragglers finish in the background. A provider still
+    silent after its usual latency (the HEDGE_QUANTILE of its recent
+    requests) gets a duplicate request, and the first answer wins.
+
+    Each provider has its own MAX_IN_FLIGHT threads, so stragglers from a
+    slow provider never hold up the others. A provider that still has
+    MAX_IN_FLIGHT requests running from earlier searches is not asked
+    again until one finishes, and is reported as pending. close(), or
+    leaving a with block, shuts those threads down.
+    """
+
+    def __init__(self, providers: Sequence[BookingProvider] = (),
+                 min_options: int = DEFAULT_MIN_OPTIONS,
+                 deadline_s: float = DEFAULT_DEADLINE_S,
+                 hedge_after_s: float = DEFAULT_HEDGE_AFTER_S,
+                 hedging: bool = True):
+        self.providers: List[BookingProvider] = []
+        self.min_options = min_options
+        self.deadline_s = deadline_s
+        self.hedge_after_s = hedge_after_s
+        self.hedging = hedging
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._in_flight: Dict[str, int] = {}
+        for provider in providers:
+            self.register(provider)
+
+    def register(self, provider: BookingProvider):
+        self.providers.append(provider)
+        self._latencies.setdefault(provider.name, deque(maxlen=LATENCY_HISTORY))
+        self._in_flight.setdefault(provider.name, 0)
+        if provider.name not in self._executors:
+            self._executors[provider.name] = ThreadPoolExecutor(
+                max_workers=MAX_IN_FLIGHT, thread_name_prefix=f"booking-{provider.name}")
+
+    def hedge_delay(self, provider: BookingProvider) -> float:
+        """How long to wait on a provider before sending a duplicate request"""
+        with self._lock:
+            history = list(self._latencies[provider.name])
+        if len(history) < 5:
+            return self.hedge_after_s
+        return float(np.percentile(history, HEDGE_QUANTILE))
+
+    def search(self, requirements,
+               is_good: Callable[[Option], bool] = is_good_option) -> FanOutResult:
+        """Fan out one search and collect options until enough are good or time runs out"""
+        start = time.perf_counter()
+        deadline = start + self.deadline_s
+        result = FanOutResult()
+        if not self.providers:
+            return result
+
+        futures: Dict[Future, Tuple[BookingProvider, float]] = {}
+        hedge_at: Dict[str, float] = {}
+        answered = set()
+        busy = set()  # Providers with no capacity left for this search's first request
+        hedge_tried = set()
+        seen = {}
+        good = 0
+
+        def submit(provider: BookingProvider) -> bool:
+            with self._lock:
+                if self._in_flight[provider.name] >= MAX_IN_FLIGHT:
+                    return False
+                self._in_flight[provider.name] += 1
+            future = self._executors[provider.name].submit(provider.search, requirements)
+            future.add_done_callback(lambda _: self._finished(provider.name))
+            futures[future] = (provider, time.perf_counter())
+            return True
+
+        def hedge(provider: BookingProvider) -> bool:
+            hedge_tried.add(provider.name)
+            if submit(provider):
+                result.hedged.append(provider.name)
+                return True
+            return False
+
+        for provider in self.providers:
+            if not submit(provider):
+                busy.add(provider.name)
+            hedge_at[provider.name] = start + self.hedge_delay(provider)
+
+        while futures and good < self.min_options:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            waiting = [p for p in self.providers if p.name not in answered | busy]
+            if self.hedging:
+                for provider in waiting:
+                    if provider.name not in hedge_tried and now >= hedge_at[provider.name]:
+                        hedge(provider)
+            next_hedge = min((hedge_at[p.name] for p in waiting
+                              if self.hedging and p.name not in hedge_tried), default=deadline)
+            done, _ = wait(list(futures), timeout=max(0.0, min(deadline, next_hedge) - now),
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                provider, sent_at = futures.pop(future)
+                if provider.name in answered:
+                    continue  # The other copy of a hedged request already won
+                try:
+                    options = future.result()
+                except Exception as error:
+                    logger.info("booking_fan_out.provider_failed",
+                                provider=provider.name, error=str(error))
+                    if any(p.name == provider.name for p, _ in futures.values()):
+                        continue  # Its other copy may still answer
+                    # Fail fast into the hedge instead of waiting for the timer
+                    if self.hedging and provider.name not in hedge_tried and hedge(provider):
+                        continue
+                    answered.add(provider.name)
+                    result.failed.append(provider.name)
+                    continue
+                answered.add(provider.name)
+                result.responded.append(provider.name)
+                with self._lock:
+                    self._latencies[provider.name].append(time.perf_counter() - sent_at)
+                for option in options:
+                    key = (option["name"], option["type"])
+                    if key not in seen:
+                        seen[key] = option
+                        good += is_good(option)
+                    elif option["price"] < seen[key]["price"]:
+                        seen[key] = option
+
+        result.options = list(seen.values())
+        result.pending = [p.name for p in self.providers if p.name not in answered]
+        result.elapsed_s = time.perf_counter() - start
+        logger.info("booking_fan_out.completed",
+                    num_options=len(result.options),
+                    responded=result.responded,
+                    pending=result.pending,
+                    hedged=result.hedged,
+                    elapsed_s=round(result.elapsed_s, 4))
+        return result
+
+    def close(self, wait: bool = False):
+        """Shut down every provider's threads; requests already running are waited on only if wait"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> "BookingFanOut":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _finished(self, provider_name: str):
+        with self._lock:
+            self._in_flight[provider_name] -= 1
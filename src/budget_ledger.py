@@ -0,0 +1,79 @@
+"""
+Incremental budget ledger
+Running per-day, per-category and overall totals updated in O(1) per change
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+MEAL_CATEGORY = "meal"
+
+
+@dataclass
+class BudgetLedger:
+    """Running cost totals for one itinerary.
+
+    Activities are recorded as they are added, removed or re-priced, so
+    totals never need a full pass over the itinerary. Fixed costs such as
+    accommodation and transportation are kept separately from day spend.
+    """
+    day_totals: Dict[int, float] = field(default_factory=dict)
+    category_totals: Dict[str, float] = field(default_factory=dict)
+    fixed_costs: Dict[str, float] = field(default_factory=dict)
+    meals: float = 0.0
+    activities: float = 0.0  # Non-meal day spend
+    total: float = 0.0
+
+    def record(self, day_number: int, category: str, amount: float):
+        """Add amount (negative to subtract) to a day and category"""
+        self.day_totals[day_number] = self.day_totals.get(day_number, 0.0) + amount
+        self.category_totals[category] = self.category_totals.get(category, 0.0) + amount
+        if category == MEAL_CATEGORY:
+            self.meals += amount
+        else:
+            self.activities += amount
+        self.total += amount
+
+    def add_activity(self, day_number: int, activity):
+        self.record(day_number, activity.category, activity.cost)
+
+    def remove_activity(self, day_number: int, activity):
+        self.record(day_number, activity.category, -activity.cost)
+
+    def replace_activity(self, day_number: int, old, new):
+        """Swap one activity for another, e.g. a cheaper substitute"""
+        self.remove_activity(day_number, old)
+        self.add_activity(day_number, new)
+
+    def set_fixed(self, name: str, amount: float):
+        """Set a fixed cost such as "accommodation" or "transportation\""""
+        self.total += amount - self.fixed_costs.get(name, 0.0)
+        self.fixed_costs[name] = amount
+
+    def fixed(self, name: str) -> float:
+        return self.fixed_costs.get(name, 0.0)
+
+    def day_total(self, day_number: int) -> float:
+        return self.day_totals.get(day_number, 0.0)
+
+    def drop_day(self, day_number: int):
+        """Forget an emptied day and renumber the days after it.
+
+        Callers remove the day's activities first so category totals stay right.
+        """
+        self.day_totals.pop(day_number, None)
+        self.day_totals = {
+            (n - 1 if n > day_number else n): amount
+            for n, amount in self.day_totals.items()
+        }
+
+    @classmethod
+    def from_days(cls, days) -> "BudgetLedger":
+        """Build a ledger from existing DayPlans in one pass"""
+        ledger = cls()
+        for day in days:
+            ledger.day_totals.setdefault(day.day_number, 0.0)
+            for activity in day.activities:
+                ledger.add_activity(day.day_number, activity)
+        return ledger
@@ -0,0 +1,131 @@
+"""
+Batched scoring of candidate itineraries
+Scores thousands of variants of one request in a single NumPy pass
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from interest_matcher import activity_text, compile_interests
+
+
+MIN_ACTIVITIES_PER_DAY = 3
+TARGET_DAILY_HOURS = 8.0
+
+
+@dataclass
+class ScoringWeights:
+    """Relative weight of each score in the combined ranking"""
+    cost: float = 1.0
+    interest: float = 1.0
+    density: float = 1.0
+    pacing: float = 1.0
+
+
+@dataclass
+class CandidateBatch:
+    """Columnar view of N candidate itineraries over up to D days.
+
+    Days beyond a candidate's length are zero-padded and excluded by day_mask.
+    """
+    day_costs: np.ndarray      # (N, D) activity and meal spend per day
+    day_hours: np.ndarray      # (N, D) scheduled activity hours per day
+    day_counts: np.ndarray     # (N, D) number of activities per day
+    day_mask: np.ndarray       # (N, D) True where the day exists
+    interest_hits: np.ndarray  # (N, I) activities matching each interest
+    fixed_costs: np.ndarray    # (N,) lodging and transport
+
+    def __len__(self) -> int:
+        return self.day_costs.shape[0]
+
+    @classmethod
+    def from_day_plans(cls, candidates: Sequence[Sequence], interests: Sequence[str],
+                       fixed_costs=0.0) -> "CandidateBatch":
+        """Build a batch from lists of DayPlan-like objects"""
+        num_days = max((len(days) for days in candidates), default=0)
+        shape = (len(candidates), num_days)
+        day_costs = np.zeros(shape)
+        day_hours = np.zeros(shape)
+        day_counts = np.zeros(shape)
+        day_mask = np.zeros(shape, dtype=bool)
+        interest_hits = np.zeros((len(candidates), len(interests)))
+        lowered = [interest.lower() for interest in interests]
+        matcher = compile_interests(interests)
+
+        for n, days in enumerate(candidates):
+            for d, day in enumerate(days):
+                day_costs[n, d] = day.total_cost
+                day_hours[n, d] = sum(a.duration_hours for a in day.activities)
+                day_counts[n, d] = len(day.activities)
+                day_mask[n, d] = True
+                for activity in day.activities:
+                    matched = matcher.matching_interests(activity_text(activity))
+                    for i, interest in enumerate(lowered):
+                        if interest in matched:
+                            interest_hits[n, i] += 1
+
+        return cls(
+            day_costs=day_costs,
+            day_hours=day_hours,
+            day_counts=day_counts,
+            day_mask=day_mask,
+            interest_hits=interest_hits,
+            fixed_costs=np.broadcast_to(np.asarray(fixed_costs, dtype=float),
+                                        (len(candidates),)).copy()
+        )
+
+
+@dataclass
+class CandidateScores:
+    """Per-candidate scores, each in [0, 1] except total_cost"""
+    total_cost: np.ndarray
+    cost: np.ndarray
+    interest: np.ndarray
+    density: np.ndarray
+    pacing: np.ndarray
+    combined: np.ndarray
+
+    def top_k(self, k: int) -> List[int]:
+        """Indices of the k best candidates, best first"""
+        k = min(k, len(self.combined))
+        if k <= 0:
+            return []
+        best = np.argpartition(-self.combined, k - 1)[:k]
+        return best[np.argsort(-self.combined[best], kind="stable")].tolist()
+
+
+def score_candidates(batch: CandidateBatch, budget: float,
+                     weights: ScoringWeights = None) -> CandidateScores:
+    """Score every candidate on cost, interest coverage, density and pacing"""
+    weights = weights or ScoringWeights()
+    days = np.maximum(batch.day_mask.sum(axis=1), 1)
+
+    total_cost = batch.fixed_costs + batch.day_costs.sum(axis=1)
+    overage = np.maximum(total_cost - budget, 0.0) / max(budget, 1e-9)
+    cost = np.clip(1.0 - overage, 0.0, 1.0)
+
+    if batch.interest_hits.shape[1]:
+        interest = (batch.interest_hits > 0).mean(axis=1)
+    else:
+        interest = np.ones(len(batch))
+
+    density = np.minimum(1.0, batch.day_counts.sum(axis=1) / days / MIN_ACTIVITIES_PER_DAY)
+
+    # Penalize each day's distance from a comfortable schedule
+    strain = np.clip(np.abs(batch.day_hours - TARGET_DAILY_HOURS) / TARGET_DAILY_HOURS, 0.0, 1.0)
+    pacing = 1.0 - np.where(batch.day_mask, strain, 0.0).sum(axis=1) / days
+
+    total_weight = weights.cost + weights.interest + weights.density + weights.pacing
+    combined = (weights.cost * cost + weights.interest * interest
+                + weights.density * density + weights.pacing * pacing) / total_weight
+
+    return CandidateScores(
+        total_cost=total_cost,
+        cost=cost,
+        interest=interest,
+        density=density,
+        pacing=pacing,
+        combined=combined
+    )
@@ -0,0 +1,91 @@
+"""
+Monte Carlo cost-uncertainty simulation
+Samples price variation per category and per activity to estimate the chance of overrunning a budget
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_NUM_SAMPLES = 10_000
+
+# Coefficient of variation of the final price around its estimate
+PRICE_VOLATILITY = {
+    "accommodation": 0.10,
+    "transportation": 0.20,
+    "meal": 0.15,
+}
+DEFAULT_VOLATILITY = 0.25
+
+# Share of variance from a price level common to the whole category
+# (e.g. a pricier season); the rest varies per activity
+CATEGORY_SHARE = 0.5
+
+
+@dataclass
+class CostRiskReport:
+    """Distribution of simulated trip totals against a budget"""
+    probability_within_budget: float
+    mean_total: float
+    p50_total: float
+    p90_total: float
+    num_samples: int
+
+
+def simulate_costs(costs: Sequence[float], categories: Sequence[str], budget: float,
+                   num_samples: int = DEFAULT_NUM_SAMPLES,
+                   volatility: Optional[Dict[str, float]] = None,
+                   seed: Optional[int] = None) -> CostRiskReport:
+    """Sample trip totals from per-item price estimates.
+
+    Each price is multiplied by a lognormal factor with mean 1: one draw
+    shared by every item in its category times one draw per item. All
+    samples are drawn as an (S, N) matrix and reduced with one product.
+    """
+    costs = np.asarray(costs, dtype=float)
+    # Free items cannot move the total, so they are not sampled
+    priced = costs != 0
+    costs = costs[priced]
+    categories = np.asarray(categories, dtype=str)[priced]
+    volatility = {**PRICE_VOLATILITY, **(volatility or {})}
+    names, category_index = np.unique(categories, return_inverse=True)
+    cv = np.array([volatility.get(name, DEFAULT_VOLATILITY) for name in names])
+    sigma_sq = np.log1p(cv ** 2)
+
+    # float32 halves the cost of the (S, N) draws and is ample for prices
+    rng = np.random.default_rng(seed)
+    category_sigma = np.sqrt(CATEGORY_SHARE * sigma_sq).astype(np.float32)
+    item_sigma = np.sqrt((1 - CATEGORY_SHARE) * sigma_sq)[category_index].astype(np.float32)
+    log_factors = rng.standard_normal((num_samples, len(costs)), dtype=np.float32)
+    log_factors *= item_sigma
+    log_factors += (rng.standard_normal((num_samples, len(names)), dtype=np.float32)
+                    * category_sigma)[:, category_index]
+    # Centre the draws so each factor has mean exactly 1
+    log_factors -= (sigma_sq[category_index] / 2).astype(np.float32)
+    np.exp(log_factors, out=log_factors)
+    totals = (log_factors @ costs.astype(np.float32)).astype(float)
+
+    p50, p90 = np.percentile(totals, [50, 90]) if len(totals) else (0.0, 0.0)
+    return CostRiskReport(
+        probability_within_budget=float(np.mean(totals <= budget)),
+        mean_total=float(totals.mean()),
+        p50_total=float(p50),
+        p90_total=float(p90),
+        num_samples=num_samples,
+    )
+
+
+def simulate_itinerary(days, breakdown, budget: float,
+                       num_samples: int = DEFAULT_NUM_SAMPLES,
+                       volatility: Optional[Dict[str, float]] = None,
+                       seed: Optional[int] = None) -> CostRiskReport:
+    """Simulate the total of DayPlans plus the breakdown's fixed costs"""
+    costs = [breakdown.accommodation, breakdown.transportation]
+    categories = ["accommodation", "transportation"]
+    for day in days:
+        for activity in day.activities:
+            costs.append(activity.cost)
+            categories.append(activity.category)
+    return simulate_costs(costs, categories, budget, num_samples, volatility, seed)
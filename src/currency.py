@@ -0,0 +1,172 @@
+"""
+Multi-currency pricing
+Locally loaded FX rate table, cached with expiry, converting whole itineraries in one vectorized pass
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from budget_ledger import BudgetLedger
+
+
+BASE_CURRENCY = "USD"
+DEFAULT_FX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fx_rates.json")
+FX_CACHE_TTL_S = 6 * 3600
+
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥", "INR": "₹"}
+ZERO_DECIMAL_CURRENCIES = {"JPY"}
+
+Codes = Union[str, Sequence[str], np.ndarray]
+
+
+class FXTable:
+    """Exchange rates as units of each currency per one unit of the base currency.
+
+    Rates live in a single array indexed by currency code, so converting N
+    amounts is one gather and one multiply however many currencies are mixed.
+    """
+
+    def __init__(self, rates: Dict[str, float], base: str = BASE_CURRENCY, as_of: str = ""):
+        if rates.get(base) != 1.0:
+            raise ValueError(f"Base currency {base} must have a rate of 1.0")
+        self.base = base
+        self.as_of = as_of
+        self.codes = sorted(rates)
+        self._index = {code: i for i, code in enumerate(self.codes)}
+        self._rates = np.array([rates[code] for code in self.codes], dtype=float)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self._index
+
+    def index(self, currencies: Codes) -> Union[int, np.ndarray]:
+        """Row of each currency code in the rate array"""
+        if isinstance(currencies, str):
+            return self._position(currencies)
+        # Look up each distinct code once, then broadcast back
+        unique, inverse = np.unique(np.asarray(currencies, dtype=str), return_inverse=True)
+        positions = np.array([self._position(code) for code in unique], dtype=np.intp)
+        return positions[inverse]
+
+    def rate(self, source: str, target: str) -> float:
+        """Units of target per unit of source"""
+        return float(self._rates[self._position(target)] / self._rates[self._position(source)])
+
+    def convert(self, amounts, source: Codes, target: str) -> np.ndarray:
+        """Convert amounts tagged with one or many source currencies into target"""
+        amounts = np.asarray(amounts, dtype=float)
+        return amounts * (self._rates[self._position(target)] / self._rates[self.index(source)])
+
+    def _position(self, currency: str) -> int:
+        try:
+            return self._index[currency]
+        except KeyError:
+            raise ValueError(f"No exchange rate for currency {currency!r}") from None
+
+    @classmethod
+    def from_json(cls, path: str) -> "FXTable":
+        """Load a table written as {"base": ..., "as_of": ..., "rates": {...}}"""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["rates"], base=data.get("base", BASE_CURRENCY), as_of=data.get("as_of", ""))
+
+
+_fx_cache: Dict[str, Tuple[float, FXTable]] = {}
+_fx_cache_lock = threading.Lock()
+
+
+def load_fx_table(path: Optional[str] = None, max_age_s: float = FX_CACHE_TTL_S) -> FXTable:
+    """FX table from a local JSON file, re-read only once the cached copy expires"""
+    path = os.path.abspath(path or DEFAULT_FX_PATH)
+    now = time.monotonic()
+    with _fx_cache_lock:
+        cached = _fx_cache.get(path)
+        if cached and now - cached[0] < max_age_s:
+            return cached[1]
+        table = FXTable.from_json(path)
+        _fx_cache[path] = (now, table)
+        return table
+
+
+def clear_fx_cache():
+    with _fx_cache_lock:
+        _fx_cache.clear()
+
+
+def format_amount(amount: float, currency: str = BASE_CURRENCY) -> str:
+    """Amount with its currency symbol, or code for currencies without one"""
+    decimals = 0 if currency in ZERO_DECIMAL_CURRENCIES else 2
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    if symbol:
+        return f"{symbol}{amount:.{decimals}f}"
+    return f"{amount:.{decimals}f} {currency}"
+
+
+def convert_itineraries(itineraries: List, currency: str,
+                        table: Optional[FXTable] = None) -> List:
+    """Copies of TripItineraries with every amount in currency.
+
+    Amounts from all itineraries are gathered into one array, converted with
+    a single vectorized call and scattered back in the same order.
+    """
+    table = table or load_fx_table()
+    amounts: List[float] = []
+    sources: List[str] = []
+
+    def gather(amount: float, source: str):
+        amounts.append(amount)
+        sources.append(source)
+
+    for itinerary in itineraries:
+        budget = itinerary.budget
+        gather(itinerary.requirements.budget, itinerary.requirements.currency)
+        for value in (budget.accommodation, budget.activities, budget.meals,
+                      budget.transportation, budget.total):
+            gather(value, budget.currency)
+        for day in itinerary.days:
+            gather(day.total_cost, budget.currency)
+            for activity in day.activities:
+                gather(activity.cost, activity.currency)
+        for booking in itinerary.bookings:
+            gather(booking.price, booking.currency)
+
+    converted = iter(table.convert(amounts, sources, currency).tolist()) if amounts else iter(())
+    results = []
+    for itinerary in itineraries:
+        requirements = replace(itinerary.requirements, budget=next(converted), currency=currency)
+        budget = replace(itinerary.budget,
+                         accommodation=next(converted), activities=next(converted),
+                         meals=next(converted), transportation=next(converted),
+                         total=next(converted), currency=currency,
+                         savings_suggestions=list(itinerary.budget.savings_suggestions),
+                         repairs=list(itinerary.budget.repairs))
+        if budget.risk is not None:
+            rate = table.rate(itinerary.budget.currency, currency)
+            budget.risk = replace(budget.risk, mean_total=budget.risk.mean_total * rate,
+                                  p50_total=budget.risk.p50_total * rate,
+                                  p90_total=budget.risk.p90_total * rate)
+        days = []
+        for day in itinerary.days:
+            total_cost = next(converted)
+            activities = [replace(a, cost=next(converted), currency=currency)
+                          for a in day.activities]
+            days.append(replace(day, activities=activities, total_cost=total_cost))
+        bookings = [replace(b, price=next(converted), currency=currency)
+                    for b in itinerary.bookings]
+
+        ledger = BudgetLedger.from_days(days)
+        ledger.set_fixed("accommodation", budget.accommodation)
+        ledger.set_fixed("transportation", budget.transportation)
+        results.append(replace(itinerary, requirements=requirements, days=days,
+                               budget=budget, bookings=bookings, ledger=ledger))
+    return results
+
+
+def convert_itinerary(itinerary, currency: str, table: Optional[FXTable] = None):
+    """Copy of one TripItinerary with every amount in currency"""
+    return convert_itineraries([itinerary], currency, table)[0]
@@ -3,11 +3,23 @@ Evaluation harness for Trip Planner Agent
 Tests constraint satisfaction and agent performance
 """
 
+import ast
+import hashlib
 import json
-from typing import List, Dict
-from dataclasses import dataclass
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import asdict, dataclass, field, replace
+import numpy as np
 import structlog
 
+from interest_matcher import activity_text, compile_interests
 from trip_planner_agent import (
     CoordinatorAgent, TripRequirements, TripItinerary,
     format_itinerary
@@ -15,6 +27,60 @@ from trip_planner_agent import (
 
 logger = structlog.get_logger()
 
+Scenario = Tuple[str, TripRequirements]
+
+DEFAULT_RESULTS_PATH = "evaluation_results.jsonl"
+DEFAULT_CACHE_DIR = ".evaluation_cache"
+CACHE_MAX_ENTRIES = 1000  # Every planner change leaves a generation of unreachable entries
+CACHE_MAX_AGE_DAYS = 30.0
+
+METRIC_NAMES = ("Budget Adherence", "Day Coverage", "Activity Density",
+                "Preference Matching", "Iteration Efficiency")
+CRITICAL_METRICS = ("Budget Adherence", "Day Coverage")  # All must pass for a scenario to pass
+OVERAGE_PARTIAL_CREDIT_PCT = 5  # Overage still passing, at OVERAGE_PARTIAL_SCORE
+OVERAGE_PARTIAL_SCORE = 0.7
+MIN_ACTIVITIES_PER_DAY = 3
+MIN_MATCH_RATE = 0.3  # At least 30% of activities should match an interest
+MAX_ITERATIONS = 3
+RESOURCE_METRICS = ("Response Latency", "Slowest Agent Call", "Peak Memory", "Tool Calls")
+# Agent methods timed, per CoordinatorAgent attribute, and tool methods counted
+AGENT_CALLS = {"itinerary_agent": ("plan",), "booking_agent": ("find_options",),
+               "budget_agent": ("analyze", "repair")}
+TOOL_ATTRIBUTES = ("search_tool", "code_tool")
+TOOL_CALLS = ("search", "execute")
+PERCENTILES = (50, 95, 99)
+
+EVALUATION_SCENARIOS: List[Scenario] = [
+    ("Budget-Conscious Trip", TripRequirements(
+        destination="Barcelona, Spain",
+        start_date="2025-07-01",
+        end_date="2025-07-03",
+        budget=800.0,  # Tight budget
+        num_travelers=1,
+        interests=["architecture", "beach"],
+        accommodation_preference="hostel"
+    )),
+    ("Luxury Experience", TripRequirements(
+        destination="Tokyo, Japan",
+        start_date="2025-08-15",
+        end_date="2025-08-17",
+        budget=3000.0,  # High budget
+        num_travelers=2,
+        interests=["food", "culture", "shopping"],
+        dietary_restrictions=["no shellfish"],
+        accommodation_preference="luxury hotel"
+    )),
+    ("Family Vacation", TripRequirements(
+        destination="Orlando, Florida",
+        start_date="2025-09-10",
+        end_date="2025-09-12",
+        budget=1500.0,
+        num_travelers=4,
+        interests=["theme parks", "entertainment"],
+        accommodation_preference="family hotel"
+    )),
+]
+
 
 @dataclass
 class EvaluationMetric:
@@ -24,6 +90,99 @@ class EvaluationMetric:
     max_score: float
     passed: bool
     details: str = ""
+    value: Optional[float] = None  # Raw measurement behind a resource metric
+
+
+@dataclass
+class ResourceThresholds:
+    """Limits a scenario must stay within for its resource metrics to pass.
+    
+    A limit of None leaves that metric out, except peak memory: it is
+    always traced around the scored request and reported, and its limit
+    only decides whether it passes.
+    """
+    latency_ms: Optional[float] = 1000.0  # One process_request call
+    agent_call_ms: Optional[float] = 500.0  # Slowest single agent call within it
+    peak_memory_mb: Optional[float] = None
+    tool_calls: Optional[int] = 25
+
+
+@dataclass
+class CallStats:
+    """Agent call times and tool call counts seen during one request"""
+    agent_ms: Dict[str, List[float]] = field(default_factory=dict)
+    tool_calls: Dict[str, int] = field(default_factory=dict)
+    
+    @property
+    def total_tool_calls(self) -> int:
+        return sum(self.tool_calls.values())
+
+
+@contextmanager
+def instrumented(coordinator: CoordinatorAgent) -> Iterator[CallStats]:
+    """Time the coordinator's agent calls and count its tool calls while active.
+    
+    Wrappers are set on the agent and tool instances and removed on exit,
+    so the classes and other coordinators are untouched.
+    """
+    stats = CallStats()
+    patched = []
+    
+    def wrap(target, method: str, record: Callable[[float], None]):
+        original = getattr(target, method)
+        
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record((time.perf_counter() - start) * 1000)
+        
+        setattr(target, method, call)
+        patched.append((target, method))
+    
+    tools = {}
+    for attribute, methods in AGENT_CALLS.items():
+        agent = getattr(coordinator, attribute)
+        for method in methods:
+            label = f"{agent.name}.{method}"
+            wrap(agent, method, lambda ms, label=label: stats.agent_ms.setdefault(label, []).append(ms))
+        for tool_attribute in TOOL_ATTRIBUTES:
+            tool = getattr(agent, tool_attribute, None)
+            if tool is not None:
+                tools[id(tool)] = tool  # Agents share tools; count each once
+    for tool in tools.values():
+        for method in TOOL_CALLS:
+            if hasattr(tool, method):
+                label = f"{type(tool).__name__}.{method}"
+                
+                def count(ms, label=label):
+                    stats.tool_calls[label] = stats.tool_calls.get(label, 0) + 1
+                
+                wrap(tool, method, count)
+    try:
+        yield stats
+    finally:
+        for target, method in patched:
+            delattr(target, method)
+
+
+def _limit_metric(name: str, value: float, limit: Optional[float], unit: str,
+                  details: str = "") -> EvaluationMetric:
+    """Full score within limit, otherwise shrinking with how far past it value is.
+    
+    Without a limit the metric is informational and always passes.
+    """
+    passed = limit is None or value <= limit
+    limit_text = "no limit" if limit is None else f"limit {limit:g} {unit}"
+    return EvaluationMetric(
+        name=name,
+        score=1.0 if passed else limit / value,
+        max_score=1.0,
+        passed=passed,
+        details=details or f"{value:.1f} {unit} ({limit_text})",
+        value=value
+    )
 
 
 @dataclass
@@ -36,11 +195,177 @@ class EvaluationResult:
     itinerary: TripItinerary
 
 
+def count_interest_matches(itinerary: TripItinerary, whole_words: bool = False,
+                           stem: bool = False) -> Tuple[int, int]:
+    """(activities mentioning any interest, all activities) of an itinerary"""
+    matcher = compile_interests(itinerary.requirements.interests, whole_words, stem)
+    all_activities = [a for day in itinerary.days for a in day.activities]
+    matching_count = sum(1 for activity in all_activities if matcher.matches(activity_text(activity)))
+    return matching_count, len(all_activities)
+
+
+@dataclass
+class ItineraryColumns:
+    """What the metrics read from N itineraries, as flat arrays.
+    
+    Per-day activity counts of every itinerary are concatenated in
+    day_activities; planned_days says how many belong to each itinerary.
+    """
+    budget: np.ndarray
+    total_cost: np.ndarray
+    planned_days: np.ndarray
+    expected_days: np.ndarray
+    day_activities: np.ndarray
+    has_interests: np.ndarray
+    matching_activities: np.ndarray
+    iterations: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.budget)
+    
+    @classmethod
+    def from_itineraries(cls, itineraries: Sequence[TripItinerary], whole_words: bool = False,
+                         stem: bool = False) -> "ItineraryColumns":
+        """Gather columns in one pass; interest matches are cached per activity text"""
+        # Generated trips reuse activity texts, interest sets and date ranges heavily
+        matches: Dict[tuple, tuple] = {}  # Interests -> (matcher, hit per activity text)
+        trip_lengths: Dict[tuple, int] = {}
+        matching, expected_days = [], []
+        for itinerary in itineraries:
+            requirements = itinerary.requirements
+            interests = tuple(requirements.interests)
+            if interests not in matches:
+                matches[interests] = (compile_interests(interests, whole_words, stem), {})
+            matcher, known = matches[interests]
+            count = 0
+            for day in itinerary.days:
+                for activity in day.activities:
+                    key = (activity.name, activity.description)
+                    hit = known.get(key)
+                    if hit is None:
+                        hit = known[key] = matcher.matches(activity_text(activity))
+                    count += hit
+            matching.append(count)
+            dates = (requirements.start_date, requirements.end_date)
+            if dates not in trip_lengths:
+                trip_lengths[dates] = requirements.num_days
+            expected_days.append(trip_lengths[dates])
+        
+        return cls(
+            budget=np.array([it.requirements.budget for it in itineraries], dtype=float),
+            total_cost=np.array([it.budget.total for it in itineraries], dtype=float),
+            planned_days=np.array([len(it.days) for it in itineraries], dtype=np.int64),
+            expected_days=np.array(expected_days, dtype=np.int64),
+            day_activities=np.array([len(day.activities) for it in itineraries for day in it.days],
+                                    dtype=np.int64),
+            has_interests=np.array([bool(it.requirements.interests) for it in itineraries]),
+            matching_activities=np.array(matching, dtype=np.int64),
+            iterations=np.array([it.iteration_count for it in itineraries], dtype=np.int64)
+        )
+
+
+@dataclass
+class MetricTable:
+    """Scores and pass flags of N itineraries, one column per metric in METRIC_NAMES"""
+    scores: np.ndarray  # (N, len(METRIC_NAMES)) float
+    passed: np.ndarray  # (N, len(METRIC_NAMES)) bool
+    overall_score: np.ndarray
+    overall_passed: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.overall_score)
+    
+    def column(self, name: str) -> np.ndarray:
+        return self.scores[:, METRIC_NAMES.index(name)]
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean score and pass rate per metric, plus overall"""
+        summary = {name: {"mean_score": float(self.scores[:, i].mean()),
+                          "pass_rate": float(self.passed[:, i].mean())}
+                   for i, name in enumerate(METRIC_NAMES)}
+        summary["Overall"] = {"mean_score": float(self.overall_score.mean()),
+                              "pass_rate": float(self.overall_passed.mean())}
+        return summary
+
+
+def score_columns(columns: ItineraryColumns) -> MetricTable:
+    """Every metric and the overall score for all itineraries at once"""
+    n = len(columns)
+    scores = np.empty((n, len(METRIC_NAMES)))
+    passed = np.empty((n, len(METRIC_NAMES)), dtype=bool)
+    
+    # Budget adherence
+    overage_pct = (columns.total_cost - columns.budget) / columns.budget * 100
+    within = columns.total_cost <= columns.budget
+    partial = ~within & (overage_pct <= OVERAGE_PARTIAL_CREDIT_PCT)
+    scores[:, 0] = np.where(within, 1.0, np.where(partial, OVERAGE_PARTIAL_SCORE,
+                                                  np.maximum(0.0, 1.0 - overage_pct / 100)))
+    passed[:, 0] = within | partial
+    
+    # Day coverage
+    scores[:, 1] = columns.planned_days / columns.expected_days
+    passed[:, 1] = columns.planned_days == columns.expected_days
+    
+    # Activity density, from per-day counts folded back onto their itinerary
+    owner = np.repeat(np.arange(n), columns.planned_days)
+    num_activities = np.bincount(owner, weights=columns.day_activities, minlength=n)
+    short_days = np.bincount(owner, weights=columns.day_activities < MIN_ACTIVITIES_PER_DAY,
+                             minlength=n)
+    average = np.divide(num_activities, columns.planned_days,
+                        out=np.zeros(n), where=columns.planned_days > 0)
+    scores[:, 2] = np.minimum(1.0, average / MIN_ACTIVITIES_PER_DAY)
+    passed[:, 2] = short_days == 0
+    
+    # Preference matching
+    match_rate = np.divide(columns.matching_activities, num_activities,
+                           out=np.zeros(n), where=num_activities > 0)
+    scores[:, 3] = np.where(columns.has_interests, match_rate, 1.0)
+    passed[:, 3] = ~columns.has_interests | (match_rate >= MIN_MATCH_RATE)
+    
+    # Iteration efficiency
+    scores[:, 4] = np.maximum(0.0, 1.0 - (columns.iterations - 1) / MAX_ITERATIONS)
+    passed[:, 4] = columns.iterations <= MAX_ITERATIONS
+    
+    critical = [METRIC_NAMES.index(name) for name in CRITICAL_METRICS]
+    return MetricTable(scores=scores, passed=passed,
+                       overall_score=scores.mean(axis=1),
+                       overall_passed=passed[:, critical].all(axis=1))
+
+
+@contextmanager
+def traced_peak_memory(enabled: bool = True) -> Iterator[Dict[str, float]]:
+    """Trace allocations inside the block; afterwards the dict holds its peak under "mb".
+    
+    Does nothing when disabled. An outer trace that is already running is
+    left running, with only its peak reset.
+    """
+    peak: Dict[str, float] = {}
+    if not enabled:
+        yield peak
+        return
+    already_tracing = tracemalloc.is_tracing()
+    if already_tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        yield peak
+        peak["mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+
 class AgentEvaluator:
     """Evaluates agent performance against test scenarios"""
     
-    def __init__(self):
+    def __init__(self, whole_words: bool = False, stem: bool = False,
+                 thresholds: Optional[ResourceThresholds] = None):
         self.coordinator = CoordinatorAgent()
+        # How interests are matched against activity text
+        self.whole_words = whole_words
+        self.stem = stem
+        self.thresholds = thresholds or ResourceThresholds()
         logger.info("evaluator.initialized")
     
     def evaluate_budget_adherence(self, itinerary: TripItinerary) -> EvaluationMetric:
@@ -55,8 +380,8 @@ class AgentEvaluator:
         else:
             overage_pct = ((actual - budget) / budget) * 100
             # Allow 5% overage for partial credit
-            if overage_pct <= 5:
-                score = 0.7
+            if overage_pct <= OVERAGE_PARTIAL_CREDIT_PCT:
+                score = OVERAGE_PARTIAL_SCORE
                 passed = True
             else:
                 score = max(0, 1.0 - (overage_pct / 100))
@@ -72,9 +397,9 @@ class AgentEvaluator:
         )
     
     def evaluate_day_coverage(self, itinerary: TripItinerary) -> EvaluationMetric:
-        """Check if all 3 days are planned"""
+        """Check if every day of the trip is planned"""
         num_days = len(itinerary.days)
-        expected_days = 3
+        expected_days = itinerary.requirements.num_days
         
         score = num_days / expected_days
         passed = num_days == expected_days
@@ -90,7 +415,7 @@ class AgentEvaluator:
     
     def evaluate_activity_density(self, itinerary: TripItinerary) -> EvaluationMetric:
         """Check if each day has sufficient activities"""
-        min_activities_per_day = 3
+        min_activities_per_day = MIN_ACTIVITIES_PER_DAY
         
         activities_per_day = [len(day.activities) for day in itinerary.days]
         avg_activities = sum(activities_per_day) / len(activities_per_day) if activities_per_day else 0
@@ -120,18 +445,12 @@ class AgentEvaluator:
             )
         
         # Count activities that match interests (simplified check)
-        all_activities = [a for day in itinerary.days for a in day.activities]
-        matching_count = 0
-        
-        for activity in all_activities:
-            activity_text = (activity.name + activity.description).lower()
-            if any(interest.lower() in activity_text for interest in interests):
-                matching_count += 1
+        matching_count, num_activities = count_interest_matches(itinerary, self.whole_words, self.stem)
         
-        match_rate = matching_count / len(all_activities) if all_activities else 0
+        match_rate = matching_count / num_activities if num_activities else 0
         score = match_rate
-        passed = match_rate >= 0.3  # At least 30% should match
-        details = f"{matching_count}/{len(all_activities)} activities match interests ({match_rate*100:.0f}%)"
+        passed = match_rate >= MIN_MATCH_RATE
+        details = f"{matching_count}/{num_activities} activities match interests ({match_rate*100:.0f}%)"
         
         return EvaluationMetric(
             name="Preference Matching",
@@ -143,7 +462,7 @@ class AgentEvaluator:
     
     def evaluate_iteration_efficiency(self, itinerary: TripItinerary) -> EvaluationMetric:
         """Check if solution was found within iteration limit"""
-        max_iterations = 3
+        max_iterations = MAX_ITERATIONS
         actual_iterations = itinerary.iteration_count
         
         score = max(0, 1.0 - ((actual_iterations - 1) / max_iterations))
@@ -158,13 +477,49 @@ class AgentEvaluator:
             details=details
         )
     
+    def evaluate_resources(self, latency_ms: float, stats: CallStats,
+                           peak_memory_mb: Optional[float] = None) -> List[EvaluationMetric]:
+        """Latency and tool-use metrics for every limit that is set, plus peak memory when traced"""
+        limits = self.thresholds
+        metrics = []
+        if limits.latency_ms is not None:
+            metrics.append(_limit_metric("Response Latency", latency_ms, limits.latency_ms, "ms"))
+        if limits.agent_call_ms is not None and stats.agent_ms:
+            slowest_call = max(max(times) for times in stats.agent_ms.values())
+            per_agent = ", ".join(f"{label} {sum(times):.1f} ms" for label, times in stats.agent_ms.items())
+            metrics.append(_limit_metric(
+                "Slowest Agent Call", slowest_call, limits.agent_call_ms, "ms",
+                f"Slowest {slowest_call:.1f} ms (limit {limits.agent_call_ms:g} ms); {per_agent}"))
+        if peak_memory_mb is not None:
+            metrics.append(_limit_metric("Peak Memory", peak_memory_mb, limits.peak_memory_mb, "MB"))
+        if limits.tool_calls is not None:
+            calls = stats.total_tool_calls
+            breakdown = ", ".join(f"{label} x{n}" for label, n in stats.tool_calls.items())
+            metrics.append(_limit_metric(
+                "Tool Calls", calls, limits.tool_calls, "calls",
+                f"{calls} tool calls (limit {limits.tool_calls}){'; ' + breakdown if breakdown else ''}"))
+        return metrics
+    
+    def evaluate_batch(self, itineraries: Sequence[TripItinerary]) -> MetricTable:
+        """Score many itineraries at once; rows follow the order given"""
+        table = score_columns(ItineraryColumns.from_itineraries(
+            itineraries, self.whole_words, self.stem))
+        logger.info("evaluator.batch_scored",
+                   num_itineraries=len(table),
+                   passed=int(table.overall_passed.sum()))
+        return table
+    
     def evaluate_scenario(self, scenario_name: str, 
                          requirements: TripRequirements) -> EvaluationResult:
         """Evaluate a single test scenario"""
         logger.info("evaluator.scenario_started", scenario=scenario_name)
         
-        # Run the agent
-        itinerary = self.coordinator.process_request(requirements)
+        # Run the agent, tracing its memory on the scored run itself
+        with instrumented(self.coordinator) as stats, traced_peak_memory() as peak:
+            start = time.perf_counter()
+            itinerary = self.coordinator.process_request(requirements)
+            latency_ms = (time.perf_counter() - start) * 1000
+        peak_memory_mb = peak.get("mb")
         
         # Compute all metrics
         metrics = [
@@ -180,11 +535,14 @@ class AgentEvaluator:
         max_total = sum(m.max_score for m in metrics)
         overall_score = total_score / max_total if max_total > 0 else 0
         
-        # Check if passed (all critical metrics must pass)
-        critical_metrics = ["Budget Adherence", "Day Coverage"]
+        # Resource metrics gate passing but stay out of the quality score,
+        # which would otherwise change with machine load
+        metrics += self.evaluate_resources(latency_ms, stats, peak_memory_mb)
+        
+        # Check if passed (all critical and resource metrics must pass)
         passed = all(
             m.passed for m in metrics 
-            if m.name in critical_metrics
+            if m.name in CRITICAL_METRICS or m.name in RESOURCE_METRICS
         )
         
         result = EvaluationResult(
@@ -198,84 +556,384 @@ class AgentEvaluator:
         logger.info("evaluator.scenario_completed",
                    scenario=scenario_name,
                    score=overall_score,
-                   passed=passed)
+                   passed=passed,
+                   latency_ms=round(latency_ms, 2))
         
         return result
 
 
-def run_evaluation_suite() -> List[EvaluationResult]:
-    """Run complete evaluation test suite"""
+def scenario_record(result: EvaluationResult, index: Optional[int] = None) -> Dict[str, Any]:
+    """JSON-ready summary of one scenario's result"""
+    record = {} if index is None else {"index": index}
+    record.update({
+        "name": result.scenario_name,
+        "passed": result.passed,
+        "overall_score": result.overall_score,
+        "metrics": [
+            {
+                "name": m.name,
+                "score": m.score,
+                "passed": m.passed,
+                "details": m.details,
+                **({"value": m.value} if m.value is not None else {})
+            }
+            for m in result.metrics
+        ],
+        "destination": result.itinerary.requirements.destination,
+        "budget": result.itinerary.requirements.budget,
+        "actual_cost": result.itinerary.budget.total,
+        "iterations": result.itinerary.iteration_count
+    })
+    return record
+
+
+class ResultStream:
+    """Appends one JSON line per scenario result, flushed as soon as it is written.
+    
+    A run that dies part way leaves every finished scenario on disk.
+    """
+    
+    def __init__(self, path: str = DEFAULT_RESULTS_PATH, append: bool = False):
+        self.path = path
+        self._file: IO[str] = open(path, "a" if append else "w")
+    
+    def write(self, result: EvaluationResult, index: Optional[int] = None):
+        self._file.write(json.dumps(scenario_record(result, index)) + "\n")
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+    
+    def __enter__(self) -> "ResultStream":
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_results(path: str = DEFAULT_RESULTS_PATH) -> Iterator[Dict[str, Any]]:
+    """Yield scenario records one at a time; a half-written last line is skipped"""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("evaluator.truncated_record", path=path)
+
+
+def summarize_results(path: str = DEFAULT_RESULTS_PATH) -> Dict[str, Any]:
+    """Summary statistics rebuilt by streaming over a results file"""
+    total = passed = 0
+    score_sum = 0.0
+    metrics: Dict[str, Dict[str, float]] = {}
+    for record in read_results(path):
+        total += 1
+        passed += record["passed"]
+        score_sum += record["overall_score"]
+        for metric in record["metrics"]:
+            stats = metrics.setdefault(metric["name"], {"score_sum": 0.0, "passed": 0, "count": 0,
+                                                        "values": []})
+            stats["score_sum"] += metric["score"]
+            stats["passed"] += metric["passed"]
+            stats["count"] += 1
+            if "value" in metric:
+                stats["values"].append(metric["value"])
+    return {
+        "total_scenarios": total,
+        "passed": passed,
+        "average_score": score_sum / total if total else 0.0,
+        "metrics": {
+            name: {"mean_score": stats["score_sum"] / stats["count"],
+                   "pass_rate": stats["passed"] / stats["count"],
+                   **value_percentiles(stats["values"])}
+            for name, stats in metrics.items()
+        }
+    }
+
+
+def value_percentiles(values: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99 of a metric's raw values across scenarios; empty without values"""
+    if not len(values):
+        return {}
+    return {f"p{q}": float(v) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def planner_fingerprint(data_dir: Optional[str] = None) -> str:
+    """Hash of the source of this module, every local module it imports and the data files.
+    
+    Imports are followed through the source files next to this one, so
+    editing any agent, engine module or the evaluator itself changes the
+    fingerprint, while unrelated scripts do not. Every file in data_dir
+    (src/data by default, e.g. the FX rates) is hashed too.
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = data_dir if data_dir is not None else os.path.join(src_dir, "data")
+    seen = set()
+    stack = [os.path.abspath(__file__)]
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                candidate = os.path.join(src_dir, name.split(".")[0] + ".py")
+                if os.path.exists(candidate):
+                    stack.append(candidate)
+    
+    digest = hashlib.sha256()
+    for path in sorted(seen):
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode() + b"\0" + f.read())
+    if os.path.isdir(data_dir):
+        for root, _, files in sorted(os.walk(data_dir)):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                with open(path, "rb") as f:
+                    digest.update(os.path.relpath(path, data_dir).encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def without_resource_metrics(result: EvaluationResult) -> EvaluationResult:
+    """The result with its run-specific resource metrics removed and passed judged without them"""
+    metrics = [m for m in result.metrics if m.name not in RESOURCE_METRICS]
+    passed = all(m.passed for m in metrics if m.name in CRITICAL_METRICS)
+    return replace(result, metrics=metrics, passed=passed)
+
+
+class EvaluationCache:
+    """Scenario results on disk, addressed by what produced them.
+    
+    A result's key hashes the scenario's TripRequirements, the run seed,
+    the resource thresholds and the planner fingerprint, so a hit is only possible when neither the
+    scenario nor any planner code has changed. Entries are pickled
+    EvaluationResults and meant for this machine only. Resource metrics
+    describe one particular run, so they are not stored: a hit carries only
+    the quality metrics and passes on those alone.
+    
+    Entries unused for max_age_days are dropped when the cache is opened,
+    and beyond max_entries the least recently used go first.
+    """
+    
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, fingerprint: Optional[str] = None,
+                 max_entries: int = CACHE_MAX_ENTRIES, max_age_days: float = CACHE_MAX_AGE_DAYS):
+        self.directory = directory
+        self.fingerprint = fingerprint or planner_fingerprint()
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.prune()
+    
+    def key(self, requirements: TripRequirements, seed: int = 0,
+            thresholds: Optional[ResourceThresholds] = None) -> str:
+        content = json.dumps({"requirements": asdict(requirements), "seed": seed,
+                              "thresholds": asdict(thresholds or ResourceThresholds()),
+                              "planner": self.fingerprint}, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pkl")
+    
+    def get(self, key: str) -> Optional[EvaluationResult]:
+        try:
+            with open(self._path(key), "rb") as f:
+                result = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(self._path(key))  # Last use decides what prune() drops
+        except OSError:
+            pass
+        return result
+    
+    def put(self, key: str, result: EvaluationResult):
+        result = without_resource_metrics(result)
+        # Write then rename, so a crash never leaves a torn entry under the real key
+        temporary = self._path(key) + f".{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self._path(key))
+    
+    def _entries(self) -> List[Tuple[float, str]]:
+        """(last used, path) of every entry, least recently used first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass  # Removed by a concurrent run
+        return sorted(entries)
+    
+    def prune(self) -> int:
+        """Drop entries past max_age_days, then the least recently used beyond max_entries"""
+        entries = self._entries()
+        cutoff = time.time() - self.max_age_days * 86400
+        stale = [path for used, path in entries if used < cutoff]
+        fresh = [path for used, path in entries if used >= cutoff]
+        stale += fresh[:max(0, len(fresh) - self.max_entries)]
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if stale:
+            logger.info("evaluation_cache.pruned", removed=len(stale),
+                        kept=len(entries) - len(stale))
+        return len(stale)
+    
+    def clear(self):
+        """Drop every entry"""
+        for _, path in self._entries():
+            os.remove(path)
+
+
+def _seed_scenario(seed: int, index: int):
+    """Seed every random source so a scenario behaves the same in any worker"""
+    scenario_seed = (seed * 1_000_003 + index) % 2 ** 32
+    random.seed(scenario_seed)
+    np.random.seed(scenario_seed)
+
+
+def _evaluate_scenario(index: int, name: str, requirements: TripRequirements, seed: int,
+                       thresholds: Optional[ResourceThresholds] = None
+                       ) -> Tuple[int, EvaluationResult]:
+    """Evaluate one scenario with its own evaluator and coordinator"""
+    _seed_scenario(seed, index)
+    # A fresh coordinator per scenario keeps MemoryBank state from leaking
+    evaluator = AgentEvaluator(thresholds=thresholds)
+    return index, evaluator.evaluate_scenario(name, requirements)
+
+
+def print_progress(done: int, total: int, passed: int):
+    """Default progress output: one line roughly every 10% of the run"""
+    step = max(1, total // 10)
+    if done == total or done % step == 0:
+        print(f"  Evaluated {done}/{total} scenarios ({passed} passed)", flush=True)
+
+
+def run_scenarios(scenarios: Sequence[Scenario], workers: Optional[int] = None,
+                  seed: int = 0,
+                  progress: Optional[Callable[[int, int, int], None]] = print_progress,
+                  output: Optional[ResultStream] = None,
+                  cache: Optional[EvaluationCache] = None,
+                  thresholds: Optional[ResourceThresholds] = None
+                  ) -> List[EvaluationResult]:
+    """Evaluate scenarios in a process pool and return results in scenario order.
+    
+    Every scenario gets an isolated coordinator and a seed derived from seed
+    and its position, so results do not depend on worker count or
+    scheduling. With workers=1 everything runs in this process. Each
+    scenario is its own pool task, so its result is written to output, if
+    given, as soon as that scenario finishes. With a
+    cache, scenarios it already holds are served from it and only the
+    rest are evaluated.
+    """
+    workers = workers or os.cpu_count() or 1
+    indexed = [(i, name, requirements) for i, (name, requirements) in enumerate(scenarios)]
+    total = len(indexed)
+    keys = {}
+    cached = []
+    if cache is not None:
+        pending = []
+        for index, name, requirements in indexed:
+            keys[index] = cache.key(requirements, seed, thresholds)
+            result = cache.get(keys[index])
+            if result is None:
+                pending.append((index, name, requirements))
+            else:
+                cached.append((index, replace(result, scenario_name=name)))
+        indexed = pending
+    start = time.perf_counter()
+    results: List[Optional[EvaluationResult]] = [None] * total
+    done = passed = 0
+    
+    def collect(scenario_results, from_cache=False):
+        nonlocal done, passed
+        for index, result in scenario_results:
+            results[index] = result
+            if cache is not None and not from_cache:
+                cache.put(keys[index], result)
+            if output is not None:
+                output.write(result, index)
+            done += 1
+            passed += result.passed
+            if progress:
+                progress(done, total, passed)
+    
+    collect(cached, from_cache=True)
+    if workers == 1:
+        for scenario in indexed:
+            collect([_evaluate_scenario(*scenario, seed, thresholds)])
+    elif indexed:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_evaluate_scenario, *scenario, seed, thresholds)
+                       for scenario in indexed]
+            for future in as_completed(futures):
+                collect([future.result()])
+    
+    logger.info("evaluator.scenarios_completed",
+               num_scenarios=total,
+               cached=len(cached),
+               workers=workers,
+               passed=passed,
+               elapsed_s=round(time.perf_counter() - start, 3))
+    return results
+
+
+def run_evaluation_suite(workers: Optional[int] = None,
+                         use_cache: bool = True) -> List[EvaluationResult]:
+    """Run complete evaluation test suite, reusing cached results of unchanged scenarios.
+    
+    Scenarios run on workers processes, one per CPU by default.
+    """
     print("\n" + "=" * 70)
     print("TRIP PLANNER AGENT - EVALUATION SUITE")
     print("=" * 70 + "\n")
     
-    evaluator = AgentEvaluator()
-    results = []
-    
-    # Test Scenario 1: Budget-conscious trip
-    print("📊 Scenario 1: Budget-Conscious Trip")
-    print("-" * 70)
-    scenario1 = TripRequirements(
-        destination="Barcelona, Spain",
-        start_date="2025-07-01",
-        end_date="2025-07-03",
-        budget=800.0,  # Tight budget
-        num_travelers=1,
-        interests=["architecture", "beach"],
-        accommodation_preference="hostel"
-    )
-    result1 = evaluator.evaluate_scenario("Budget-Conscious Trip", scenario1)
-    results.append(result1)
-    print_evaluation_result(result1)
-    
-    # Test Scenario 2: Luxury trip
-    print("\n📊 Scenario 2: Luxury Experience")
-    print("-" * 70)
-    scenario2 = TripRequirements(
-        destination="Tokyo, Japan",
-        start_date="2025-08-15",
-        end_date="2025-08-17",
-        budget=3000.0,  # High budget
-        num_travelers=2,
-        interests=["food", "culture", "shopping"],
-        dietary_restrictions=["no shellfish"],
-        accommodation_preference="luxury hotel"
-    )
-    result2 = evaluator.evaluate_scenario("Luxury Experience", scenario2)
-    results.append(result2)
-    print_evaluation_result(result2)
-    
-    # Test Scenario 3: Family trip
-    print("\n📊 Scenario 3: Family Vacation")
-    print("-" * 70)
-    scenario3 = TripRequirements(
-        destination="Orlando, Florida",
-        start_date="2025-09-10",
-        end_date="2025-09-12",
-        budget=1500.0,
-        num_travelers=4,
-        interests=["theme parks", "entertainment"],
-        accommodation_preference="family hotel"
-    )
-    result3 = evaluator.evaluate_scenario("Family Vacation", scenario3)
-    results.append(result3)
-    print_evaluation_result(result3)
+    with ResultStream(DEFAULT_RESULTS_PATH) as output:
+        cache = EvaluationCache() if use_cache else None
+        results = run_scenarios(EVALUATION_SCENARIOS, workers=workers, output=output, cache=cache)
+    for number, result in enumerate(results, 1):
+        print(f"{chr(10) if number > 1 else ''}📊 Scenario {number}: {result.scenario_name}")
+        print("-" * 70)
+        print_evaluation_result(result)
     
     # Summary
     print("\n" + "=" * 70)
     print("EVALUATION SUMMARY")
     print("=" * 70)
     
-    passed_count = sum(1 for r in results if r.passed)
-    avg_score = sum(r.overall_score for r in results) / len(results)
+    summary = summarize_results(DEFAULT_RESULTS_PATH)
+    total = summary["total_scenarios"]
     
-    print(f"\nTotal Scenarios: {len(results)}")
-    print(f"Passed: {passed_count}/{len(results)}")
-    print(f"Average Score: {avg_score*100:.1f}%")
-    print(f"Overall Status: {'✓ PASS' if passed_count == len(results) else '✗ FAIL'}")
-    
-    # Save results
-    save_evaluation_results(results)
+    print(f"\nTotal Scenarios: {total}")
+    print(f"Passed: {summary['passed']}/{total}")
+    print(f"Average Score: {summary['average_score']*100:.1f}%")
+    print(f"Overall Status: {'✓ PASS' if summary['passed'] == total else '✗ FAIL'}")
+    units = {"Response Latency": "ms", "Slowest Agent Call": "ms", "Peak Memory": "MB", "Tool Calls": ""}
+    for name, unit in units.items():
+        stats = summary["metrics"].get(name, {})
+        if "p50" in stats:
+            print(f"{name}: " + " | ".join(f"p{q} {stats[f'p{q}']:.1f}{unit}" for q in PERCENTILES))
+    if cache is not None:
+        print(f"Served from cache: {cache.hits}/{total}")
+    print(f"\n✓ Evaluation results streamed to {DEFAULT_RESULTS_PATH}")
     
     return results
 
@@ -300,43 +958,27 @@ def print_evaluation_result(result: EvaluationResult):
     print(f"  Iterations: {result.itinerary.iteration_count}")
 
 
-def save_evaluation_results(results: List[EvaluationResult]):
-    """Save evaluation results to JSON"""
-    output = {
-        "evaluation_date": "2025-11-17",
-        "total_scenarios": len(results),
-        "passed": sum(1 for r in results if r.passed),
-        "average_score": sum(r.overall_score for r in results) / len(results),
-        "scenarios": []
-    }
-    
-    for result in results:
-        scenario_data = {
-            "name": result.scenario_name,
-            "passed": result.passed,
-            "overall_score": result.overall_score,
-            "metrics": [
-                {
-                    "name": m.name,
-                    "score": m.score,
-                    "passed": m.passed,
-                    "details": m.details
-                }
-                for m in result.metrics
-            ],
-            "destination": result.itinerary.requirements.destination,
-            "budget": result.itinerary.requirements.budget,
-            "actual_cost": result.itinerary.budget.total,
-            "iterations": result.itinerary.iteration_count
-        }
-        output["scenarios"].append(scenario_data)
-    
-    filename = "evaluation_results.json"
-    with open(filename, "w") as f:
-        json.dump(output, f, indent=2)
+def main(argv: Sequence[str] = ()) -> int:
+    """Run the suite; '--workers N' sets the process count, '--no-cache' re-evaluates everything.
     
-    print(f"\n✓ Evaluation results saved to {filename}")
+    '--clear-cache' empties the result cache and exits. Returns a non-zero
+    exit status when any scenario failed.
+    """
+    argv = list(argv)
+    if "--clear-cache" in argv:
+        EvaluationCache().clear()
+        print(f"✓ Cleared {DEFAULT_CACHE_DIR}")
+        return 0
+    workers = None
+    if "--workers" in argv:
+        position = argv.index("--workers") + 1
+        if position == len(argv) or not argv[position].isdigit() or int(argv[position]) < 1:
+            print("--workers needs a positive number of processes", file=sys.stderr)
+            return 2
+        workers = int(argv[position])
+    results = run_evaluation_suite(workers=workers, use_cache="--no-cache" not in argv)
+    return 0 if all(result.passed for result in results) else 1
 
 
 if __name__ == "__main__":
-    results = run_evaluation_suite()
+    sys.exit(main(sys.argv[1:]))
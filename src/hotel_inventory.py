@@ -0,0 +1,210 @@
+"""
+Local hotel inventory
+Price- and rating-sorted indexes per city, amenity bitsets and top-k scoring over NumPy arrays
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from availability import AvailabilityCalendar
+from poi_catalog import (
+    city_aliases, random_ratings, read_jsonl, resolve_city, synthetic_sites, write_jsonl
+)
+
+logger = structlog.get_logger()
+
+
+# Amenity i is bit i of a property's amenity mask
+AMENITIES = (
+    "wifi", "breakfast", "parking", "pool", "gym", "airport_shuttle",
+    "pet_friendly", "spa", "kitchen", "accessible", "central_location", "family_rooms",
+)
+AMENITY_BITS = {name: 1 << bit for bit, name in enumerate(AMENITIES)}
+AMENITY_LABELS = {name: name.replace("_", " ").capitalize() for name in AMENITIES}
+AMENITY_LABELS.update({"wifi": "Free WiFi", "breakfast": "Breakfast included",
+                       "parking": "Free parking", "airport_shuttle": "Airport shuttle"})
+PROPERTY_KINDS = ("hotel", "hostel", "apartment")
+
+
+@dataclass
+class Property:
+    """Single bookable property"""
+    property_id: int
+    name: str
+    city: str
+    kind: str  # 'hotel', 'hostel', 'apartment'
+    nightly_rate: float
+    rating: float
+    amenities: List[str] = field(default_factory=list)
+    latitude: float = 0.0
+    longitude: float = 0.0
+    url: str = ""
+
+
+@dataclass
+class HotelWeights:
+    """Relative weight of each term in a property's combined score"""
+    price: float = 1.0  # Cheaper within the query's price range scores higher
+    rating: float = 1.0
+    preference: float = 0.5  # Share of preferred amenities offered
+
+
+def amenity_mask(amenities: Sequence[str]) -> int:
+    """Bitset of amenity names; unknown names raise ValueError"""
+    mask = 0
+    for name in amenities:
+        if name not in AMENITY_BITS:
+            raise ValueError(f"Unknown amenity {name!r}")
+        mask |= AMENITY_BITS[name]
+    return mask
+
+
+class HotelInventory:
+    """Property inventory indexed per city by price and rating.
+
+    An optional AvailabilityCalendar, one row per property, lets searches
+    keep only properties free for the whole stay.
+    """
+
+    def __init__(self, properties: Sequence[Property],
+                 availability: Optional[AvailabilityCalendar] = None):
+        self.properties = list(properties)
+        if availability is not None and len(availability) != len(self.properties):
+            raise ValueError("Availability calendar needs one row per property")
+        self.availability = availability
+        self.prices = np.array([p.nightly_rate for p in self.properties], dtype=float)
+        self.ratings = np.array([p.rating for p in self.properties], dtype=float)
+        self.amenity_masks = np.array([amenity_mask(p.amenities) for p in self.properties],
+                                      dtype=np.int64)
+        self.kind_codes = np.array([PROPERTY_KINDS.index(p.kind) for p in self.properties],
+                                   dtype=np.int8)
+
+        # Per city: rows cheapest first with their prices, and rows best rated first
+        cities: Dict[str, List[int]] = {}
+        for row, prop in enumerate(self.properties):
+            cities.setdefault(prop.city.lower(), []).append(row)
+        self._by_price: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._by_rating: Dict[str, np.ndarray] = {}
+        for city, rows in cities.items():
+            rows = np.array(rows)
+            by_price = rows[np.argsort(self.prices[rows], kind="stable")]
+            self._by_price[city] = (by_price, self.prices[by_price])
+            self._by_rating[city] = rows[np.argsort(-self.ratings[rows], kind="stable")]
+        self._aliases = city_aliases(cities)
+
+        logger.info("hotel_inventory.indexed", num_properties=len(self.properties),
+                    num_cities=len(cities))
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "HotelInventory":
+        """Load an inventory with one JSON-encoded Property per line"""
+        return cls(read_jsonl(path, Property))
+
+    def save_jsonl(self, path: str):
+        """Write the inventory as one JSON-encoded Property per line"""
+        write_jsonl(path, self.properties)
+
+    def city_key(self, destination: str) -> Optional[str]:
+        """Indexed city for a destination such as "Paris" or "Paris, France\""""
+        return resolve_city(destination, self._aliases)
+
+    def in_price_range(self, city: str, min_price: float = 0.0,
+                       max_price: float = float("inf")) -> np.ndarray:
+        """Row ids in a city priced within [min_price, max_price], cheapest first"""
+        key = self.city_key(city)
+        if key is None:
+            return np.empty(0, dtype=int)
+        rows, prices = self._by_price[key]
+        lo = np.searchsorted(prices, min_price, side="left")
+        hi = np.searchsorted(prices, max_price, side="right")
+        return rows[lo:hi]
+
+    def top_rated(self, city: str, k: int) -> np.ndarray:
+        """The k best-rated row ids in a city"""
+        key = self.city_key(city)
+        if key is None:
+            return np.empty(0, dtype=int)
+        return self._by_rating[key][:k]
+
+    def search(self, city: str, k: int = 5,
+               min_price: float = 0.0, max_price: float = float("inf"),
+               min_rating: float = 0.0,
+               kinds: Optional[Sequence[str]] = None,
+               required_amenities: Sequence[str] = (),
+               preferred_amenities: Sequence[str] = (),
+               weights: Optional[HotelWeights] = None,
+               check_in: Optional[str] = None,
+               check_out: Optional[str] = None) -> np.ndarray:
+        """Top k row ids by combined price, rating and preference score, best first.
+
+        The price index narrows candidates to the price range, required
+        amenities and the stay's nights are each one AND against bitsets,
+        and only the k best scores are fully sorted.
+        """
+        weights = weights or HotelWeights()
+        rows = self.in_price_range(city, min_price, max_price)
+
+        mask = self.ratings[rows] >= min_rating
+        required = amenity_mask(required_amenities)
+        if required:
+            mask &= (self.amenity_masks[rows] & required) == required
+        if kinds is not None:
+            mask &= np.isin(self.kind_codes[rows], [PROPERTY_KINDS.index(k) for k in kinds])
+        rows = rows[mask]
+        if self.availability is not None and check_in and check_out and check_out > check_in:
+            rows = self.availability.available_rows(rows, check_in, check_out)
+        if len(rows) == 0:
+            return rows
+
+        prices = self.prices[rows]
+        span = prices[-1] - prices[0]  # Rows are still cheapest first
+        price_score = 1.0 - (prices - prices[0]) / span if span > 0 else np.ones(len(rows))
+        score = weights.price * price_score + weights.rating * self.ratings[rows] / 5.0
+        if preferred_amenities:
+            masks = self.amenity_masks[rows]
+            offered = sum(((masks & AMENITY_BITS[name]) != 0).astype(float)
+                          for name in preferred_amenities)
+            score += weights.preference * offered / len(preferred_amenities)
+
+        if len(rows) > k:
+            best = np.argpartition(-score, k - 1)[:k]
+        else:
+            best = np.arange(len(rows))
+        return rows[best[np.argsort(-score[best], kind="stable")]]
+
+
+def generate_synthetic_inventory(cities: Dict[str, Tuple[float, float]],
+                                 properties_per_city: int = 20000, spread_km: float = 8.0,
+                                 seed: int = 0) -> HotelInventory:
+    """Inventory of hotels, hostels and apartments whose price and amenities rise with rating"""
+    rng = np.random.default_rng(seed)
+    price_ranges = {"hotel": (70.0, 450.0), "hostel": (20.0, 70.0), "apartment": (50.0, 300.0)}
+    properties = []
+    for city, lats, lons in synthetic_sites(rng, cities, properties_per_city, spread_km):
+        kinds = rng.choice(PROPERTY_KINDS, properties_per_city, p=[0.6, 0.15, 0.25])
+        ratings = random_ratings(rng, properties_per_city)
+        amenity_draws = rng.random((properties_per_city, len(AMENITIES)))
+        for n in range(properties_per_city):
+            low, high = price_ranges[kinds[n]]
+            # Better-rated properties tend to charge more
+            quality = (ratings[n] - 2.5) / 2.5
+            price = float(np.round(low + (high - low) * (0.6 * quality + 0.4 * rng.random())))
+            properties.append(Property(
+                property_id=len(properties),
+                name=f"{city.split(',')[0]} {kinds[n].title()} {n}",
+                city=city,
+                kind=str(kinds[n]),
+                nightly_rate=price,
+                rating=float(ratings[n]),
+                amenities=[a for a, draw in zip(AMENITIES, amenity_draws[n]) if draw < 0.2 + 0.5 * quality],
+                latitude=float(lats[n]),
+                longitude=float(lons[n]),
+                url=f"https://example.com/stay/{len(properties)}"
+            ))
+    return HotelInventory(properties)
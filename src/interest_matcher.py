@@ -0,0 +1,129 @@
+"""
+Interest matching
+Compiles a set of interests once into a single-pass matcher over activity text
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+WORD = re.compile(r"[a-z0-9]+")
+# Suffix rules, first match wins; each is (suffix, replacement, minimum word length)
+STEM_RULES = (
+    ("sses", "ss", 5), ("ches", "ch", 5), ("shes", "sh", 5), ("xes", "x", 4),
+    ("ies", "y", 5), ("ing", "", 6), ("ed", "", 5), ("s", "", 4),
+)
+KEEP_FINAL_S = ("ss", "us", "is")
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping so "museums"/"museum" and "dancing"/"dance" agree"""
+    for suffix, replacement, min_length in STEM_RULES:
+        if len(word) >= min_length and word.endswith(suffix):
+            if suffix != "s" or not word.endswith(KEEP_FINAL_S):
+                word = word[:-len(suffix)] + replacement
+            break
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiouls":
+        word = word[:-1]  # "shopp(ing)" -> "shop"
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]  # "dance" -> "danc", as "dancing" became
+    return word
+
+
+def _stem_text(text: str) -> str:
+    return WORD.sub(lambda m: stem(m.group()), text)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex for a trie of words, so shared prefixes are only tried once per position"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a word
+
+    def build(node: Dict[str, dict]) -> str:
+        ends = "" in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            # A word can stop here; longer words sharing the prefix are optional
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class InterestMatcher:
+    """Finds which interests appear in text in one scan of the text.
+
+    Interests are lowercased (and stemmed, if asked) once and compiled into a
+    regex shaped like a trie, so each text position is tried against all
+    interests at once and cost grows with text length, not with the
+    number of interests. With whole_words an interest must start and end on
+    word boundaries ("art" no longer matches "party"); with stem both sides
+    are reduced by stem() first ("museums" matches "museum").
+    """
+
+    def __init__(self, interests: Iterable[str], whole_words: bool = False, stem: bool = False):
+        self.whole_words = whole_words
+        self.stem = stem
+        self.interests: List[str] = []
+        self._by_key: Dict[str, Set[str]] = {}
+        for interest in interests:
+            key = self._normalize(interest.strip().lower())
+            if not key:
+                continue
+            self.interests.append(interest)
+            self._by_key.setdefault(key, set()).add(interest)
+
+        if not self._by_key:
+            self._pattern = None
+            return
+        body = _trie_pattern(self._by_key)
+        self._pattern = re.compile(r"\b(?:" + body + r")\b" if whole_words else body)
+        self._each = {key: re.compile(r"\b" + re.escape(key) + r"\b" if whole_words else re.escape(key))
+                      for key in self._by_key}
+
+    def _normalize(self, text: str) -> str:
+        return _stem_text(text) if self.stem else text
+
+    def _prepare(self, text: str) -> str:
+        return self._normalize(text.lower())
+
+    def matches(self, text: str) -> bool:
+        """Whether any interest appears in text"""
+        return self._pattern is not None and self._pattern.search(self._prepare(text)) is not None
+
+    def count(self, text: str) -> int:
+        """How many of the interests appear in text"""
+        return len(self.matching_interests(text))
+
+    def matching_interests(self, text: str) -> Set[str]:
+        """Every interest that appears in text; one scan per interest, for reporting"""
+        if self._pattern is None:
+            return set()
+        text = self._prepare(text)
+        return {interest for key, pattern in self._each.items() if pattern.search(text)
+                for interest in self._by_key[key]}
+
+
+def activity_text(activity) -> str:
+    """Text of an activity searched for interests"""
+    return f"{activity.name} {activity.description}"
+
+
+@lru_cache(maxsize=1024)
+def _compiled(interests: Tuple[str, ...], whole_words: bool, stem: bool) -> InterestMatcher:
+    return InterestMatcher(interests, whole_words=whole_words, stem=stem)
+
+
+def compile_interests(interests: Iterable[str], whole_words: bool = False,
+                      stem: bool = False) -> InterestMatcher:
+    """Shared matcher for an interest set; identical sets reuse one compiled matcher"""
+    return _compiled(tuple(sorted({i.lower() for i in interests})), whole_words, stem)
@@ -0,0 +1,158 @@
+"""
+Incremental itinerary editing
+Applies single user edits without re-running the whole planning pipeline
+"""
+
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Optional
+
+import structlog
+
+from budget_ledger import BudgetLedger
+from currency import load_fx_table
+from trip_planner_agent import (
+    Activity, CoordinatorAgent, DayPlan, TripItinerary, DEFAULT_NIGHTLY_RATE
+)
+from time_windows import check_day_plan, repair_day_plan
+
+logger = structlog.get_logger()
+
+
+class ItineraryEditor:
+    """Edits a finished TripItinerary in place.
+
+    Each edit touches only the affected DayPlan, records the cost difference
+    in the itinerary's BudgetLedger instead of re-analyzing, and asks the
+    booking agent again only when the trip dates change.
+    """
+
+    def __init__(self, coordinator: CoordinatorAgent):
+        self.coordinator = coordinator
+        logger.info("itinerary_editor.initialized")
+
+    def replace_activity(self, itinerary: TripItinerary, day_number: int,
+                         activity_index: int, activity: Activity) -> TripItinerary:
+        """Swap one activity, keeping its time slot when the new one has none.
+        
+        The new activity is re-priced into the itinerary's currency first.
+        """
+        day = self._day(itinerary, day_number)
+        old = day.activities[activity_index]
+        if not activity.time:
+            activity = replace(activity, time=old.time)
+        currency = itinerary.budget.currency
+        if activity.currency != currency:
+            cost = load_fx_table().convert(activity.cost, activity.currency, currency)
+            activity = replace(activity, cost=float(cost), currency=currency)
+
+        activities = list(day.activities)
+        activities[activity_index] = activity
+        updated = self._check_opening_hours(itinerary, replace(day, activities=activities))
+
+        self._reprice(itinerary, day, updated)
+        itinerary.days[itinerary.days.index(day)] = updated
+        logger.info("itinerary_editor.activity_replaced", day=day_number,
+                    old=old.name, new=activity.name)
+        return itinerary
+
+    def drop_day(self, itinerary: TripItinerary, day_number: int) -> TripItinerary:
+        """Remove a day; later days move one date earlier and the trip ends a day sooner"""
+        if len(itinerary.days) <= 1:
+            raise ValueError("Cannot drop the only day of a trip")
+        day = self._day(itinerary, day_number)
+        position = itinerary.days.index(day)
+        nightly_rate = self._nightly_rate(itinerary)
+
+        ledger = self._ledger(itinerary)
+        self._reprice(itinerary, day, None)
+        ledger.drop_day(day_number)
+        del itinerary.days[position]
+        for later in itinerary.days[position:]:
+            later.day_number -= 1
+            later.date = (date.fromisoformat(later.date) - timedelta(days=1)).isoformat()
+
+        requirements = itinerary.requirements
+        end_date = date.fromisoformat(requirements.end_date) - timedelta(days=1)
+        itinerary.requirements = replace(requirements, end_date=end_date.isoformat())
+        ledger.set_fixed("accommodation", ledger.fixed("accommodation") - nightly_rate)
+        itinerary.budget.refresh(ledger, itinerary.requirements.budget)
+
+        # Dates changed, so availability and prices may have too; agents price in base currency
+        requirements = self.coordinator._in_base_currency(itinerary.requirements)
+        bookings = self.coordinator.booking_agent.find_options(requirements)
+        itinerary.bookings = self._in_currency(bookings, itinerary.budget.currency)
+        logger.info("itinerary_editor.day_dropped", day=day_number,
+                    num_days=len(itinerary.days))
+        return itinerary
+
+    def change_budget(self, itinerary: TripItinerary, budget: float) -> TripItinerary:
+        """Set a new budget, repairing the plan only if it no longer fits"""
+        itinerary.requirements = replace(itinerary.requirements, budget=budget)
+        breakdown = itinerary.budget
+        breakdown.within_budget = breakdown.total <= budget
+        if breakdown.within_budget:
+            breakdown.savings_suggestions = []  # Nothing left to save for
+        else:
+            # Repair rebuilds the suggestions, so the shortfall line is replaced, not repeated
+            self.coordinator.budget_agent.repair(itinerary.requirements, itinerary.days,
+                                                 breakdown, itinerary.bookings,
+                                                 self._ledger(itinerary))
+        logger.info("itinerary_editor.budget_changed", budget=budget,
+                    within_budget=breakdown.within_budget)
+        return itinerary
+
+    @staticmethod
+    def _day(itinerary: TripItinerary, day_number: int) -> DayPlan:
+        for day in itinerary.days:
+            if day.day_number == day_number:
+                return day
+        raise ValueError(f"Itinerary has no day {day_number}")
+
+    def _check_opening_hours(self, itinerary: TripItinerary, day: DayPlan) -> DayPlan:
+        """Repair the edited day against known opening hours, if the planner has any"""
+        index = self.coordinator.itinerary_agent.opening_hours_for(itinerary.requirements)
+        if not len(index):
+            return day
+        weekday = date.fromisoformat(day.date).weekday()
+        if check_day_plan(day, index, weekday):
+            return repair_day_plan(day, index, weekday)
+        return day
+
+    def _reprice(self, itinerary: TripItinerary, old: DayPlan, new: Optional[DayPlan]):
+        """Record the cost difference between two versions of a day in the ledger"""
+        ledger = self._ledger(itinerary)
+        for activity in old.activities:
+            ledger.remove_activity(old.day_number, activity)
+        if new is not None:
+            for activity in new.activities:
+                ledger.add_activity(new.day_number, activity)
+            new.total_cost = ledger.day_total(new.day_number)
+        itinerary.budget.refresh(ledger, itinerary.requirements.budget)
+
+    @staticmethod
+    def _in_currency(bookings, currency: str):
+        """Booking options re-priced into the itinerary's currency"""
+        if all(b.currency == currency for b in bookings):
+            return bookings
+        prices = load_fx_table().convert([b.price for b in bookings],
+                                         [b.currency for b in bookings], currency)
+        return [replace(b, price=float(price), currency=currency)
+                for b, price in zip(bookings, prices)]
+
+    @staticmethod
+    def _ledger(itinerary: TripItinerary) -> BudgetLedger:
+        """The itinerary's ledger, rebuilt from its days and budget when missing"""
+        if itinerary.ledger is None:
+            ledger = BudgetLedger.from_days(itinerary.days)
+            ledger.set_fixed("accommodation", itinerary.budget.accommodation)
+            ledger.set_fixed("transportation", itinerary.budget.transportation)
+            itinerary.ledger = ledger
+        return itinerary.ledger
+
+    @staticmethod
+    def _nightly_rate(itinerary: TripItinerary) -> float:
+        nights = len(itinerary.days) - 1
+        if nights > 0 and itinerary.budget.accommodation > 0:
+            return itinerary.budget.accommodation / nights
+        return DEFAULT_NIGHTLY_RATE
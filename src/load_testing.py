@@ -0,0 +1,110 @@
+"""
+Load testing for the Trip Planner Agent
+Drives CoordinatorAgent at a target request rate and reports throughput and latency percentiles
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, Sequence
+
+import numpy as np
+import structlog
+
+from scenario_generator import generate_scenarios
+from trip_planner_agent import CoordinatorAgent, TripRequirements
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class LoadTestReport:
+    """Outcome of one load test; latencies are in milliseconds"""
+    requests: int
+    completed: int
+    errors: int
+    duration_s: float
+    target_rps: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def run_load_test(requests: Sequence[TripRequirements], target_rps: float,
+                  concurrency: int = 8,
+                  coordinator_factory: Callable[[], CoordinatorAgent] = CoordinatorAgent,
+                  max_iterations: int = 3) -> LoadTestReport:
+    """Send requests at target_rps and measure how the coordinator keeps up.
+
+    Arrivals are open-loop: request i is due at i / target_rps whether or
+    not earlier ones have finished, and its latency counts from when it was
+    due. A saturated system therefore shows queueing delay in its
+    percentiles instead of quietly lowering the offered rate. Each worker
+    thread plans with its own coordinator, so memory banks are not shared.
+    """
+    if target_rps <= 0:
+        raise ValueError("target_rps must be positive")
+    local = threading.local()
+    latencies = np.full(len(requests), np.nan)
+    errors = 0
+    errors_lock = threading.Lock()
+
+    def handle(index: int, requirements: TripRequirements, due: float):
+        nonlocal errors
+        if not hasattr(local, "coordinator"):
+            local.coordinator = coordinator_factory()
+        try:
+            local.coordinator.process_request(requirements, max_iterations=max_iterations)
+        except Exception as error:
+            logger.warning("load_test.request_failed", index=index, error=str(error))
+            with errors_lock:
+                errors += 1
+            return
+        latencies[index] = time.perf_counter() - due
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load-test") as executor:
+        for index, requirements in enumerate(requests):
+            due = start + index / target_rps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(handle, index, requirements, due)
+    duration_s = time.perf_counter() - start
+
+    done = latencies[~np.isnan(latencies)] * 1000
+    p50, p95, p99 = np.percentile(done, [50, 95, 99]) if len(done) else (0.0, 0.0, 0.0)
+    report = LoadTestReport(
+        requests=len(requests),
+        completed=len(done),
+        errors=errors,
+        duration_s=duration_s,
+        target_rps=target_rps,
+        throughput_rps=len(done) / duration_s if duration_s > 0 else 0.0,
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+        max_ms=float(done.max()) if len(done) else 0.0
+    )
+    logger.info("load_test.completed", **report.to_dict())
+    return report
+
+
+def print_load_test_report(report: LoadTestReport):
+    """Display a load test report"""
+    print(f"Requests: {report.completed}/{report.requests} completed, {report.errors} errors")
+    print(f"Throughput: {report.throughput_rps:.1f} req/s (target {report.target_rps:.1f})")
+    print(f"Latency: p50 {report.p50_ms:.1f} ms | p95 {report.p95_ms:.1f} ms | "
+          f"p99 {report.p99_ms:.1f} ms | max {report.max_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    scenarios = generate_scenarios(200, seed=42)
+    report = run_load_test([requirements for _, requirements in scenarios], target_rps=20.0)
+    print_load_test_report(report)
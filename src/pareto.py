@@ -0,0 +1,45 @@
+"""
+Pareto-front selection over candidate itineraries
+Vectorized non-dominated sorting for multi-objective planning
+"""
+
+from typing import List
+
+import numpy as np
+
+
+def dominance_matrix(objectives: np.ndarray) -> np.ndarray:
+    """dominates[i, j] is True when candidate i dominates candidate j.
+
+    Every objective is minimized: i dominates j when it is no worse on all
+    objectives and strictly better on at least one.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    left = objectives[:, None, :]
+    right = objectives[None, :, :]
+    return np.all(left <= right, axis=2) & np.any(left < right, axis=2)
+
+
+def non_dominated_sort(objectives: np.ndarray) -> np.ndarray:
+    """Front rank per candidate; 0 is the Pareto front, 1 the next layer, ..."""
+    dominates = dominance_matrix(objectives)
+    dominated_by = dominates.sum(axis=0)
+    ranks = np.full(len(dominates), -1)
+    rank = 0
+    front = np.flatnonzero(dominated_by == 0)
+    while len(front):
+        ranks[front] = rank
+        dominated_by = dominated_by - dominates[front].sum(axis=0)
+        dominated_by[ranks >= 0] = -1
+        front = np.flatnonzero(dominated_by == 0)
+        rank += 1
+    return ranks
+
+
+def pareto_front(objectives: np.ndarray) -> List[int]:
+    """Indices of non-dominated candidates, duplicates of the same point removed"""
+    objectives = np.asarray(objectives, dtype=float)
+    _, unique = np.unique(objectives, axis=0, return_index=True)
+    unique = np.sort(unique)
+    front = np.flatnonzero(non_dominated_sort(objectives[unique]) == 0)
+    return unique[front].tolist()
@@ -0,0 +1,329 @@
+"""
+Local points-of-interest catalog
+Grid spatial index plus category, interest and price indexes over NumPy arrays
+"""
+
+import json
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from routing import EARTH_RADIUS_KM, haversine_km
+
+logger = structlog.get_logger()
+
+
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180.0
+DEFAULT_CELL_KM = 1.0
+FOOD_CATEGORIES = {"food", "cafe", "market"}
+LODGING_CATEGORIES = {"lodging"}
+
+
+def city_aliases(cities: Iterable[str]) -> Dict[str, str]:
+    """Lookup keys for lower-cased city names; "paris" finds "paris, france" and vice versa"""
+    cities = list(cities)
+    aliases = {city.split(",")[0].strip(): city for city in cities}
+    aliases.update({city: city for city in cities})
+    return aliases
+
+
+def read_jsonl(path: str, record_type: type) -> list:
+    """Records of a dataclass type stored as one JSON object per line"""
+    with open(path) as f:
+        return [record_type(**json.loads(line)) for line in f if line.strip()]
+
+
+def write_jsonl(path: str, records: Iterable):
+    """Write dataclass records as one JSON object per line"""
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(asdict(record)) + "\n")
+
+
+def resolve_city(destination: str, aliases: Dict[str, str]) -> Optional[str]:
+    """Indexed city for a destination, whether given as "Paris" or "Paris, France" """
+    for key in (destination.lower(), destination.split(",")[0].strip().lower()):
+        if key in aliases:
+            return aliases[key]
+    return None
+
+
+@dataclass
+class POI:
+    """Single point of interest"""
+    poi_id: int
+    name: str
+    city: str
+    category: str
+    latitude: float
+    longitude: float
+    price: float
+    rating: float
+    interests: List[str] = field(default_factory=list)
+    description: str = ""
+    opening_hours: List[List[int]] = field(default_factory=list)  # [open, close] minutes; empty = always open
+
+
+class POICatalog:
+    """Read-only POI catalog indexed for location, category, interest and price"""
+
+    def __init__(self, pois: Sequence[POI], cell_km: float = DEFAULT_CELL_KM):
+        self.pois = list(pois)
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.latitudes = np.array([p.latitude for p in self.pois], dtype=float)
+        self.longitudes = np.array([p.longitude for p in self.pois], dtype=float)
+        self.prices = np.array([p.price for p in self.pois], dtype=float)
+        self.ratings = np.array([p.rating for p in self.pois], dtype=float)
+
+        self.categories = sorted({p.category for p in self.pois})
+        self.interests = sorted({i for p in self.pois for i in p.interests})
+        category_ids = {c: i for i, c in enumerate(self.categories)}
+        interest_ids = {i: n for n, i in enumerate(self.interests)}
+        self.category_codes = np.array([category_ids[p.category] for p in self.pois], dtype=np.int32)
+        self.interest_matrix = np.zeros((len(self.pois), len(self.interests)), dtype=bool)
+        for row, poi in enumerate(self.pois):
+            for interest in poi.interests:
+                self.interest_matrix[row, interest_ids[interest]] = True
+
+        # Inverted indexes: sorted row ids per category / interest / city
+        self._by_category = {c: np.flatnonzero(self.category_codes == i)
+                             for c, i in category_ids.items()}
+        self._by_interest = {i: np.flatnonzero(self.interest_matrix[:, n])
+                             for i, n in interest_ids.items()}
+        cities: Dict[str, List[int]] = {}
+        for row, poi in enumerate(self.pois):
+            cities.setdefault(poi.city.lower(), []).append(row)
+        self._by_city = {c: np.array(rows) for c, rows in cities.items()}
+        self._city_aliases = city_aliases(cities)
+
+        # Price-sorted view for range queries
+        self._price_order = np.argsort(self.prices, kind="stable")
+        self._sorted_prices = self.prices[self._price_order]
+
+        # Grid index: rows sorted by cell key, so each grid row's cells are contiguous
+        rows = np.floor(self.latitudes / self.cell_deg).astype(np.int64)
+        cols = np.floor(self.longitudes / self.cell_deg).astype(np.int64)
+        self._col_span = int(np.ceil(360.0 / self.cell_deg)) + 1
+        keys = rows * self._col_span + cols
+        self._grid_order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._grid_order]
+
+        logger.info("poi_catalog.indexed", num_pois=len(self.pois),
+                    num_categories=len(self.categories))
+
+    def __len__(self) -> int:
+        return len(self.pois)
+
+    @classmethod
+    def from_jsonl(cls, path: str, cell_km: float = DEFAULT_CELL_KM) -> "POICatalog":
+        """Load a catalog with one JSON-encoded POI per line"""
+        return cls(read_jsonl(path, POI), cell_km=cell_km)
+
+    def save_jsonl(self, path: str):
+        """Write the catalog as one JSON-encoded POI per line"""
+        write_jsonl(path, self.pois)
+
+    def by_category(self, category: str) -> np.ndarray:
+        """Row ids in a category"""
+        return self._by_category.get(category, np.empty(0, dtype=int))
+
+    def by_interest(self, interest: str) -> np.ndarray:
+        """Row ids tagged with an interest"""
+        return self._by_interest.get(interest, np.empty(0, dtype=int))
+
+    def city_key(self, destination: str) -> Optional[str]:
+        """Indexed city for a destination, with or without its country"""
+        return resolve_city(destination, self._city_aliases)
+
+    def by_city(self, city: str) -> np.ndarray:
+        """Row ids in a city, with or without its country"""
+        return self._by_city.get(self.city_key(city), np.empty(0, dtype=int))
+
+    def in_price_range(self, min_price: float = 0.0,
+                       max_price: float = float("inf")) -> np.ndarray:
+        """Row ids priced within [min_price, max_price], cheapest first"""
+        lo = np.searchsorted(self._sorted_prices, min_price, side="left")
+        hi = np.searchsorted(self._sorted_prices, max_price, side="right")
+        return self._price_order[lo:hi]
+
+    def city_center(self, city: str) -> Optional[Tuple[float, float]]:
+        """Centroid of a city's POIs"""
+        rows = self.by_city(city)
+        if len(rows) == 0:
+            return None
+        return float(self.latitudes[rows].mean()), float(self.longitudes[rows].mean())
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float,
+               categories: Optional[Sequence[str]] = None,
+               interest: Optional[str] = None,
+               max_price: Optional[float] = None,
+               limit: Optional[int] = None) -> np.ndarray:
+        """Row ids within radius_km matching every filter, nearest first"""
+        candidates = self._grid_candidates(latitude, longitude, radius_km)
+
+        mask = np.ones(len(candidates), dtype=bool)
+        if categories is not None:
+            codes = [self.categories.index(c) for c in categories if c in self.categories]
+            mask &= np.isin(self.category_codes[candidates], codes)
+        if interest is not None:
+            if interest not in self.interests:
+                return np.empty(0, dtype=int)
+            mask &= self.interest_matrix[candidates, self.interests.index(interest)]
+        if max_price is not None:
+            mask &= self.prices[candidates] <= max_price
+        candidates = candidates[mask]
+
+        distances = self.distances_km(latitude, longitude, candidates)
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+        order = np.argsort(distances, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return candidates[order]
+
+    def distances_km(self, latitude: float, longitude: float, rows: np.ndarray) -> np.ndarray:
+        """Great-circle distance from a point to each row"""
+        return haversine_km(latitude, longitude, self.latitudes[rows], self.longitudes[rows])
+
+    def _grid_candidates(self, latitude: float, longitude: float,
+                         radius_km: float) -> np.ndarray:
+        """Row ids in the grid cells overlapping the query circle's bounding box"""
+        lat_span = radius_km / KM_PER_DEGREE
+        lon_span = lat_span / max(np.cos(np.radians(latitude)), 1e-6)
+        row_lo = int(np.floor((latitude - lat_span) / self.cell_deg))
+        row_hi = int(np.floor((latitude + lat_span) / self.cell_deg))
+        col_lo = int(np.floor((longitude - lon_span) / self.cell_deg))
+        col_hi = int(np.floor((longitude + lon_span) / self.cell_deg))
+
+        rows = np.arange(row_lo, row_hi + 1, dtype=np.int64) * self._col_span
+        starts = np.searchsorted(self._sorted_keys, rows + col_lo, side="left")
+        ends = np.searchsorted(self._sorted_keys, rows + col_hi, side="right")
+        if len(starts) == 1:
+            return self._grid_order[starts[0]:ends[0]]
+        return np.concatenate([self._grid_order[s:e] for s, e in zip(starts, ends)])
+
+
+class POISearchTool:
+    """Search tool answering destination queries from a local POI catalog"""
+
+    def __init__(self, catalog: POICatalog, radius_km: float = 5.0):
+        self.catalog = catalog
+        self.radius_km = radius_km
+
+    def search(self, query: str, interests: List[str] = None,
+               num_results: int = 5) -> List[Dict[str, object]]:
+        """Return the best-rated nearby POIs matching the query wording"""
+        logger.info("tool.poi_search.called", query=query)
+        destination = query.rsplit(" in ", 1)[-1]
+        center = self.catalog.city_center(destination)
+        if center is None:
+            return []
+
+        lowered = query.lower()
+        if "restaurant" in lowered or "food" in lowered:
+            categories = sorted(FOOD_CATEGORIES & set(self.catalog.categories))
+        elif "hotel" in lowered:
+            categories = sorted(LODGING_CATEGORIES & set(self.catalog.categories))
+        else:
+            categories = [c for c in self.catalog.categories
+                          if c not in FOOD_CATEGORIES | LODGING_CATEGORIES]
+
+        rows = self.catalog.nearby(center[0], center[1], self.radius_km, categories=categories)
+        rows = rows[np.isin(rows, self.catalog.by_city(destination))]
+
+        # Rank by matched interests, then rating
+        relevance = self.catalog.ratings[rows].copy()
+        for interest in interests or []:
+            if interest in self.catalog.interests:
+                column = self.catalog.interests.index(interest)
+                relevance += 10.0 * self.catalog.interest_matrix[rows, column]
+        top = rows[np.argsort(-relevance, kind="stable")[:num_results]]
+
+        return [self._to_result(self.catalog.pois[row]) for row in top]
+
+    @staticmethod
+    def _to_result(poi: POI) -> Dict[str, object]:
+        """Search-result dict in the shape the agents consume"""
+        price = "Free" if poi.price == 0 else f"${poi.price:.0f}"
+        tags = ", ".join(poi.interests)
+        return {
+            "title": poi.name,
+            "snippet": f"{poi.description or poi.category.title()} ({tags}), {price}, {poi.rating:.1f} stars",
+            "lat": poi.latitude,
+            "lon": poi.longitude,
+            "price": poi.price,
+            "rating": poi.rating,
+            "category": poi.category,
+            "opening_hours": poi.opening_hours,
+        }
+
+
+CATEGORY_PROFILES = {
+    # category: (price range, interests it may carry, opening hours in minutes)
+    "food": ((8.0, 60.0), ["food", "culture"], [[690, 900], [1080, 1380]]),
+    "cafe": ((4.0, 20.0), ["food"], [[420, 1140]]),
+    "market": ((0.0, 25.0), ["food", "shopping", "culture"], [[480, 840]]),
+    "museum": ((0.0, 35.0), ["art", "history", "culture"], [[600, 1080]]),
+    "gallery": ((0.0, 25.0), ["art", "culture"], [[660, 1140]]),
+    "landmark": ((0.0, 30.0), ["history", "architecture"], [[540, 1080]]),
+    "park": ((0.0, 10.0), ["nature", "family"], [[360, 1320]]),
+    "beach": ((0.0, 15.0), ["beach", "nature"], []),
+    "nightlife": ((10.0, 50.0), ["nightlife", "entertainment"], [[1200, 1560]]),
+    "theme_park": ((40.0, 150.0), ["theme parks", "entertainment", "family"], [[540, 1320]]),
+    "shopping": ((0.0, 40.0), ["shopping"], [[600, 1260]]),
+    "lodging": ((60.0, 400.0), [], []),
+}
+
+
+def synthetic_sites(rng: np.random.Generator, cities: Dict[str, Tuple[float, float]],
+                    per_city: int, spread_km: float
+                    ) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+    """Per city: its name and the coordinates of per_city random sites around its center.
+
+    Sites are normally distributed with most within spread_km. The caller
+    draws its per-site attributes from rng before the next city is yielded.
+    """
+    spread_deg = spread_km / KM_PER_DEGREE
+    for city, (center_lat, center_lon) in cities.items():
+        lats = center_lat + rng.normal(0.0, spread_deg / 2, per_city)
+        lons = center_lon + rng.normal(0.0, spread_deg / 2, per_city) / np.cos(np.radians(center_lat))
+        yield city, lats, lons
+
+
+def random_ratings(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Ratings from 2.5 to 5.0 stars, to one decimal"""
+    return np.round(rng.uniform(2.5, 5.0, count), 1)
+
+
+def generate_synthetic_catalog(cities: Dict[str, Tuple[float, float]],
+                               pois_per_city: int = 1000, spread_km: float = 8.0,
+                               seed: int = 0, cell_km: float = DEFAULT_CELL_KM) -> POICatalog:
+    """Catalog of POIs in every category, priced, tagged and timed per CATEGORY_PROFILES"""
+    rng = np.random.default_rng(seed)
+    categories = list(CATEGORY_PROFILES)
+    pois = []
+    for city, lats, lons in synthetic_sites(rng, cities, pois_per_city, spread_km):
+        picks = rng.integers(0, len(categories), pois_per_city)
+        ratings = random_ratings(rng, pois_per_city)
+        for n in range(pois_per_city):
+            category = categories[picks[n]]
+            (low, high), tags, hours = CATEGORY_PROFILES[category]
+            price = float(np.round(rng.uniform(low, high)))
+            if low == 0.0 and rng.random() < 0.3:
+                price = 0.0
+            chosen = [t for t in tags if rng.random() < 0.6] or tags[:1]
+            pois.append(POI(
+                poi_id=len(pois),
+                name=f"{city.split(',')[0]} {category.replace('_', ' ').title()} {n}",
+                city=city,
+                category=category,
+                latitude=float(lats[n]),
+                longitude=float(lons[n]),
+                price=price,
+                rating=float(ratings[n]),
+                interests=chosen,
+                opening_hours=hours
+            ))
+    return POICatalog(pois, cell_km=cell_km)
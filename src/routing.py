@@ -0,0 +1,74 @@
+"""
+Geographic routing for daily itineraries
+Haversine distance matrices and nearest-neighbor + 2-opt visit ordering
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0088
+TRAVEL_SPEED_KMH = 15.0  # Mix of walking and public transit in a city
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distances in km between points in degrees, broadcasting like NumPy"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=float))
+                              for x in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_matrix(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """Pairwise great-circle distances in km"""
+    lat = np.asarray(lats, dtype=float)
+    lon = np.asarray(lons, dtype=float)
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def nearest_neighbor_path(dist: np.ndarray, start: int = 0) -> List[int]:
+    """Greedy open path visiting every point once, beginning at start"""
+    visited = np.zeros(len(dist), dtype=bool)
+    visited[start] = True
+    path = [start]
+    for _ in range(len(dist) - 1):
+        next_point = int(np.argmin(np.where(visited, np.inf, dist[path[-1]])))
+        visited[next_point] = True
+        path.append(next_point)
+    return path
+
+
+def two_opt(path: Sequence[int], dist: np.ndarray, max_passes: int = 50) -> List[int]:
+    """Improve an open path by segment reversals, keeping its first point fixed"""
+    path = np.array(path)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, len(path) - 1):
+            a, b = path[i - 1], path[i]
+            c, d = path[i + 1:], path[i + 2:]
+            # Reversing path[i..j] swaps edges (a,b),(c,d) for (a,c),(b,d);
+            # the last point has no outgoing edge
+            delta = dist[a, c] - dist[a, b]
+            delta[:-1] += dist[b, d] - dist[c[:-1], d]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = i + 1 + best
+                path[i:j + 1] = path[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return path.tolist()
+
+
+def optimize_route(dist: np.ndarray, start: int = 0) -> List[int]:
+    """Short open visiting order over a distance matrix, starting at start"""
+    if len(dist) <= 2:
+        return nearest_neighbor_path(dist, start)
+    return two_opt(nearest_neighbor_path(dist, start), dist)
+
+
+def travel_minutes(distance_km: float, speed_kmh: float = TRAVEL_SPEED_KMH) -> float:
+    """Estimated door-to-door travel time"""
+    return distance_km / speed_kmh * 60.0
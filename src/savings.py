@@ -0,0 +1,181 @@
+"""
+Ranked savings suggestions
+Precomputed cheaper alternatives per category and accommodation tier, ranked with a heap
+by money saved per unit of preference lost
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from interest_matcher import activity_text, compile_interests
+
+
+@dataclass(frozen=True)
+class Alternative:
+    """Cheaper stand-in for an activity of some category.
+
+    Templates may use {name}, the full name of the replaced activity, and
+    {prefix}, its time-of-day label such as "Morning: ".
+    """
+    label: str
+    cost: float
+    preference: float  # 1.0 is as enjoyable as a typical paid activity
+    name_template: str = "{prefix}{label}"
+    description_template: str = "{label} instead of {name}"
+
+
+MEAL_ALTERNATIVES = (
+    Alternative("budget menu", 15.0, 0.7, "{name} (budget menu)", "budget menu for {name}"),
+    Alternative("street food", 8.0, 0.5, "{name} (street food)", "street food instead of {name}"),
+)
+ACTIVITY_ALTERNATIVES = {
+    "culture": (
+        Alternative("Free museum hour", 0.0, 0.5, description_template="free museum hour instead of {name}"),
+    ),
+}
+DEFAULT_ACTIVITY_ALTERNATIVES = (
+    Alternative("Self-guided walk", 0.0, 0.4, description_template="free walk instead of {name}"),
+)
+
+INTEREST_BONUS = 0.5  # Extra preference per interest an activity matches
+MIN_PREFERENCE_LOSS = 1e-3  # Swaps that lose nothing rank by saving alone
+DEFAULT_SUGGESTIONS = 3
+
+
+@dataclass
+class Substitution:
+    """One concrete, priced swap"""
+    day_number: Optional[int]  # None for accommodation
+    activity_index: Optional[int]
+    name: str
+    cost: float  # New activity cost, or new nightly rate for accommodation
+    saving: float
+    preference_loss: float
+    description: str
+
+    @property
+    def ratio(self) -> float:
+        """Money saved per unit of preference lost"""
+        return self.saving / max(self.preference_loss, MIN_PREFERENCE_LOSS)
+
+
+class SubstitutionTable:
+    """Cheaper alternatives per category, sorted by cost once at construction"""
+
+    def __init__(self, meal_alternatives: Sequence[Alternative] = MEAL_ALTERNATIVES,
+                 activity_alternatives: Dict[str, Sequence[Alternative]] = None,
+                 default_alternatives: Sequence[Alternative] = DEFAULT_ACTIVITY_ALTERNATIVES,
+                 cost_scale: float = 1.0):
+        activity_alternatives = ACTIVITY_ALTERNATIVES if activity_alternatives is None \
+            else activity_alternatives
+
+        def tiers(alternatives):
+            scaled = [Alternative(a.label, a.cost * cost_scale, a.preference,
+                                  a.name_template, a.description_template)
+                      for a in alternatives]
+            return tuple(sorted(scaled, key=lambda a: -a.cost))
+
+        self._tiers = {"meal": tiers(meal_alternatives)}
+        for category, alternatives in activity_alternatives.items():
+            self._tiers[category] = tiers(list(alternatives) + list(default_alternatives))
+        self._default = tiers(default_alternatives)
+
+    def alternatives(self, category: str) -> Tuple[Alternative, ...]:
+        return self._tiers.get(category, self._default)
+
+    def cheapest(self, category: str) -> float:
+        tiers = self.alternatives(category)
+        return tiers[-1].cost if tiers else 0.0
+
+    def ranked(self, days, nights: int = 0, accommodation: float = 0.0,
+               hotels: Sequence = (), interests: Sequence[str] = ()) -> Iterator[Substitution]:
+        """Yield swaps best ratio first; each assumes the previous ones were applied.
+
+        Every activity and the accommodation is a slot with its own current
+        cost and preference. The heap holds the best next step for each slot;
+        once a slot's swap is taken, its next cheaper step is pushed.
+        """
+        counter = itertools.count()
+        heap: List[Tuple[float, float, int, Substitution, tuple]] = []
+
+        def push(slot: tuple):
+            step = self._best_step(slot, hotels, nights)
+            if step is not None:
+                heapq.heappush(heap, (-step.ratio, -step.saving, next(counter), step, slot))
+
+        hotel_slot = self._hotel_slot(nights, accommodation, hotels)
+        if hotel_slot:
+            push(hotel_slot)
+        for day in days:
+            for index, activity in enumerate(day.activities):
+                if activity.cost > self.cheapest(activity.category):
+                    push(("activity", day.day_number, index, activity,
+                          activity.cost, self._preference(activity, interests)))
+
+        while heap:
+            _, _, _, step, slot = heapq.heappop(heap)
+            yield step
+            if slot[0] == "hotel":
+                push(("hotel", step.cost, slot[2] - step.preference_loss / nights))
+            else:
+                kind, day_number, index, activity, _, preference = slot
+                push((kind, day_number, index, activity, step.cost,
+                      preference - step.preference_loss))
+
+    def top(self, days, nights: int = 0, accommodation: float = 0.0, hotels: Sequence = (),
+            interests: Sequence[str] = (), limit: int = DEFAULT_SUGGESTIONS) -> List[Substitution]:
+        """Best independent swaps, at most one per activity or stay"""
+        steps = self.ranked(days, nights, accommodation, hotels, interests)
+        best: Dict[tuple, Substitution] = {}
+        for step in steps:
+            best.setdefault((step.day_number, step.activity_index), step)
+            if len(best) >= limit:
+                break
+        return list(best.values())
+
+    @staticmethod
+    def _hotel_slot(nights: int, accommodation: float, hotels: Sequence) -> Optional[tuple]:
+        if not nights or not hotels:
+            return None
+        nightly = accommodation / nights
+        # The current stay is assumed as good as the best hotel at or above its price
+        ratings = [h.rating for h in hotels if h.price >= nightly - 1e-9]
+        preference = (max(ratings) if ratings else 5.0) / 5.0
+        return ("hotel", nightly, preference)
+
+    def _best_step(self, slot: tuple, hotels: Sequence, nights: int) -> Optional[Substitution]:
+        """Cheaper option for a slot with the most saving per preference lost"""
+        if slot[0] == "hotel":
+            _, nightly, preference = slot
+            options = [(h.price, h.rating / 5.0, h) for h in hotels if h.price < nightly]
+            steps = [Substitution(None, None, h.name, price,
+                                  saving=(nightly - price) * nights,
+                                  preference_loss=max(0.0, preference - pref) * nights,
+                                  description=f"Stay at {h.name}")
+                     for price, pref, h in options]
+        else:
+            _, day_number, index, activity, cost, preference = slot
+            prefix = activity.name.split(": ", 1)[0] + ": " if ": " in activity.name else ""
+            steps = []
+            for alternative in self.alternatives(activity.category):
+                if alternative.cost >= cost:
+                    continue
+                fields = {"name": activity.name, "prefix": prefix, "label": alternative.label}
+                steps.append(Substitution(
+                    day_number, index,
+                    name=alternative.name_template.format(**fields),
+                    cost=alternative.cost,
+                    saving=cost - alternative.cost,
+                    preference_loss=max(0.0, preference - alternative.preference),
+                    description=f"Day {day_number}: "
+                                + alternative.description_template.format(**fields)
+                ))
+        return max(steps, key=lambda s: (s.ratio, s.saving), default=None)
+
+    @staticmethod
+    def _preference(activity, interests: Sequence[str]) -> float:
+        if activity.category == "meal":
+            return 1.0
+        return 1.0 + INTEREST_BONUS * compile_interests(interests).count(activity_text(activity))
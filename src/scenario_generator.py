@@ -0,0 +1,98 @@
+"""
+Synthetic trip scenarios
+Seeded generator of realistic TripRequirements with controllable distributions
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from trip_planner_agent import MAX_TRIP_DAYS, TripRequirements
+
+
+# Destination: relative popularity and how expensive a day there is compared to average
+DESTINATIONS = {
+    "Paris, France": (1.0, 1.2),
+    "Tokyo, Japan": (0.9, 1.1),
+    "Barcelona, Spain": (0.8, 0.9),
+    "New York, USA": (0.9, 1.4),
+    "Orlando, Florida": (0.6, 1.0),
+    "Rome, Italy": (0.8, 1.0),
+    "London, UK": (0.9, 1.3),
+    "Bangkok, Thailand": (0.6, 0.5),
+    "Mexico City, Mexico": (0.4, 0.6),
+    "Lisbon, Portugal": (0.5, 0.8),
+}
+INTERESTS = (
+    "art", "history", "culture", "food", "architecture", "beach", "nature",
+    "shopping", "nightlife", "family", "theme parks", "entertainment",
+)
+ACCOMMODATION = {"hotel": 0.55, "hostel": 0.15, "apartment": 0.2, "rental": 0.1}
+TRAVELERS = {1: 0.3, 2: 0.45, 3: 0.1, 4: 0.15}
+
+
+@dataclass
+class ScenarioDistribution:
+    """Knobs controlling what generate_scenarios draws"""
+    destinations: Dict[str, Tuple[float, float]] = field(default_factory=lambda: dict(DESTINATIONS))
+    trip_days: Tuple[int, int] = (2, 7)  # Inclusive range, drawn uniformly
+    daily_budget_median: float = 250.0  # Per traveler, before the destination's cost factor
+    daily_budget_sigma: float = 0.5  # Lognormal spread; larger means more tight and lavish trips
+    travelers: Dict[int, float] = field(default_factory=lambda: dict(TRAVELERS))
+    interests: Tuple[str, ...] = INTERESTS
+    interests_per_trip: Tuple[int, int] = (1, 3)  # Inclusive range
+    accommodation: Dict[str, float] = field(default_factory=lambda: dict(ACCOMMODATION))
+    first_start: str = "2025-01-01"
+    start_window_days: int = 365  # Trips start within this many days of first_start
+
+
+def _weighted(rng: np.random.Generator, weights: Dict, count: int) -> np.ndarray:
+    """Indexes into weights' keys drawn proportionally to their values"""
+    p = np.array(list(weights.values()), dtype=float)
+    return rng.choice(len(p), size=count, p=p / p.sum())
+
+
+def generate_scenarios(count: int, distribution: Optional[ScenarioDistribution] = None,
+                       seed: int = 0) -> List[Tuple[str, TripRequirements]]:
+    """Draw count named scenarios; the same seed always yields the same scenarios"""
+    dist = distribution or ScenarioDistribution()
+    if not 1 <= dist.trip_days[0] <= dist.trip_days[1] <= MAX_TRIP_DAYS:
+        raise ValueError(f"Trip days must lie within 1-{MAX_TRIP_DAYS}")
+    rng = np.random.default_rng(seed)
+
+    destinations = list(dist.destinations)
+    popularity = {d: weight for d, (weight, _) in dist.destinations.items()}
+    cost_factor = np.array([factor for _, factor in dist.destinations.values()])
+    party_sizes = np.array(list(dist.travelers))
+    lodging = list(dist.accommodation)
+
+    # Every field is drawn as one array up front
+    where = _weighted(rng, popularity, count)
+    days = rng.integers(dist.trip_days[0], dist.trip_days[1] + 1, count)
+    travelers = party_sizes[_weighted(rng, dist.travelers, count)]
+    daily = dist.daily_budget_median * np.exp(rng.normal(0.0, dist.daily_budget_sigma, count))
+    budgets = np.round(daily * cost_factor[where] * days * travelers, -1)
+    offsets = rng.integers(0, dist.start_window_days, count)
+    stays = _weighted(rng, dist.accommodation, count)
+    num_interests = rng.integers(dist.interests_per_trip[0], dist.interests_per_trip[1] + 1, count)
+    # Random keys per interest; the lowest num_interests of each row are picked
+    interest_keys = np.argsort(rng.random((count, len(dist.interests))), axis=1)
+
+    first = date.fromisoformat(dist.first_start)
+    scenarios = []
+    for n in range(count):
+        start = first + timedelta(days=int(offsets[n]))
+        destination = destinations[where[n]]
+        requirements = TripRequirements(
+            destination=destination,
+            start_date=start.isoformat(),
+            end_date=(start + timedelta(days=int(days[n]) - 1)).isoformat(),
+            budget=float(budgets[n]),
+            num_travelers=int(travelers[n]),
+            interests=[dist.interests[i] for i in interest_keys[n, :num_interests[n]]],
+            accommodation_preference=lodging[stays[n]]
+        )
+        scenarios.append((f"Scenario {n + 1}: {destination} ({days[n]}d)", requirements))
+    return scenarios
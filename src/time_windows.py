@@ -0,0 +1,192 @@
+"""
+Opening-hours and time-window constraints for day plans
+Times are integer minutes after midnight; opening hours live in a sorted interval index
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+MINUTES_PER_DAY = 24 * 60
+_KEY_SPAN = 2 * MINUTES_PER_DAY  # Room for intervals that close after midnight
+ALL_WEEK = tuple(range(7))
+
+
+@dataclass
+class Violation:
+    """Single time-window constraint violation in a day plan"""
+    activity_index: int
+    kind: str  # 'overlap', 'closed', 'day_boundary'
+    detail: str = ""
+
+
+class OpeningHoursIndex:
+    """Opening intervals per place and weekday, queried with binary search.
+
+    Intervals are stored as sorted integer keys ``(place * 7 + weekday) *
+    span + minute`` so a whole batch of visits is checked with one
+    searchsorted. Places never added are treated as always open; a known
+    place is closed on weekdays it has no intervals for.
+    """
+
+    def __init__(self):
+        self._place_ids: Dict[str, int] = {}
+        self._entries: List[Tuple[int, int, int, int]] = []
+        self._open_keys: Optional[np.ndarray] = None
+        self._close_keys: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._place_ids)
+
+    def add(self, place: str, intervals: Iterable[Sequence[int]],
+            weekdays: Iterable[int] = ALL_WEEK):
+        """Register opening intervals (open, close) in minutes for a place"""
+        place_id = self._place_ids.setdefault(place, len(self._place_ids))
+        for weekday in weekdays:
+            for open_minute, close_minute in intervals:
+                self._entries.append((place_id, weekday, int(open_minute), int(close_minute)))
+        self._open_keys = None
+
+    def place_id(self, place: str) -> int:
+        """Integer id of a place, -1 when it has no registered hours"""
+        return self._place_ids.get(place, -1)
+
+    def is_open(self, place_ids, weekday, starts, ends) -> np.ndarray:
+        """Whether each visit [start, end) fits inside one opening interval"""
+        self._build()
+        place_ids = np.asarray(place_ids)
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        base = (place_ids.astype(np.int64) * 7 + np.asarray(weekday, dtype=np.int64)) * _KEY_SPAN
+        if len(self._open_keys) == 0:
+            return np.ones(np.broadcast(place_ids, starts).shape, dtype=bool)
+
+        index = np.searchsorted(self._open_keys, base + starts, side="right") - 1
+        found = np.clip(index, 0, None)
+        fits = ((index >= 0)
+                & (self._open_keys[found] >= base)
+                & (self._close_keys[found] >= base + ends))
+        return fits | (place_ids < 0)
+
+    def next_opening(self, place: str, weekday: int, earliest: int,
+                     duration: int) -> Optional[int]:
+        """Earliest start at or after earliest that fits duration, if any"""
+        place_id = self.place_id(place)
+        if place_id < 0:
+            return earliest
+        self._build()
+        base = (place_id * 7 + weekday) * _KEY_SPAN
+        lo = np.searchsorted(self._open_keys, base, side="left")
+        hi = np.searchsorted(self._open_keys, base + _KEY_SPAN, side="left")
+        for open_key, close_key in zip(self._open_keys[lo:hi], self._close_keys[lo:hi]):
+            start = max(int(open_key - base), earliest)
+            if start + duration <= close_key - base:
+                return start
+        return None
+
+    def _build(self):
+        if self._open_keys is not None:
+            return
+        entries = np.array(self._entries, dtype=np.int64).reshape(-1, 4)
+        base = (entries[:, 0] * 7 + entries[:, 1]) * _KEY_SPAN
+        open_keys = base + entries[:, 2]
+        order = np.argsort(open_keys, kind="stable")
+        self._open_keys = open_keys[order]
+        self._close_keys = (base + entries[:, 3])[order]
+
+
+def check_plans_batch(index: OpeningHoursIndex, place_ids: np.ndarray,
+                      starts: np.ndarray, ends: np.ndarray, mask: np.ndarray,
+                      weekday=0) -> np.ndarray:
+    """Validate N candidate day plans of up to K visits at once.
+
+    All arrays are (N, K) with visits left-aligned in time order and mask
+    marking real visits; weekday is one int or an (N, 1) array of them.
+    Returns a boolean array of length N.
+    """
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    mask = np.asarray(mask, dtype=bool)
+    in_day = (starts >= 0) & (ends <= MINUTES_PER_DAY)
+    open_ok = index.is_open(place_ids, weekday, starts, ends)
+    visit_ok = np.all(~mask | (in_day & open_ok), axis=1)
+    # A visit may not begin before the previous one ends
+    ordered = ~(mask[:, 1:] & mask[:, :-1]) | (starts[:, 1:] >= ends[:, :-1])
+    return visit_ok & np.all(ordered, axis=1)
+
+
+def activity_place(activity) -> str:
+    """Venue key of an activity: its place, falling back to its name"""
+    return activity.place or activity.name
+
+
+def check_days_batch(days: Sequence, index: OpeningHoursIndex,
+                     weekdays: Sequence[int]) -> np.ndarray:
+    """Which DayPlans have no time-window violation, checked in one batch.
+
+    Equivalent to ``not check_day_plan(day, index, weekday)`` for each day.
+    """
+    width = max((len(day.activities) for day in days), default=0)
+    place_ids = np.full((len(days), width), -1, dtype=np.int64)
+    starts = np.zeros((len(days), width), dtype=np.int64)
+    ends = np.zeros((len(days), width), dtype=np.int64)
+    mask = np.zeros((len(days), width), dtype=bool)
+    for row, day in enumerate(days):
+        for col, activity in enumerate(day.activities):
+            place_ids[row, col] = index.place_id(activity_place(activity))
+            starts[row, col] = activity.start_minutes
+            ends[row, col] = activity.end_minutes
+            mask[row, col] = True
+    return check_plans_batch(index, place_ids, starts, ends, mask,
+                             np.asarray(weekdays, dtype=np.int64).reshape(-1, 1))
+
+
+def check_day_plan(day, index: OpeningHoursIndex, weekday: int = 0) -> List[Violation]:
+    """List every time-window violation in a DayPlan"""
+    activities = day.activities
+    windows = np.array([(a.start_minutes, a.end_minutes) for a in activities],
+                       dtype=np.int64).reshape(-1, 2)
+    place_ids = np.array([index.place_id(activity_place(a)) for a in activities])
+    open_ok = index.is_open(place_ids, weekday, windows[:, 0], windows[:, 1])
+
+    violations = []
+    for i, activity in enumerate(activities):
+        start, end = windows[i]
+        if i and start < windows[i - 1, 1]:
+            violations.append(Violation(i, "overlap", f"{activity.name} starts before "
+                                                      f"{activities[i - 1].name} ends"))
+        if start < 0 or end > MINUTES_PER_DAY:
+            violations.append(Violation(i, "day_boundary", f"{activity.name} runs past midnight"))
+        if not open_ok[i]:
+            violations.append(Violation(i, "closed", f"{activity.name} is closed at {activity.time}"))
+    return violations
+
+
+def repair_day_plan(day, index: OpeningHoursIndex, weekday: int = 0):
+    """Shift visits later to fit opening hours without overlaps; drop what cannot fit.
+
+    Returns a new DayPlan with times, total cost and notes updated.
+    """
+    kept = []
+    dropped = []
+    cursor = 0
+    for activity in sorted(day.activities, key=lambda a: a.start_minutes):
+        start, end = activity.start_minutes, activity.end_minutes
+        duration = end - start
+        earliest = max(start, cursor + int(round(activity.travel_minutes))) if kept else start
+        begin = index.next_opening(activity_place(activity), weekday, earliest, duration)
+        if begin is None or begin + duration > MINUTES_PER_DAY:
+            dropped.append(activity.name)
+            continue
+        if begin != start:
+            activity = replace(activity, time=f"{begin // 60:02d}:{begin % 60:02d}")
+        kept.append(activity)
+        cursor = begin + duration
+
+    notes = day.notes
+    if dropped:
+        notes = f"{notes}; skipped (closed): {', '.join(dropped)}" if notes else \
+            f"Skipped (closed): {', '.join(dropped)}"
+    return replace(day, activities=kept, total_cost=sum(a.cost for a in kept), notes=notes)
@@ -4,13 +4,32 @@ Demonstrates ADK concepts: parallel agents, tools, memory, observability
 """
 
 import os
+import re
 import json
+import time
+import zlib
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from datetime import datetime
+from dataclasses import dataclass, asdict, field, replace
+from datetime import datetime, date, timedelta
+import numpy as np
 import structlog
 
+from activity_selection import select_activities
+from booking_providers import BookingFanOut
+from budget_ledger import BudgetLedger
+from candidate_scoring import CandidateBatch, score_candidates
+from cost_simulation import DEFAULT_NUM_SAMPLES, CostRiskReport, simulate_itinerary
+from currency import BASE_CURRENCY, convert_itineraries, format_amount, load_fx_table
+from hotel_inventory import AMENITY_LABELS, HotelInventory, HotelWeights
+from interest_matcher import activity_text, compile_interests
+from pareto import pareto_front
+from routing import EARTH_RADIUS_KM, haversine_matrix, optimize_route, travel_minutes
+from savings import DEFAULT_SUGGESTIONS, MEAL_ALTERNATIVES, Substitution, SubstitutionTable
+from time_windows import MINUTES_PER_DAY, OpeningHoursIndex, check_day_plan, repair_day_plan
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -25,6 +44,30 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+# Planning defaults
+MAX_TRIP_DAYS = 30
+DEFAULT_NIGHTLY_RATE = 120.0
+DEFAULT_TRANSPORT_COST = 100.0
+LODGING_TYPES = ("hotel", "rental")
+
+# City centers (lat, lon) the mock search tool scatters its results around
+CITY_CENTERS = {
+    "paris": (48.8566, 2.3522),
+    "london": (51.5074, -0.1278),
+    "rome": (41.9028, 12.4964),
+    "barcelona": (41.3874, 2.1686),
+    "lisbon": (38.7223, -9.1393),
+    "amsterdam": (52.3676, 4.9041),
+    "berlin": (52.5200, 13.4050),
+    "new york": (40.7128, -74.0060),
+    "orlando": (28.5384, -81.3789),
+    "mexico city": (19.4326, -99.1332),
+    "tokyo": (35.6762, 139.6503),
+    "bangkok": (13.7563, 100.5018),
+    "sydney": (-33.8688, 151.2093),
+}
+MOCK_SPREAD_KM = 3.0  # Mock results land within this many km of the center on each axis
+
 
 @dataclass
 class TripRequirements:
@@ -37,12 +80,35 @@ class TripRequirements:
     interests: List[str] = None
     dietary_restrictions: List[str] = None
     accommodation_preference: str = "hotel"
+    currency: str = BASE_CURRENCY  # Currency the budget is given in
     
     def __post_init__(self):
         if self.interests is None:
             self.interests = []
         if self.dietary_restrictions is None:
             self.dietary_restrictions = []
+    
+    def trip_dates(self) -> List[date]:
+        """Calendar dates of the trip, start and end inclusive"""
+        start = date.fromisoformat(self.start_date)
+        end = date.fromisoformat(self.end_date)
+        num_days = (end - start).days + 1
+        if not 1 <= num_days <= MAX_TRIP_DAYS:
+            raise ValueError(
+                f"Trip must last 1-{MAX_TRIP_DAYS} days, got {num_days} "
+                f"({self.start_date} to {self.end_date})"
+            )
+        return [start + timedelta(days=offset) for offset in range(num_days)]
+    
+    @property
+    def num_days(self) -> int:
+        """Number of planned days"""
+        return len(self.trip_dates())
+    
+    @property
+    def num_nights(self) -> int:
+        """Number of nights needing accommodation"""
+        return self.num_days - 1
 
 
 @dataclass
@@ -54,6 +120,21 @@ class Activity:
     cost: float
     category: str
     description: str = ""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    travel_minutes: float = 0.0  # Travel from the previous stop
+    place: str = ""  # Venue the activity happens at
+    currency: str = BASE_CURRENCY
+    
+    @property
+    def start_minutes(self) -> int:
+        """Start time in minutes after midnight"""
+        return clock_to_minutes(self.time)
+    
+    @property
+    def end_minutes(self) -> int:
+        """End time in minutes after midnight"""
+        return self.start_minutes + int(round(self.duration_hours * 60))
 
 
 @dataclass
@@ -76,10 +157,34 @@ class BudgetBreakdown:
     total: float
     within_budget: bool
     savings_suggestions: List[str] = None
+    repairs: List[str] = None  # Substitutions applied to fit the budget
+    repair_steps: int = 0
+    currency: str = BASE_CURRENCY
+    risk: Optional[CostRiskReport] = None  # Set by simulation mode
     
     def __post_init__(self):
         if self.savings_suggestions is None:
             self.savings_suggestions = []
+        if self.repairs is None:
+            self.repairs = []
+    
+    @classmethod
+    def from_ledger(cls, ledger: BudgetLedger, budget: float,
+                    savings_suggestions: List[str] = None) -> "BudgetBreakdown":
+        """Snapshot the ledger's running totals"""
+        breakdown = cls(0.0, 0.0, 0.0, 0.0, 0.0, False,
+                        savings_suggestions=savings_suggestions)
+        breakdown.refresh(ledger, budget)
+        return breakdown
+    
+    def refresh(self, ledger: BudgetLedger, budget: float):
+        """Copy the ledger's totals, keeping suggestions and repairs"""
+        self.accommodation = ledger.fixed("accommodation")
+        self.transportation = ledger.fixed("transportation")
+        self.activities = ledger.activities
+        self.meals = ledger.meals
+        self.total = ledger.total
+        self.within_budget = ledger.total <= budget
 
 
 @dataclass
@@ -91,6 +196,8 @@ class BookingOption:
     rating: float
     url: str = ""
     features: List[str] = None
+    currency: str = BASE_CURRENCY
+    provider: str = ""  # Booking provider the option came from, if any
     
     def __post_init__(self):
         if self.features is None:
@@ -106,6 +213,14 @@ class TripItinerary:
     bookings: List[BookingOption]
     created_at: str
     iteration_count: int = 1
+    label: str = ""  # Trade-off this alternative represents, e.g. "cheapest"
+    partial_sections: List[str] = None  # Sections cut short by a deadline, e.g. "bookings"
+    search_completion: float = 1.0  # Share of the planned search finished
+    ledger: Optional[BudgetLedger] = None  # Running totals behind budget
+    
+    def __post_init__(self):
+        if self.partial_sections is None:
+            self.partial_sections = []
 
 
 class MemoryBank:
@@ -178,13 +293,62 @@ class SessionState:
                        compacted=len(self.conversation_history))
 
 
+def clock_to_minutes(clock: str) -> int:
+    """Convert "HH:MM" to minutes after midnight"""
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def minutes_to_clock(minutes: float) -> str:
+    """Convert minutes after midnight to an "HH:MM" clock time"""
+    minutes = int(round(minutes))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_price(text: str, default: float = 0.0) -> float:
+    """Extract the first dollar amount from a search snippet ("Free" is 0)"""
+    match = re.search(r"\$(\d+(?:\.\d+)?)", text)
+    if match:
+        return float(match.group(1))
+    if "free" in text.lower():
+        return 0.0
+    return default
+
+
 class MockGoogleSearchTool:
     """Mock Google Search tool for demo purposes"""
     
     def search(self, query: str, interests: List[str] = None, num_results: int = 5) -> List[Dict[str, str]]:
         """Simulate search results"""
         logger.info("tool.google_search.called", query=query)
-        
+        results = self._mock_results(query, interests, num_results)
+        return self._add_locations(query, results)
+    
+    @staticmethod
+    def city_center(destination: str) -> tuple:
+        """Real center of a known city; other cities get a stable made-up one"""
+        city = destination.split(",")[0].strip().lower()
+        if city in CITY_CENTERS:
+            return CITY_CENTERS[city]
+        seed = zlib.crc32(city.encode())
+        return (seed % 12000) / 100.0 - 60.0, (seed // 12000 % 36000) / 100.0 - 180.0
+    
+    @classmethod
+    def _add_locations(cls, query: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Attach stable pseudo-coordinates within a few km of the queried city"""
+        center_lat, center_lon = cls.city_center(query.rsplit(" in ", 1)[-1])
+        km_per_degree = np.pi * EARTH_RADIUS_KM / 180.0
+        lat_step = MOCK_SPREAD_KM / km_per_degree / 300
+        lon_step = lat_step / np.cos(np.radians(center_lat))
+        for result in results:
+            offset = zlib.crc32(result["title"].encode())
+            result["lat"] = round(center_lat + (offset % 600 - 300) * lat_step, 6)
+            result["lon"] = round(center_lon + (offset // 600 % 600 - 300) * lon_step, 6)
+        return results
+    
+    @staticmethod
+    def _mock_results(query: str, interests: List[str], num_results: int) -> List[Dict[str, Any]]:
+        """Canned results keyed on the query wording"""
         # Return mock results based on query
         if "restaurant" in query.lower() or "food" in query.lower():
             return [
@@ -234,29 +398,194 @@ class MockCodeExecutionTool:
         return {"result": "calculated"}
 
 
+@dataclass
+class _SharedDays:
+    """Meals and scheduled days reused by every variant of one trip.
+    
+    Variants often pick the same stops on a day, so each distinct
+    (day, stops) schedule is routed and fitted to opening hours only once.
+    """
+    meals: Dict[int, List[Activity]] = field(default_factory=dict)
+    schedules: Dict[tuple, DayPlan] = field(default_factory=dict)
+
+
 class ItineraryPlannerAgent:
     """Agent responsible for creating day-by-day itinerary"""
     
+    # Daily attraction slots, best match first: (hours, category)
+    ACTIVITY_SLOTS = [
+        (2.5, "sightseeing"),
+        (2.0, "culture"),
+    ]
+    EXTRA_SLOT = (1.5, "sightseeing")  # Any stop past the ranked slots
+    DAY_START = "09:00"
+    LUNCH_TIME = "12:00"
+    LUNCH_LATEST_END = "13:30"  # Go to lunch rather than start a stop that runs past this
+    DINNER_TIME = "19:00"
+    LUNCH_HOURS = 1.5
+    DINNER_HOURS = 2.0
+    LUNCH_COST = 30.0
+    DINNER_COST = 45.0
+    LOCAL_RESTAURANT = "a local restaurant"  # Stand-in when no listed restaurant is open
+    MEAL_SLACK_MINUTES = 90  # A meal pushed later than this goes to the stand-in instead
+    DEFAULT_ATTRACTION_COST = 20.0
+    SEARCH_CACHE_SIZE = 64  # Destinations whose search results are kept, least recently used dropped
+    
     def __init__(self, search_tool: MockGoogleSearchTool, 
                  code_tool: MockCodeExecutionTool):
         self.search_tool = search_tool
         self.code_tool = code_tool
         self.name = "ItineraryPlanner"
+        # Search key -> (attractions, restaurants, their opening hours), least recently used first
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
         logger.info("agent.itinerary_planner.initialized")
     
     def plan(self, requirements: TripRequirements, 
-             memory: MemoryBank) -> List[DayPlan]:
-        """Create itinerary based on requirements"""
+             memory: MemoryBank,
+             ledger: Optional[BudgetLedger] = None) -> List[DayPlan]:
+        """Create itinerary based on requirements, recording costs in ledger"""
         logger.info("agent.itinerary_planner.planning_started",
                    destination=requirements.destination)
         
+        trip_dates = requirements.trip_dates()
+        
         # Check memory for similar trips
         similar = memory.get_similar_trips(requirements.destination)
         if similar:
             logger.info("agent.itinerary_planner.found_similar_trips",
                        count=len(similar))
         
-        # Search for attractions
+        # Search once per destination, shared by every day
+        attractions, restaurants = self._search_destination(requirements)
+        pool = self._candidate_pool(requirements, attractions)
+        days = self._plan_days(requirements, trip_dates, pool, restaurants, ledger=ledger)
+        
+        logger.info("agent.itinerary_planner.planning_completed",
+                   num_days=len(days))
+        return days
+    
+    VARIANT_SPEND_FRACTIONS = (0.0, 0.25, 0.5, 0.75, 1.0)
+    VARIANT_INTEREST_WEIGHTS = (0.0, 1.0, 3.0)
+    
+    def plan_variants(self, requirements: TripRequirements) -> List[List[DayPlan]]:
+        """Plan one variant per combination of knobs over a shared candidate pool"""
+        variants = list(self.iter_variants(requirements))
+        logger.info("agent.itinerary_planner.variants_planned",
+                   num_variants=len(variants))
+        return variants
+    
+    def num_variants(self) -> int:
+        """How many variants iter_variants yields"""
+        return (len(self.VARIANT_SPEND_FRACTIONS) * (len(self.ACTIVITY_SLOTS) + 1)
+                * len(self.VARIANT_INTEREST_WEIGHTS))
+    
+    def iter_variants(self, requirements: TripRequirements):
+        """Lazily plan variants, one per combination of knobs.
+        
+        Spend fraction caps the share of each day's allowance offered for
+        attractions, slot count caps attractions per day, and interest weight
+        scales how much matched interests outweigh cost. Variants share one
+        search, candidate pool and set of meals, and a day whose stops another
+        variant already chose reuses that day's route and opening-hours fit.
+        """
+        trip_dates = requirements.trip_dates()
+        attractions, restaurants = self._search_destination(requirements)
+        pool = self._candidate_pool(requirements, attractions)
+        shared = _SharedDays()
+        
+        for spend_fraction in self.VARIANT_SPEND_FRACTIONS:
+            for max_slots in range(len(self.ACTIVITY_SLOTS) + 1):
+                for interest_weight in self.VARIANT_INTEREST_WEIGHTS:
+                    yield self._plan_days(requirements, trip_dates, pool, restaurants,
+                                          spend_fraction=spend_fraction, max_slots=max_slots,
+                                          interest_weight=interest_weight, shared=shared)
+    
+    def _plan_days(self, requirements: TripRequirements, trip_dates: List[date],
+                   pool: List[Activity], restaurants: List[Dict[str, str]],
+                   spend_fraction: float = 1.0, max_slots: Optional[int] = None,
+                   interest_weight: float = 1.0,
+                   ledger: Optional[BudgetLedger] = None,
+                   shared: Optional[_SharedDays] = None) -> List[DayPlan]:
+        """Fill every day from the candidate pool within the budget left over.
+        
+        Each day is repaired against opening hours as it is planned. Callers
+        planning several variants of a trip pass one shared _SharedDays.
+        """
+        if ledger is None:
+            ledger = BudgetLedger()
+        if shared is None:
+            shared = _SharedDays()
+        costs = [a.cost for a in pool]
+        scores = [self._interest_score(a, requirements.interests, interest_weight) for a in pool]
+        if max_slots is None:
+            max_slots = len(self.ACTIVITY_SLOTS)
+        
+        # Whatever lodging and transport leave over is spread across the days
+        remaining = (requirements.budget
+                     - DEFAULT_NIGHTLY_RATE * requirements.num_nights
+                     - DEFAULT_TRANSPORT_COST)
+        walk_index = len(pool) - 1
+        visited = set()
+        start = pool[walk_index].latitude, pool[walk_index].longitude
+        opening_hours = self.opening_hours_for(requirements)
+        
+        days = []
+        for day_index, day_date in enumerate(trip_dates):
+            if day_index not in shared.meals:
+                shared.meals[day_index] = self._build_meals(day_index, restaurants, opening_hours,
+                                                            day_date.weekday(), near=start)
+            meals = shared.meals[day_index]
+            meal_cost = sum(m.cost for m in meals)
+            day_allowance = remaining / (len(trip_dates) - day_index)
+            
+            # Attractions are visited once; revisit only when the pool runs dry
+            if visited.issuperset(range(walk_index)):
+                visited.clear()
+            day_scores = [0.0 if i in visited else score for i, score in enumerate(scores)]
+            chosen = select_activities(
+                costs, day_scores,
+                budget=max(0.0, day_allowance - meal_cost) * spend_fraction,
+                max_items=max_slots
+            )
+            chosen.sort(key=lambda i: -day_scores[i])
+            visited.update(i for i in chosen if i != walk_index)
+            
+            key = (day_index, tuple(chosen))
+            if key not in shared.schedules:
+                activities = self._schedule_day([pool[i] for i in chosen], meals, start)
+                day = DayPlan(
+                    day_number=day_index + 1,
+                    date=day_date.isoformat(),
+                    activities=activities,
+                    total_cost=sum(a.cost for a in activities),
+                    notes=f"Focus on {self._day_focus(requirements, day_index)}"
+                )
+                if len(opening_hours):
+                    day = self._fit_opening_hours(day, opening_hours, day_date.weekday())
+                shared.schedules[key] = day
+            # Budget repair edits a day's activities in place, so each plan gets its own list
+            day = replace(shared.schedules[key], activities=list(shared.schedules[key].activities))
+            for activity in day.activities:
+                ledger.add_activity(day.day_number, activity)
+            day.total_cost = ledger.day_total(day.day_number)
+            remaining -= day.total_cost
+            days.append(day)
+        return days
+    
+    def _search_destination(self, requirements: TripRequirements):
+        """Fetch attractions and restaurants, cached per destination and interests"""
+        return self._cached_search(requirements)[:2]
+    
+    def opening_hours_for(self, requirements: TripRequirements) -> OpeningHoursIndex:
+        """Opening hours seen in this destination's search results (empty if none)"""
+        return self._cached_search(requirements)[2]
+    
+    def _cached_search(self, requirements: TripRequirements) -> tuple:
+        """Search results and their opening hours, searching on a cache miss"""
+        key = self._search_key(requirements)
+        if key in self._search_cache:
+            self._search_cache.move_to_end(key)
+            return self._search_cache[key]
         attractions = self.search_tool.search(
             f"top things to do in {requirements.destination}",
             interests=requirements.interests
@@ -264,114 +593,403 @@ class ItineraryPlannerAgent:
         restaurants = self.search_tool.search(
             f"best restaurants in {requirements.destination}"
         )
+        entry = (attractions, restaurants, self._index_opening_hours(attractions + restaurants))
+        self._search_cache[key] = entry
+        if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return entry
+    
+    @staticmethod
+    def _search_key(requirements: TripRequirements) -> tuple:
+        """Cache key for destination search results"""
+        return requirements.destination.lower(), tuple(requirements.interests)
+    
+    @staticmethod
+    def _index_opening_hours(results: List[Dict[str, Any]]) -> OpeningHoursIndex:
+        """Index the opening hours reported by the search tool, if any"""
+        index = OpeningHoursIndex()
+        for result in results:
+            if result.get("opening_hours"):
+                index.add(result["title"], result["opening_hours"])
+        return index
+    
+    def _candidate_pool(self, requirements: TripRequirements,
+                        attractions: List[Dict[str, str]]) -> List[Activity]:
+        """Turn attraction search results into priced candidates.
         
-        # Create 3-day plan
-        days = []
-        for day_num in range(1, 4):
-            activities = [
-                Activity(
-                    name=f"Morning: {attractions[0]['title']}",
-                    time="09:00",
-                    duration_hours=2.5,
-                    cost=25.0,
-                    category="sightseeing",
-                    description="Start the day with popular attraction"
-                ),
-                Activity(
-                    name=f"Lunch at {restaurants[0]['title']}",
-                    time="12:00",
-                    duration_hours=1.5,
-                    cost=30.0,
-                    category="meal",
-                    description="Experience local cuisine"
-                ),
-                Activity(
-                    name=f"Afternoon: {attractions[1]['title']}",
-                    time="14:00",
-                    duration_hours=2.0,
-                    cost=20.0,
-                    category="culture",
-                    description="Cultural exploration"
-                ),
-                Activity(
-                    name=f"Dinner at {restaurants[1]['title']}",
-                    time="19:00",
-                    duration_hours=2.0,
-                    cost=45.0,
-                    category="meal",
-                    description="Dinner with local flavors"
-                )
-            ]
-            
-            day_cost = sum(a.cost for a in activities)
-            days.append(DayPlan(
-                day_number=day_num,
-                date=f"Day {day_num}",
-                activities=activities,
-                total_cost=day_cost,
-                notes=f"Focus on {requirements.interests[0] if requirements.interests else 'exploration'}"
-            ))
+        The last entry is a free neighborhood walk that can fill any day.
+        """
+        pool = [
+            Activity(
+                name=result["title"],
+                time="",
+                duration_hours=0.0,
+                cost=result.get("price", parse_price(result.get("snippet", ""),
+                                                     self.DEFAULT_ATTRACTION_COST)),
+                category="sightseeing",
+                description=result.get("snippet", ""),
+                latitude=result.get("lat"),
+                longitude=result.get("lon"),
+                place=result["title"]
+            )
+            for result in attractions
+        ]
+        # The walk starts from the centroid of the attractions, our city-center proxy
+        located = [a for a in pool if a.latitude is not None and a.longitude is not None]
+        pool.append(Activity(
+            name=f"Neighborhood walk in {requirements.destination}",
+            time="",
+            duration_hours=0.0,
+            cost=0.0,
+            category="sightseeing",
+            description="Free self-guided exploration",
+            latitude=sum(a.latitude for a in located) / len(located) if located else None,
+            longitude=sum(a.longitude for a in located) / len(located) if located else None
+        ))
+        return pool
+    
+    @staticmethod
+    def _interest_score(candidate: Activity, interests: List[str],
+                        weight: float = 1.0) -> float:
+        """Base score plus weighted points per matched interest"""
+        return 1.0 + weight * compile_interests(interests).count(activity_text(candidate))
+    
+    def _schedule_day(self, attractions: List[Activity], meals: List[Activity],
+                      start: tuple) -> List[Activity]:
+        """Order the day's stops along a short route and assign clock times.
         
-        logger.info("agent.itinerary_planner.planning_completed",
-                   num_days=len(days))
-        return days
+        Attractions take the slot durations by rank and are visited in
+        route-optimized order. Lunch and dinner keep their clock times, so
+        they act as fixed waypoints: lunch is slotted in when the morning
+        runs out, and the stops still ahead are re-routed from the
+        restaurant. Travel time is added between consecutive stops.
+        """
+        slots = self.ACTIVITY_SLOTS + [self.EXTRA_SLOT] * max(0, len(attractions) - len(self.ACTIVITY_SLOTS))
+        stops = [
+            replace(attraction, duration_hours=hours, category=category)
+            for attraction, (hours, category) in zip(attractions, slots)
+        ]
+        lunch, dinner = meals
+        
+        # Matrix rows: 0 = start, then each attraction, then lunch and dinner
+        points = [start] + [(a.latitude, a.longitude) for a in stops + meals]
+        dist = None
+        route = list(range(1, len(stops) + 1))
+        if all(lat is not None and lon is not None for lat, lon in points):
+            dist = haversine_matrix([p[0] for p in points], [p[1] for p in points])
+            route = list(optimize_route(dist[:len(stops) + 1, :len(stops) + 1])[1:])
+        lunch_point, dinner_point = len(stops) + 1, len(stops) + 2
+        
+        scheduled = []
+        position = 0
+        cursor = clock_to_minutes(self.DAY_START)
+        lunch_time = clock_to_minutes(self.LUNCH_TIME)
+        lunch_latest_end = clock_to_minutes(self.LUNCH_LATEST_END)
+        had_lunch = False
+        while route:
+            stop = stops[route[0] - 1]
+            if not had_lunch and cursor + stop.duration_hours * 60 > lunch_latest_end:
+                cursor = self._visit(scheduled, lunch, dist, position, lunch_point,
+                                     cursor, lunch_time)
+                position, had_lunch = lunch_point, True
+                if dist is not None and len(route) > 1:
+                    # The afternoon starts at the restaurant, not where the morning ended
+                    points = [lunch_point] + route
+                    order = optimize_route(dist[np.ix_(points, points)])[1:]
+                    route = [points[i] for i in order]
+                    stop = stops[route[0] - 1]
+            point = route.pop(0)
+            label = "Afternoon" if had_lunch else "Morning"
+            cursor = self._visit(scheduled, stop, dist, position, point,
+                                 cursor, cursor, label)
+            position = point
+        if not had_lunch:
+            cursor = self._visit(scheduled, lunch, dist, position, lunch_point,
+                                 cursor, lunch_time)
+            position = lunch_point
+        self._visit(scheduled, dinner, dist, position, dinner_point,
+                    cursor, clock_to_minutes(self.DINNER_TIME))
+        return scheduled
+    
+    @staticmethod
+    def _visit(scheduled: List[Activity], activity: Activity, dist: Any,
+               origin: int, point: int, cursor: float, earliest: float,
+               label: str = "") -> float:
+        """Append a timed visit after travelling from origin; return when it ends"""
+        travel = travel_minutes(dist[origin, point]) if dist is not None else 0.0
+        begin = max(cursor + travel, earliest)
+        scheduled.append(replace(
+            activity,
+            name=f"{label}: {activity.name}" if label else activity.name,
+            time=minutes_to_clock(begin),
+            travel_minutes=round(travel, 1)
+        ))
+        return begin + activity.duration_hours * 60
+    
+    def _fit_opening_hours(self, day: DayPlan, opening_hours: OpeningHoursIndex,
+                           weekday: int) -> DayPlan:
+        """Repair a day against opening hours, keeping its meals.
+        
+        A meal whose restaurant is closed when the route reaches it, or that
+        the repair would drop or push back by more than MEAL_SLACK_MINUTES,
+        moves to a local restaurant nearby at the same price. Attractions that
+        cannot fit are shifted or dropped.
+        """
+        violations = check_day_plan(day, opening_hours, weekday)
+        if not violations:
+            return day
+        activities = list(day.activities)
+        moved = {v.activity_index for v in violations
+                 if v.kind == "closed" and activities[v.activity_index].category == "meal"}
+        while True:
+            for i in moved:
+                activities[i] = self._at_local_restaurant(activities[i])
+            repaired = repair_day_plan(replace(day, activities=activities), opening_hours, weekday)
+            starts = {a.name: a.start_minutes for a in repaired.activities}
+            moved = {i for i, a in enumerate(activities)
+                     if a.category == "meal" and a.place != self.LOCAL_RESTAURANT
+                     and starts.get(a.name, MINUTES_PER_DAY) - a.start_minutes > self.MEAL_SLACK_MINUTES}
+            if not moved:
+                return repaired
+    
+    def _at_local_restaurant(self, meal: Activity) -> Activity:
+        """The meal moved from its listed restaurant to the local stand-in"""
+        if meal.place == self.LOCAL_RESTAURANT or not meal.name.endswith(meal.place):
+            return replace(meal, place=self.LOCAL_RESTAURANT)
+        return replace(meal, name=meal.name[:-len(meal.place)] + self.LOCAL_RESTAURANT,
+                       place=self.LOCAL_RESTAURANT)
+    
+    def _open_restaurants(self, restaurants: List[Dict[str, Any]],
+                          opening_hours: Optional[OpeningHoursIndex], weekday: int,
+                          clock: str, hours: float) -> List[Dict[str, Any]]:
+        """Restaurants open for a whole meal starting at clock on weekday"""
+        if opening_hours is None or not len(opening_hours) or not restaurants:
+            return restaurants
+        start = clock_to_minutes(clock)
+        place_ids = [opening_hours.place_id(r["title"]) for r in restaurants]
+        open_now = opening_hours.is_open(place_ids, weekday, start, start + int(hours * 60))
+        return [r for r, is_open in zip(restaurants, open_now) if is_open]
+    
+    def _build_meals(self, day_index: int, restaurants: List[Dict[str, Any]],
+                     opening_hours: Optional[OpeningHoursIndex] = None, weekday: int = 0,
+                     near: tuple = (None, None)) -> List[Activity]:
+        """Lunch and dinner, rotating through the restaurants open at meal time.
+        
+        When no listed restaurant is open (or an unknown city has none) the
+        meal is at an unnamed local restaurant near the day's start, at the
+        default price.
+        """
+        local = {"title": self.LOCAL_RESTAURANT, "lat": near[0], "lon": near[1]}
+        lunches = self._open_restaurants(restaurants, opening_hours, weekday,
+                                         self.LUNCH_TIME, self.LUNCH_HOURS) or [local]
+        dinners = self._open_restaurants(restaurants, opening_hours, weekday,
+                                         self.DINNER_TIME, self.DINNER_HOURS) or [local]
+        lunch = lunches[day_index % len(lunches)]
+        dinner = dinners[(day_index + 1) % len(dinners)]
+        if dinner is lunch and len(dinners) > 1:
+            dinner = dinners[(day_index + 2) % len(dinners)]
+        return [
+            Activity(
+                name=f"Lunch at {lunch['title']}",
+                time=self.LUNCH_TIME,
+                duration_hours=self.LUNCH_HOURS,
+                cost=lunch.get("price", self.LUNCH_COST),
+                category="meal",
+                description="Experience local cuisine",
+                latitude=lunch.get("lat"),
+                longitude=lunch.get("lon"),
+                place=lunch["title"]
+            ),
+            Activity(
+                name=f"Dinner at {dinner['title']}",
+                time=self.DINNER_TIME,
+                duration_hours=self.DINNER_HOURS,
+                cost=dinner.get("price", self.DINNER_COST),
+                category="meal",
+                description="Dinner with local flavors",
+                latitude=dinner.get("lat"),
+                longitude=dinner.get("lon"),
+                place=dinner["title"]
+            )
+        ]
+    
+    @staticmethod
+    def _day_focus(requirements: TripRequirements, day_index: int) -> str:
+        """Interest highlighted on a given day"""
+        if not requirements.interests:
+            return "exploration"
+        return requirements.interests[day_index % len(requirements.interests)]
 
 
 class BudgetAnalyzerAgent:
     """Agent responsible for budget analysis and optimization"""
     
+    BUDGET_MEAL_COST = MEAL_ALTERNATIVES[0].cost  # Priciest meal substitute
+    
     def __init__(self, code_tool: MockCodeExecutionTool):
         self.code_tool = code_tool
         self.name = "BudgetAnalyzer"
+        self._savings_tables: Dict[str, SubstitutionTable] = {}
         logger.info("agent.budget_analyzer.initialized")
     
     def analyze(self, requirements: TripRequirements,
-                days: List[DayPlan]) -> BudgetBreakdown:
-        """Analyze budget and suggest optimizations"""
+                days: List[DayPlan],
+                ledger: Optional[BudgetLedger] = None,
+                bookings: Optional[List[BookingOption]] = None) -> BudgetBreakdown:
+        """Analyze budget and suggest optimizations.
+        
+        Day spend comes from the ledger the planner filled; without one the
+        ledger is built from the days in a single pass. Over-budget plans get
+        the top ranked swaps, including cheaper hotels when bookings are given.
+        """
         logger.info("agent.budget_analyzer.analysis_started",
                    budget=requirements.budget)
         
         # Calculate costs using code execution tool
         budget_calc = self.code_tool.execute("calculate_budget()")
         
-        # Calculate from itinerary
-        activities_cost = sum(day.total_cost for day in days)
-        accommodation_cost = 120.0 * 3  # 3 nights
-        transport_cost = 100.0
-        
-        total = accommodation_cost + activities_cost + transport_cost
-        within_budget = total <= requirements.budget
+        if ledger is None:
+            ledger = BudgetLedger.from_days(days)
+        nights = requirements.num_nights
+        accommodation_cost = DEFAULT_NIGHTLY_RATE * nights
+        ledger.set_fixed("accommodation", accommodation_cost)
+        ledger.set_fixed("transportation", DEFAULT_TRANSPORT_COST)
         
         suggestions = []
-        if not within_budget:
-            overage = total - requirements.budget
-            suggestions.append(f"Consider budget accommodation to save ${accommodation_cost - 75*3:.2f}")
-            suggestions.append(f"Reduce dining expenses by ${overage * 0.3:.2f}")
-        
-        breakdown = BudgetBreakdown(
-            accommodation=accommodation_cost,
-            activities=sum(a.cost for day in days for a in day.activities if a.category != 'meal'),
-            meals=sum(a.cost for day in days for a in day.activities if a.category == 'meal'),
-            transportation=transport_cost,
-            total=total,
-            within_budget=within_budget,
-            savings_suggestions=suggestions
-        )
+        if ledger.total > requirements.budget:
+            suggestions = self.suggest_savings(requirements, days, ledger, bookings or [])
+        
+        breakdown = BudgetBreakdown.from_ledger(ledger, requirements.budget, suggestions)
         
         logger.info("agent.budget_analyzer.analysis_completed",
-                   total=total,
-                   within_budget=within_budget)
+                   total=breakdown.total,
+                   within_budget=breakdown.within_budget)
         return breakdown
+    
+    def repair(self, requirements: TripRequirements, days: List[DayPlan],
+               breakdown: BudgetBreakdown,
+               bookings: List[BookingOption],
+               ledger: Optional[BudgetLedger] = None) -> BudgetBreakdown:
+        """Apply substitutions until the plan fits the budget or none are left.
+        
+        Substitutions come from the savings table, most money saved per unit
+        of preference lost first, each re-priced incrementally in the ledger.
+        Days are updated in place, and the savings suggestions are rebuilt
+        from the repaired plan so none repeats a swap already made. If the
+        budget is still exceeded once every substitution has been applied,
+        no cheaper plan exists and the remaining gap is reported.
+        """
+        logger.info("agent.budget_analyzer.repair_started",
+                   total=breakdown.total, budget=requirements.budget)
+        
+        if ledger is None:
+            ledger = BudgetLedger.from_days(days)
+            ledger.set_fixed("accommodation", breakdown.accommodation)
+            ledger.set_fixed("transportation", breakdown.transportation)
+        
+        currency = breakdown.currency
+        nights = requirements.num_nights
+        hotels = [b for b in bookings if b.type in LODGING_TYPES]
+        steps = self._savings_table(currency).ranked(days, nights, ledger.fixed("accommodation"),
+                                                     hotels, requirements.interests)
+        for step in steps:
+            if ledger.total <= requirements.budget:
+                break
+            self._apply(step, days, ledger, nights)
+            description = step.description
+            if step.day_number is None:
+                description += f" at {format_amount(step.cost, currency)}/night"
+            breakdown.repairs.append(f"{description} (saves {format_amount(step.saving, currency)})")
+            breakdown.repair_steps += 1
+        
+        breakdown.refresh(ledger, requirements.budget)
+        breakdown.savings_suggestions = []
+        if not breakdown.within_budget:
+            breakdown.savings_suggestions = self.suggest_savings(requirements, days, ledger,
+                                                                 hotels, currency)
+            breakdown.savings_suggestions.append(
+                f"Budget is {format_amount(breakdown.total - requirements.budget, currency)} short of "
+                f"the cheapest possible plan ({format_amount(breakdown.total, currency)})"
+            )
+        
+        logger.info("agent.budget_analyzer.repair_completed",
+                   steps=breakdown.repair_steps,
+                   total=breakdown.total,
+                   within_budget=breakdown.within_budget)
+        return breakdown
+    
+    def suggest_savings(self, requirements: TripRequirements, days: List[DayPlan],
+                        ledger: BudgetLedger, bookings: List[BookingOption] = (),
+                        currency: str = BASE_CURRENCY,
+                        limit: int = DEFAULT_SUGGESTIONS) -> List[str]:
+        """Top concrete swaps for an over-budget plan, described with their saving"""
+        hotels = [b for b in bookings if b.type in LODGING_TYPES]
+        nights = requirements.num_nights
+        steps = self._savings_table(currency).top(days, nights, ledger.fixed("accommodation"),
+                                                  hotels, requirements.interests, limit)
+        suggestions = []
+        for step in steps:
+            price = f" at {format_amount(step.cost, currency)}/night" if step.day_number is None else ""
+            suggestions.append(f"{step.description}{price} to save {format_amount(step.saving, currency)}")
+        return suggestions
+    
+    def simulate(self, requirements: TripRequirements, days: List[DayPlan],
+                 breakdown: BudgetBreakdown,
+                 num_samples: int = DEFAULT_NUM_SAMPLES) -> BudgetBreakdown:
+        """Attach the chance of staying within budget once prices vary"""
+        breakdown.risk = simulate_itinerary(days, breakdown, requirements.budget, num_samples)
+        logger.info("agent.budget_analyzer.simulation_completed",
+                   num_samples=num_samples,
+                   probability_within_budget=breakdown.risk.probability_within_budget,
+                   p90_total=breakdown.risk.p90_total)
+        return breakdown
+    
+    def _savings_table(self, currency: str) -> SubstitutionTable:
+        """Substitution table priced in currency, built once per currency"""
+        if currency not in self._savings_tables:
+            scale = 1.0 if currency == BASE_CURRENCY else load_fx_table().rate(BASE_CURRENCY, currency)
+            self._savings_tables[currency] = SubstitutionTable(cost_scale=scale)
+        return self._savings_tables[currency]
+    
+    @staticmethod
+    def _apply(step: Substitution, days: List[DayPlan], ledger: BudgetLedger, nights: int):
+        """Make one substitution, re-pricing through the ledger"""
+        if step.day_number is None:
+            ledger.set_fixed("accommodation", step.cost * nights)
+            return
+        day = next(d for d in days if d.day_number == step.day_number)
+        original = day.activities[step.activity_index]
+        changes = {"name": step.name, "cost": step.cost}
+        if original.category != "meal":
+            changes["description"] = f"Free alternative to {original.name}"
+        day.activities[step.activity_index] = replace(original, **changes)
+        ledger.replace_activity(day.day_number, original, day.activities[step.activity_index])
+        day.total_cost = ledger.day_total(day.day_number)
 
 
 class BookingHelperAgent:
     """Agent responsible for finding booking options"""
     
-    def __init__(self, search_tool: MockGoogleSearchTool):
+    NUM_STAY_OPTIONS = 3
+    ACCOMMODATION_SHARE = 0.5  # Share of the budget the stay may take
+    PREFERRED_AMENITIES = ("wifi", "breakfast", "central_location")
+    PROPERTY_KINDS = {"hotel": ("hotel",), "hostel": ("hostel",),
+                      "apartment": ("apartment",), "rental": ("apartment",)}
+    
+    def __init__(self, search_tool: MockGoogleSearchTool,
+                 inventory: Optional[HotelInventory] = None,
+                 providers: Optional[BookingFanOut] = None):
         self.search_tool = search_tool
+        self.inventory = inventory
+        self.providers = providers
         self.name = "BookingHelper"
         logger.info("agent.booking_helper.initialized")
     
+    def close(self):
+        """Release the booking providers' threads, if there are providers"""
+        if self.providers is not None:
+            self.providers.close()
+    
     def find_options(self, requirements: TripRequirements) -> List[BookingOption]:
         """Find accommodation and transport options"""
         logger.info("agent.booking_helper.search_started",
@@ -382,6 +1000,18 @@ class BookingHelperAgent:
             f"hotels in {requirements.destination}"
         )
         
+        options = []
+        if self.inventory is not None and self.inventory.city_key(requirements.destination):
+            options += self._inventory_options(requirements)
+        if self.providers is not None:
+            options += self._provider_options(requirements)
+        if options:
+            if not any(o.type == "flight" for o in options):
+                options.append(self._flight_option())
+            logger.info("agent.booking_helper.search_completed",
+                       num_options=len(options), source="live")
+            return options
+        
         options = [
             BookingOption(
                 name="Downtown Hotel",
@@ -399,71 +1029,150 @@ class BookingHelperAgent:
                 url="https://example.com/booking",
                 features=["Free parking", "Airport shuttle"]
             ),
-            BookingOption(
-                name="Return Flight",
-                type="flight",
-                price=450.0,
-                rating=4.2,
-                url="https://example.com/flights",
-                features=["Direct flight", "2 checked bags"]
-            )
+            self._flight_option()
         ]
         
         logger.info("agent.booking_helper.search_completed",
                    num_options=len(options))
         return options
+    
+    def _provider_options(self, requirements: TripRequirements) -> List[BookingOption]:
+        """Options from every booking provider, gathered concurrently and priced in base currency"""
+        result = self.providers.search(requirements)
+        if not result.options:
+            return []
+        prices = load_fx_table().convert([o["price"] for o in result.options],
+                                         [o.get("currency", BASE_CURRENCY) for o in result.options],
+                                         BASE_CURRENCY)
+        return [BookingOption(
+            name=o["name"],
+            type=o["type"],
+            price=float(price),
+            rating=o["rating"],
+            url=o.get("url", ""),
+            features=list(o.get("features", [])),
+            currency=BASE_CURRENCY,
+            provider=o.get("provider", "")
+        ) for o, price in zip(result.options, prices)]
+    
+    def _inventory_options(self, requirements: TripRequirements) -> List[BookingOption]:
+        """Best stays within the budget's share for lodging, plus the cheapest as a fallback"""
+        kinds = self.PROPERTY_KINDS.get(requirements.accommodation_preference)
+        nightly_cap = requirements.budget * self.ACCOMMODATION_SHARE / max(requirements.num_nights, 1)
+        # Only properties free every night of the stay
+        stay = {"check_in": requirements.start_date, "check_out": requirements.end_date}
+        rows = self.inventory.search(requirements.destination, k=self.NUM_STAY_OPTIONS,
+                                     max_price=nightly_cap, kinds=kinds,
+                                     preferred_amenities=self.PREFERRED_AMENITIES, **stay)
+        if len(rows) == 0:
+            rows = self.inventory.search(requirements.destination, k=self.NUM_STAY_OPTIONS,
+                                         kinds=kinds, preferred_amenities=self.PREFERRED_AMENITIES,
+                                         **stay)
+        cheapest = self.inventory.search(requirements.destination, k=1, kinds=kinds,
+                                         weights=HotelWeights(price=1.0, rating=0.0, preference=0.0),
+                                         **stay)
+        rows = list(rows) + [row for row in cheapest if row not in rows]
+        
+        options = []
+        for row in rows:
+            prop = self.inventory.properties[row]
+            options.append(BookingOption(
+                name=prop.name,
+                type="rental" if prop.kind == "apartment" else "hotel",
+                price=prop.nightly_rate,
+                rating=prop.rating,
+                url=prop.url,
+                features=[AMENITY_LABELS[a] for a in prop.amenities]
+            ))
+        return options
+    
+    @staticmethod
+    def _flight_option() -> BookingOption:
+        return BookingOption(
+            name="Return Flight",
+            type="flight",
+            price=450.0,
+            rating=4.2,
+            url="https://example.com/flights",
+            features=["Direct flight", "2 checked bags"]
+        )
 
 
 class CoordinatorAgent:
     """Main coordinator that orchestrates all specialist agents"""
     
-    def __init__(self):
+    def __init__(self, search_tool: Optional[Any] = None,
+                 hotel_inventory: Optional[HotelInventory] = None,
+                 booking_providers: Optional[BookingFanOut] = None):
         self.session = SessionState()
         self.memory = MemoryBank()
         
-        # Initialize tools
-        search_tool = MockGoogleSearchTool()
+        # Initialize tools; any object with the MockGoogleSearchTool.search
+        # signature can stand in, e.g. poi_catalog.POISearchTool
+        search_tool = search_tool or MockGoogleSearchTool()
         code_tool = MockCodeExecutionTool()
         
         # Initialize specialist agents
         self.itinerary_agent = ItineraryPlannerAgent(search_tool, code_tool)
         self.budget_agent = BudgetAnalyzerAgent(code_tool)
-        self.booking_agent = BookingHelperAgent(search_tool)
+        self.booking_agent = BookingHelperAgent(search_tool, hotel_inventory, booking_providers)
         
         logger.info("agent.coordinator.initialized")
     
+    def close(self):
+        """Release resources held by the agents, such as booking provider threads"""
+        self.booking_agent.close()
+    
+    def __enter__(self) -> "CoordinatorAgent":
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
     def process_request(self, requirements: TripRequirements,
-                       max_iterations: int = 3) -> TripItinerary:
-        """Process trip planning request with iterative refinement"""
+                       max_iterations: int = 3,
+                       simulate_costs: bool = False) -> TripItinerary:
+        """Plan a trip, then repair it to fit the budget.
+        
+        The plan is built once; budget repair converges without re-planning.
+        What can fail is the booking search, since providers may time out, so
+        it is retried, up to max_iterations searches in all, until some
+        lodging comes back. With simulate_costs the budget also reports how
+        likely the trip is to stay within budget when prices vary.
+        """
         logger.info("agent.coordinator.request_started",
                    destination=requirements.destination,
                    budget=requirements.budget)
         
         self.session.update_requirements(requirements)
         self.session.add_message("user", f"Plan trip to {requirements.destination}")
+        requested, requirements = requirements, self._in_base_currency(requirements)
+        
+        # Planner and analyzer share one ledger
+        ledger = BudgetLedger()
+        days = self.itinerary_agent.plan(requirements, self.memory, ledger=ledger)
+        self.session.store_intermediate("itinerary", days)
         
         for iteration in range(1, max_iterations + 1):
             self.session.iteration = iteration
             logger.info("agent.coordinator.iteration_started", iteration=iteration)
-            
-            # Run agents in parallel (simulated)
-            days = self.itinerary_agent.plan(requirements, self.memory)
-            self.session.store_intermediate("itinerary", days)
-            
-            budget = self.budget_agent.analyze(requirements, days)
-            self.session.store_intermediate("budget", budget)
-            
             bookings = self.booking_agent.find_options(requirements)
             self.session.store_intermediate("bookings", bookings)
-            
-            # Check if requirements are met
-            if budget.within_budget and len(days) == 3:
-                logger.info("agent.coordinator.requirements_met", iteration=iteration)
+            if any(b.type in LODGING_TYPES for b in bookings):
                 break
-            
-            # Context compaction if needed
+            logger.info("agent.coordinator.no_lodging_found", iteration=iteration)
             self.session.compact_context()
         
+        # Repair applies every substitution it needs, so one pass either fits or proves it cannot
+        budget = self.budget_agent.analyze(requirements, days, ledger, bookings)
+        if not budget.within_budget:
+            budget = self.budget_agent.repair(requirements, days, budget, bookings, ledger)
+        self.session.store_intermediate("budget", budget)
+        logger.info("agent.coordinator.requirements_met" if budget.within_budget
+                    else "agent.coordinator.budget_infeasible",
+                    iterations=self.session.iteration,
+                    total_cost=budget.total)
+        
         # Create final itinerary
         itinerary = TripItinerary(
             requirements=requirements,
@@ -471,8 +1180,12 @@ class CoordinatorAgent:
             budget=budget,
             bookings=bookings,
             created_at=datetime.now().isoformat(),
-            iteration_count=self.session.iteration
+            iteration_count=self.session.iteration,
+            ledger=ledger
         )
+        itinerary = self._localize([itinerary], requested)[0]
+        if simulate_costs:
+            self.budget_agent.simulate(itinerary.requirements, itinerary.days, itinerary.budget)
         
         # Store in memory
         self.memory.add_trip(itinerary)
@@ -482,6 +1195,210 @@ class CoordinatorAgent:
                    total_cost=budget.total)
         
         return itinerary
+    
+    def process_request_anytime(self, requirements: TripRequirements,
+                                time_budget_s: float = 2.0) -> TripItinerary:
+        """Plan within a wall-clock budget, returning the best itinerary found.
+        
+        Bookings are searched in the background while a base plan is built and
+        repaired; remaining time goes to scoring plan variants, keeping the
+        best one that fits the budget. Whatever is unfinished when the
+        deadline hits is listed in partial_sections, and search_completion
+        records the share of variants scored.
+        """
+        deadline = time.perf_counter() + time_budget_s
+        logger.info("agent.coordinator.anytime_started",
+                   destination=requirements.destination,
+                   time_budget_s=time_budget_s)
+        
+        self.session.update_requirements(requirements)
+        self.session.add_message("user", f"Plan trip to {requirements.destination}")
+        self.session.iteration = 1
+        requested, requirements = requirements, self._in_base_currency(requirements)
+        
+        def remaining() -> float:
+            return max(0.0, deadline - time.perf_counter())
+        
+        executor = ThreadPoolExecutor(max_workers=2)
+        ledger = BudgetLedger()
+        try:
+            bookings_future = executor.submit(self.booking_agent.find_options, requirements)
+            plan_future = executor.submit(self.itinerary_agent.plan, requirements,
+                                          self.memory, ledger)
+            try:
+                days = plan_future.result(timeout=remaining())
+            except FutureTimeoutError:
+                days = None
+            
+            # Repair can only pick from bookings that have already arrived
+            bookings = bookings_future.result() if bookings_future.done() else []
+            fixed_cost = DEFAULT_NIGHTLY_RATE * requirements.num_nights + DEFAULT_TRANSPORT_COST
+            
+            if days is None:
+                itinerary = TripItinerary(
+                    requirements=requirements,
+                    days=[],
+                    budget=BudgetBreakdown(0.0, 0.0, 0.0, 0.0, 0.0, False),
+                    bookings=bookings,
+                    created_at=datetime.now().isoformat(),
+                    partial_sections=["itinerary", "budget"]
+                    + ([] if bookings_future.done() else ["bookings"]),
+                    search_completion=0.0
+                )
+                logger.info("agent.coordinator.anytime_completed",
+                           partial_sections=itinerary.partial_sections)
+                return self._localize([itinerary], requested)[0]
+            
+            budget = self.budget_agent.analyze(requirements, days, ledger, bookings)
+            if not budget.within_budget:
+                budget = self.budget_agent.repair(requirements, days, budget, bookings, ledger)
+            best_days, best_budget, best_ledger = days, budget, ledger
+            best_score = score_candidates(
+                CandidateBatch.from_day_plans([days], requirements.interests, fixed_cost),
+                requirements.budget
+            ).combined[0]
+            
+            # Refine with variants for as long as the deadline allows
+            scored = 0
+            total_variants = self.itinerary_agent.num_variants()
+            for variant in self.itinerary_agent.iter_variants(requirements):
+                if remaining() <= 0:
+                    break
+                scored += 1
+                score = score_candidates(
+                    CandidateBatch.from_day_plans([variant], requirements.interests, fixed_cost),
+                    requirements.budget
+                ).combined[0]
+                if score <= best_score:
+                    continue
+                variant_ledger = BudgetLedger.from_days(variant)
+                variant_budget = self.budget_agent.analyze(requirements, variant, variant_ledger)
+                if variant_budget.within_budget:
+                    best_days, best_budget, best_score = variant, variant_budget, score
+                    best_ledger = variant_ledger
+            
+            try:
+                bookings = bookings_future.result(timeout=remaining())
+                partial_sections = []
+            except FutureTimeoutError:
+                partial_sections = ["bookings"]
+        finally:
+            # Never block on stragglers; they finish in the background
+            executor.shutdown(wait=False)
+        
+        itinerary = TripItinerary(
+            requirements=requirements,
+            days=best_days,
+            budget=best_budget,
+            bookings=bookings,
+            created_at=datetime.now().isoformat(),
+            iteration_count=self.session.iteration,
+            partial_sections=partial_sections,
+            search_completion=scored / total_variants,
+            ledger=best_ledger
+        )
+        itinerary = self._localize([itinerary], requested)[0]
+        self.memory.add_trip(itinerary)
+        
+        logger.info("agent.coordinator.anytime_completed",
+                   variants_scored=scored,
+                   partial_sections=partial_sections,
+                   total_cost=best_budget.total)
+        return itinerary
+    
+    def process_request_alternatives(self, requirements: TripRequirements,
+                                     max_alternatives: int = 3) -> List[TripItinerary]:
+        """Plan Pareto-optimal alternatives trading off cost, interests and pace.
+        
+        Variants are planned from one shared candidate pool and scored in a
+        single batch; the cheapest, best matching and most relaxed points of
+        the Pareto front come first, then the rest of the front by score.
+        A plan that is several of these is listed once with every label.
+        Bookings are searched once for all of them.
+        """
+        logger.info("agent.coordinator.alternatives_started",
+                   destination=requirements.destination,
+                   budget=requirements.budget)
+        
+        self.session.update_requirements(requirements)
+        self.session.add_message("user", f"Plan alternatives for {requirements.destination}")
+        self.session.iteration = 1
+        requested, requirements = requirements, self._in_base_currency(requirements)
+        
+        variants = self.itinerary_agent.plan_variants(requirements)
+        bookings = self.booking_agent.find_options(requirements)
+        fixed_cost = DEFAULT_NIGHTLY_RATE * requirements.num_nights + DEFAULT_TRANSPORT_COST
+        
+        batch = CandidateBatch.from_day_plans(variants, requirements.interests, fixed_cost)
+        scores = score_candidates(batch, requirements.budget)
+        interest_matches = batch.interest_hits.sum(axis=1)
+        daily_hours = batch.day_hours.sum(axis=1) / np.maximum(batch.day_mask.sum(axis=1), 1)
+        
+        # Every objective minimized: cost, negated interest matches, hours per day
+        objectives = np.column_stack([scores.total_cost, -interest_matches, daily_hours])
+        front = pareto_front(objectives)
+        
+        picks = [
+            ("cheapest", min(front, key=lambda i: (scores.total_cost[i], -interest_matches[i]))),
+            ("best match", max(front, key=lambda i: (interest_matches[i], -scores.total_cost[i]))),
+            ("most relaxed", min(front, key=lambda i: (daily_hours[i], scores.total_cost[i]))),
+        ]
+        picks += [("balanced", i) for i in sorted(front, key=lambda i: -scores.combined[i])]
+        
+        alternatives = []
+        chosen: Dict[int, TripItinerary] = {}
+        for label, index in picks:
+            if index in chosen:
+                # One plan can be both, say, the cheapest and the most relaxed
+                if label != "balanced":
+                    chosen[index].label += f", {label}"
+                continue
+            if len(alternatives) >= max_alternatives:
+                break
+            days = variants[index]
+            ledger = BudgetLedger.from_days(days)
+            budget = self.budget_agent.analyze(requirements, days, ledger, bookings)
+            if not budget.within_budget:
+                budget = self.budget_agent.repair(requirements, days, budget, bookings, ledger)
+            alternatives.append(TripItinerary(
+                requirements=requirements,
+                days=days,
+                budget=budget,
+                bookings=bookings,
+                created_at=datetime.now().isoformat(),
+                iteration_count=self.session.iteration,
+                label=label,
+                ledger=ledger
+            ))
+            chosen[index] = alternatives[-1]
+        
+        alternatives = self._localize(alternatives, requested)
+        self.session.store_intermediate("alternatives", alternatives)
+        logger.info("agent.coordinator.alternatives_completed",
+                   num_variants=len(variants),
+                   front_size=len(front),
+                   num_alternatives=len(alternatives))
+        return alternatives
+    
+    @staticmethod
+    def _in_base_currency(requirements: TripRequirements) -> TripRequirements:
+        """Requirements with the budget in the base currency the agents price in"""
+        if requirements.currency == BASE_CURRENCY:
+            return requirements
+        budget = load_fx_table().convert(requirements.budget, requirements.currency,
+                                         BASE_CURRENCY)
+        return replace(requirements, budget=float(budget), currency=BASE_CURRENCY)
+    
+    @staticmethod
+    def _localize(itineraries: List[TripItinerary],
+                  requested: TripRequirements) -> List[TripItinerary]:
+        """Present itineraries in the currency the budget was given in"""
+        if requested.currency == BASE_CURRENCY:
+            return itineraries
+        localized = convert_itineraries(itineraries, requested.currency, load_fx_table())
+        for itinerary in localized:
+            itinerary.requirements = requested
+        return localized
 
 
 def format_itinerary(itinerary: TripItinerary) -> str:
@@ -489,31 +1406,47 @@ def format_itinerary(itinerary: TripItinerary) -> str:
     lines = []
     lines.append("=" * 60)
     lines.append(f"TRIP TO {itinerary.requirements.destination.upper()}")
+    if itinerary.label:
+        lines.append(f"Option: {itinerary.label}")
     lines.append("=" * 60)
-    lines.append(f"Budget: ${itinerary.requirements.budget}")
+    currency = itinerary.budget.currency
+    lines.append(f"Budget: {format_amount(itinerary.requirements.budget, itinerary.requirements.currency)}")
     lines.append(f"Travelers: {itinerary.requirements.num_travelers}")
     lines.append(f"Interests: {', '.join(itinerary.requirements.interests)}")
     lines.append("")
     
     for day in itinerary.days:
-        lines.append(f"\n{day.date} - ${day.total_cost:.2f}")
+        lines.append(f"\nDay {day.day_number} ({day.date}) - {format_amount(day.total_cost, currency)}")
         lines.append("-" * 60)
         for activity in day.activities:
-            lines.append(f"  {activity.time} | {activity.name} (${activity.cost})")
+            lines.append(f"  {activity.time} | {activity.name} "
+                         f"({format_amount(activity.cost, activity.currency)})")
             lines.append(f"           {activity.description}")
+            if activity.travel_minutes:
+                lines.append(f"           ~{activity.travel_minutes:.0f} min travel from previous stop")
         if day.notes:
             lines.append(f"  Notes: {day.notes}")
     
     lines.append("\n" + "=" * 60)
     lines.append("BUDGET BREAKDOWN")
     lines.append("=" * 60)
-    lines.append(f"Accommodation: ${itinerary.budget.accommodation:.2f}")
-    lines.append(f"Activities:    ${itinerary.budget.activities:.2f}")
-    lines.append(f"Meals:         ${itinerary.budget.meals:.2f}")
-    lines.append(f"Transport:     ${itinerary.budget.transportation:.2f}")
+    lines.append(f"Accommodation: {format_amount(itinerary.budget.accommodation, currency)}")
+    lines.append(f"Activities:    {format_amount(itinerary.budget.activities, currency)}")
+    lines.append(f"Meals:         {format_amount(itinerary.budget.meals, currency)}")
+    lines.append(f"Transport:     {format_amount(itinerary.budget.transportation, currency)}")
     lines.append("-" * 60)
-    lines.append(f"TOTAL:         ${itinerary.budget.total:.2f}")
+    lines.append(f"TOTAL:         {format_amount(itinerary.budget.total, currency)}")
     lines.append(f"Within Budget: {'✓ YES' if itinerary.budget.within_budget else '✗ NO'}")
+    risk = itinerary.budget.risk
+    if risk:
+        lines.append(f"Price Risk:    {risk.probability_within_budget * 100:.0f}% chance within budget "
+                     f"(P50 {format_amount(risk.p50_total, currency)}, "
+                     f"P90 {format_amount(risk.p90_total, currency)})")
+    
+    if itinerary.budget.repairs:
+        lines.append(f"\nBudget Repairs ({itinerary.budget.repair_steps} step(s)):")
+        for repair in itinerary.budget.repairs:
+            lines.append(f"  • {repair}")
     
     if itinerary.budget.savings_suggestions:
         lines.append("\nSavings Suggestions:")
@@ -525,10 +1458,13 @@ def format_itinerary(itinerary: TripItinerary) -> str:
     lines.append("=" * 60)
     for booking in itinerary.bookings:
         lines.append(f"{booking.name} ({booking.type})")
-        lines.append(f"  Price: ${booking.price} | Rating: {booking.rating}★")
+        lines.append(f"  Price: {format_amount(booking.price, booking.currency)} | Rating: {booking.rating}★")
         lines.append(f"  Features: {', '.join(booking.features)}")
         lines.append("")
     
+    if itinerary.partial_sections:
+        lines.append(f"Pending: {', '.join(itinerary.partial_sections)} "
+                     f"({itinerary.search_completion * 100:.0f}% of search completed)")
     lines.append(f"Generated in {itinerary.iteration_count} iteration(s)")
     lines.append("=" * 60)
     
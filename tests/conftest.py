@@ -0,0 +1,8 @@
+"""
+Shared pytest configuration
+"""
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "perf: wall-clock speed check, deselect with -m 'not perf' on noisy machines")
@@ -0,0 +1,57 @@
+"""
+Unit tests for budget-constrained activity selection
+"""
+
+import time
+from itertools import combinations
+
+import numpy as np
+import pytest
+from activity_selection import select_activities
+
+
+class TestSelectActivities:
+    """Test knapsack activity selection"""
+    
+    def test_respects_budget(self):
+        costs = [40.0, 25.0, 30.0, 0.0]
+        scores = [3.0, 2.0, 2.0, 1.0]
+        chosen = select_activities(costs, scores, budget=55.0)
+        assert sum(costs[i] for i in chosen) <= 55.0
+        assert chosen == [1, 2, 3]
+    
+    def test_max_items(self):
+        costs = [10.0, 10.0, 10.0]
+        scores = [1.0, 3.0, 2.0]
+        assert select_activities(costs, scores, budget=100.0, max_items=2) == [1, 2]
+    
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        costs = rng.integers(0, 60, size=12).astype(float)
+        scores = rng.uniform(0.5, 5.0, size=12)
+        chosen = select_activities(costs, scores, budget=100.0, max_items=3)
+        
+        best = max(
+            sum(scores[i] for i in combo)
+            for k in range(4)
+            for combo in combinations(range(12), k)
+            if sum(costs[i] for i in combo) <= 100.0
+        )
+        assert sum(scores[i] for i in chosen) == pytest.approx(best)
+    
+    def test_nothing_affordable(self):
+        assert select_activities([50.0, 80.0], [1.0, 2.0], budget=10.0) == []
+    
+    @pytest.mark.perf
+    def test_large_pool_is_fast(self):
+        rng = np.random.default_rng(0)
+        costs = rng.uniform(0, 100, size=5000)
+        scores = rng.uniform(0, 5, size=5000)
+        
+        start = time.perf_counter()
+        chosen = select_activities(costs, scores, budget=150.0, max_items=4)
+        elapsed = time.perf_counter() - start
+        
+        assert len(chosen) <= 4
+        assert costs[chosen].sum() <= 150.0
+        assert elapsed < 0.5
@@ -0,0 +1,50 @@
+"""
+Unit tests for availability bitmaps
+"""
+
+import numpy as np
+import pytest
+from availability import AvailabilityCalendar, generate_synthetic_availability
+from hotel_inventory import generate_synthetic_inventory
+from trip_planner_agent import CoordinatorAgent, TripRequirements
+
+
+class TestAvailabilityCalendar:
+    """Test date-range queries over packed nights"""
+    
+    def test_matches_brute_force(self):
+        calendar = generate_synthetic_availability(500, "2025-01-01", seed=3)
+        free = calendar.to_matrix()
+        rows = np.arange(500)
+        for first, nights in [(0, 1), (5, 5), (13, 9), (360, 6)]:
+            check_in = np.datetime64("2025-01-01") + first
+            check_out = check_in + nights
+            expected = free[:, first:first + nights].all(axis=1)
+            got = calendar.is_available(rows, str(check_in), str(check_out))
+            assert np.array_equal(got, expected)
+    
+    def test_book_takes_nights(self):
+        calendar = AvailabilityCalendar(3, "2025-06-01", num_nights=30)
+        calendar.book(1, "2025-06-05", "2025-06-08")
+        assert calendar.available_rows([0, 1, 2], "2025-06-07", "2025-06-09").tolist() == [0, 2]
+        assert calendar.is_available([1], "2025-06-08", "2025-06-10")[0]
+        with pytest.raises(ValueError):
+            calendar.book(1, "2025-06-01", "2025-06-06")
+    
+    def test_nights_outside_calendar_are_free(self):
+        calendar = AvailabilityCalendar(2, "2025-06-01", num_nights=10, available=False)
+        assert calendar.is_available([0, 1], "2025-07-01", "2025-07-03").all()
+        assert not calendar.is_available([0], "2025-06-09", "2025-06-12")[0]
+    
+    def test_booking_agent_skips_full_properties(self):
+        inventory = generate_synthetic_inventory({"Paris": (48.8566, 2.3522)},
+                                                 properties_per_city=2000, seed=2)
+        inventory.availability = generate_synthetic_availability(len(inventory), "2025-01-01",
+                                                                 occupancy=0.7, seed=2)
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-06", 2000.0)
+        options = CoordinatorAgent(hotel_inventory=inventory).booking_agent.find_options(requirements)
+        
+        names = {o.name for o in options if o.type != "flight"}
+        rows = [p.property_id for p in inventory.properties if p.name in names]
+        assert rows
+        assert inventory.availability.is_available(rows, "2025-06-01", "2025-06-06").all()
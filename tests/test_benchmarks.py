@@ -0,0 +1,50 @@
+"""
+Unit tests for the benchmark suite and its regression gate
+"""
+
+from benchmarks import (
+    BenchmarkResult, default_benchmarks, find_regressions, load_baseline,
+    run_benchmarks, save_baseline
+)
+
+
+def result(name, median_ms, peak_kb=100.0):
+    return BenchmarkResult(name=name, rounds=5, median_ms=median_ms, p95_ms=median_ms,
+                           min_ms=median_ms, peak_kb=peak_kb)
+
+
+class TestBenchmarks:
+    """Test timing, baselines and regression detection"""
+
+    def test_runs_selected_benchmarks(self):
+        benchmarks = default_benchmarks(memory_bank_sizes=(1000,))
+        results = run_benchmarks(benchmarks, only=["format_itinerary", "memory_bank_similar_1000"],
+                                 min_rounds=2, min_time_s=0.0)
+
+        assert [r.name for r in results] == ["memory_bank_similar_1000", "format_itinerary"]
+        for r in results:
+            assert r.rounds >= 2
+            assert 0 < r.min_ms <= r.median_ms <= r.p95_ms
+            assert r.peak_kb > 0
+
+    def test_baseline_round_trip(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        save_baseline([result("a", 1.5), result("b", 20.0)], str(path))
+
+        assert load_baseline(str(path)) == {"a": result("a", 1.5), "b": result("b", 20.0)}
+
+    def test_flags_only_regressions_beyond_threshold(self):
+        baseline = {"fast": result("fast", 10.0), "steady": result("steady", 10.0),
+                    "hungry": result("hungry", 10.0, peak_kb=100.0)}
+        current = [result("fast", 14.0), result("steady", 11.0),
+                   result("hungry", 10.0, peak_kb=200.0), result("new", 99.0)]
+
+        regressions = find_regressions(current, baseline, threshold=0.3)
+
+        assert [(r.name, r.measure) for r in regressions] == [("fast", "median_ms"),
+                                                               ("hungry", "peak_kb")]
+        assert round(regressions[0].change, 2) == 0.4
+
+    def test_ignores_noise_on_tiny_timings(self):
+        baseline = {"tiny": result("tiny", 0.004)}
+        assert find_regressions([result("tiny", 0.008)], baseline) == []
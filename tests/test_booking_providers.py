@@ -0,0 +1,126 @@
+"""
+Unit tests for the booking provider fan-out
+"""
+
+import threading
+import time
+
+import pytest
+from booking_providers import BookingFanOut, BookingProvider, SimulatedProvider
+from currency import BASE_CURRENCY, load_fx_table
+from trip_planner_agent import CoordinatorAgent, TripRequirements
+
+
+REQUIREMENTS = TripRequirements("Paris", "2025-06-01", "2025-06-04", 1500.0)
+
+
+def stays(prefix, count=3, rating=4.0):
+    return [{"name": f"{prefix} Hotel {n}", "type": "hotel", "price": 80.0 + 10 * n,
+             "rating": rating} for n in range(count)]
+
+
+class SlowFirstCallProvider(SimulatedProvider):
+    """Provider whose first request stalls, as a tail-latency outlier"""
+
+    def search(self, requirements):
+        if self.calls == 0:
+            self.calls += 1
+            time.sleep(1.0)
+        return super().search(requirements)
+
+
+class TestBookingFanOut:
+    """Test concurrent provider search"""
+
+    def test_first_n_wins(self):
+        with BookingFanOut([
+            SimulatedProvider("fast", stays("Fast"), median_ms=10, latency_sigma=0.0),
+            SimulatedProvider("slow", stays("Slow"), median_ms=800, latency_sigma=0.0),
+        ], min_options=3, deadline_s=2.0, hedging=False) as fan_out:
+            result = fan_out.search(REQUIREMENTS)
+
+        # Returned with the slow provider still pending, long before the deadline
+        assert result.responded == ["fast"]
+        assert result.pending == ["slow"]
+        assert len(result.options) == 3
+
+    def test_deadline_returns_partial(self):
+        with BookingFanOut([
+            SimulatedProvider("fast", stays("Fast", count=1), median_ms=10, latency_sigma=0.0),
+            SimulatedProvider("slow", stays("Slow"), median_ms=800, latency_sigma=0.0),
+        ], min_options=3, deadline_s=0.15, hedging=False) as fan_out:
+            result = fan_out.search(REQUIREMENTS)
+
+        assert [o["name"] for o in result.options] == ["Fast Hotel 0"]
+        assert result.pending == ["slow"]
+
+    def test_hedge_beats_slow_request(self):
+        provider = SlowFirstCallProvider("flaky", stays("Flaky"), median_ms=10, latency_sigma=0.0)
+        # The stalled first call outlasts the deadline, so an answer must be the hedge's
+        with BookingFanOut([provider], deadline_s=0.5, hedge_after_s=0.05) as fan_out:
+            result = fan_out.search(REQUIREMENTS)
+
+        assert result.hedged == ["flaky"]
+        assert result.responded == ["flaky"]
+
+    def test_failure_hedged_then_reported(self):
+        with BookingFanOut([
+            SimulatedProvider("down", stays("Down"), median_ms=5, failure_rate=1.0),
+        ], deadline_s=1.0) as fan_out:
+            result = fan_out.search(REQUIREMENTS)
+        assert result.failed == ["down"]
+        assert fan_out.providers[0].calls == 2
+
+    def test_slow_provider_cannot_starve_later_searches(self):
+        slow = SimulatedProvider("slow", stays("Slow"), median_ms=1000, latency_sigma=0.0)
+        with BookingFanOut([
+            SimulatedProvider("fast", stays("Fast"), median_ms=10, latency_sigma=0.0), slow,
+        ], min_options=5, deadline_s=0.15, hedge_after_s=0.05) as fan_out:
+            for _ in range(4):
+                result = fan_out.search(REQUIREMENTS)
+                assert result.responded == ["fast"]
+                assert len(result.options) == 3
+                assert result.pending == ["slow"]
+        assert slow.calls == 2  # The rest waited for capacity instead of piling up
+
+    def test_providers_must_implement_search(self):
+        with pytest.raises(TypeError):
+            BookingProvider()
+
+    def test_duplicates_keep_cheapest(self):
+        cheap = [{"name": "Shared Hotel", "type": "hotel", "price": 90.0, "rating": 4.0}]
+        dear = [{"name": "Shared Hotel", "type": "hotel", "price": 110.0, "rating": 4.0}]
+        with BookingFanOut([SimulatedProvider("a", dear, median_ms=5, latency_sigma=0.0),
+                            SimulatedProvider("b", cheap, median_ms=20, latency_sigma=0.0)],
+                           min_options=5, deadline_s=1.0) as fan_out:
+            result = fan_out.search(REQUIREMENTS)
+        assert [(o["price"], o["provider"]) for o in result.options] == [(90.0, "b")]
+
+    def test_close_stops_provider_threads(self):
+        slow = SimulatedProvider("closing", stays("Slow"), median_ms=300, latency_sigma=0.0)
+        fan_out = BookingFanOut([slow], deadline_s=0.05, hedging=False)
+        fan_out.search(REQUIREMENTS)
+        fan_out.close(wait=True)
+
+        assert not [t for t in threading.enumerate() if t.name.startswith("booking-closing")]
+        with pytest.raises(RuntimeError):
+            fan_out.search(REQUIREMENTS)
+
+    def test_booking_agent_uses_providers(self):
+        fan_out = BookingFanOut([SimulatedProvider("fast", stays("Fast"), median_ms=5)])
+        with CoordinatorAgent(booking_providers=fan_out) as coordinator:
+            options = coordinator.booking_agent.find_options(REQUIREMENTS)
+        assert {o.provider for o in options if o.type == "hotel"} == {"fast"}
+        assert any(o.type == "flight" for o in options)
+
+    def test_booking_agent_prices_options_in_base_currency(self):
+        in_yen = [dict(stay, price=15000.0, currency="JPY") for stay in stays("Tokyo")]
+        fan_out = BookingFanOut([SimulatedProvider("jp", in_yen, median_ms=5)])
+        with CoordinatorAgent(booking_providers=fan_out) as coordinator:
+            options = coordinator.booking_agent.find_options(REQUIREMENTS)
+
+        from_provider = [o for o in options if o.provider == "jp"]
+        assert from_provider
+        assert all(o.currency == BASE_CURRENCY for o in from_provider)
+        assert from_provider[0].price == pytest.approx(
+            float(load_fx_table().convert(15000.0, "JPY", BASE_CURRENCY)))
@@ -0,0 +1,51 @@
+"""
+Unit tests for the incremental budget ledger
+"""
+
+import pytest
+from budget_ledger import BudgetLedger
+from trip_planner_agent import Activity, CoordinatorAgent, TripRequirements
+
+
+class TestBudgetLedger:
+    """Test running totals"""
+
+    def test_add_remove_replace(self):
+        ledger = BudgetLedger()
+        lunch = Activity("Lunch", "", 1.0, 30.0, "meal")
+        museum = Activity("Museum", "", 2.0, 25.0, "culture")
+        ledger.add_activity(1, lunch)
+        ledger.add_activity(1, museum)
+        ledger.set_fixed("accommodation", 200.0)
+
+        assert ledger.day_total(1) == 55.0
+        assert ledger.meals == 30.0
+        assert ledger.activities == 25.0
+        assert ledger.total == 255.0
+
+        ledger.replace_activity(1, museum, Activity("Walk", "", 2.0, 0.0, "culture"))
+        ledger.set_fixed("accommodation", 150.0)
+        assert ledger.category_totals["culture"] == 0.0
+        assert ledger.total == 180.0
+
+        ledger.remove_activity(1, lunch)
+        assert ledger.day_total(1) == 0.0
+        assert ledger.total == 150.0
+
+    def test_drop_day_renumbers(self):
+        ledger = BudgetLedger(day_totals={1: 10.0, 2: 20.0, 3: 30.0})
+        ledger.drop_day(2)
+        assert ledger.day_totals == {1: 10.0, 2: 30.0}
+
+    def test_shared_with_itinerary(self):
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-04", 600.0)
+        itinerary = CoordinatorAgent().process_request(requirements)
+        ledger = itinerary.ledger
+        budget = itinerary.budget
+
+        assert ledger.total == pytest.approx(budget.total)
+        assert budget.total == pytest.approx(budget.accommodation + budget.activities
+                                             + budget.meals + budget.transportation)
+        for day in itinerary.days:
+            assert day.total_cost == pytest.approx(sum(a.cost for a in day.activities))
+            assert ledger.day_total(day.day_number) == pytest.approx(day.total_cost)
@@ -0,0 +1,71 @@
+"""
+Unit tests for batched candidate scoring
+"""
+
+import time
+
+import numpy as np
+import pytest
+from candidate_scoring import CandidateBatch, ScoringWeights, score_candidates
+from trip_planner_agent import (
+    TripRequirements, MemoryBank, ItineraryPlannerAgent,
+    MockGoogleSearchTool, MockCodeExecutionTool
+)
+
+
+def random_batch(n, days=5, interests=3, seed=0):
+    rng = np.random.default_rng(seed)
+    return CandidateBatch(
+        day_costs=rng.uniform(50, 200, (n, days)),
+        day_hours=rng.uniform(4, 12, (n, days)),
+        day_counts=rng.integers(2, 6, (n, days)).astype(float),
+        day_mask=np.ones((n, days), dtype=bool),
+        interest_hits=rng.integers(0, 3, (n, interests)).astype(float),
+        fixed_costs=np.full(n, 500.0)
+    )
+
+
+class TestScoreCandidates:
+    """Test batched scoring"""
+    
+    def test_scores_in_unit_range(self):
+        scores = score_candidates(random_batch(100), budget=1200.0)
+        for column in (scores.cost, scores.interest, scores.density,
+                       scores.pacing, scores.combined):
+            assert column.shape == (100,)
+            assert np.all((column >= 0) & (column <= 1))
+    
+    def test_top_k_sorted(self):
+        scores = score_candidates(random_batch(500), budget=1200.0)
+        best = scores.top_k(10)
+        assert len(best) == 10
+        assert best[0] == int(np.argmax(scores.combined))
+        assert list(scores.combined[best]) == sorted(scores.combined[best], reverse=True)
+    
+    def test_weights(self):
+        batch = random_batch(200)
+        scores = score_candidates(batch, budget=1000.0,
+                                  weights=ScoringWeights(cost=1.0, interest=0, density=0, pacing=0))
+        assert np.allclose(scores.combined, scores.cost)
+    
+    def test_from_day_plans(self):
+        planner = ItineraryPlannerAgent(MockGoogleSearchTool(), MockCodeExecutionTool())
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-03", 1500.0,
+                                        interests=["art", "tour"])
+        days = planner.plan(requirements, MemoryBank())
+        
+        batch = CandidateBatch.from_day_plans([days, days[:2]], requirements.interests,
+                                              fixed_costs=340.0)
+        assert batch.day_costs.shape == (2, 3)
+        assert batch.day_mask[1].tolist() == [True, True, False]
+        
+        scores = score_candidates(batch, budget=requirements.budget)
+        assert scores.total_cost[0] == pytest.approx(340.0 + sum(d.total_cost for d in days))
+        assert scores.interest[0] == 1.0
+    
+    @pytest.mark.perf
+    def test_thousands_of_candidates_fast(self):
+        batch = random_batch(10000, days=14)
+        start = time.perf_counter()
+        score_candidates(batch, budget=3000.0).top_k(20)
+        assert time.perf_counter() - start < 0.5
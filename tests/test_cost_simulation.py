@@ -0,0 +1,56 @@
+"""
+Unit tests for Monte Carlo cost simulation
+"""
+
+import time
+
+import pytest
+from cost_simulation import simulate_costs
+from trip_planner_agent import CoordinatorAgent, TripRequirements, format_itinerary
+
+
+class TestCostSimulation:
+    """Test sampled budget risk"""
+
+    def test_quantiles_bracket_estimate(self):
+        report = simulate_costs([500.0, 100.0, 60.0, 40.0],
+                                ["accommodation", "transportation", "meal", "culture"],
+                                budget=700.0, seed=1)
+        assert report.mean_total == pytest.approx(700.0, rel=0.02)
+        assert report.p50_total <= report.p90_total
+        assert 0.3 < report.probability_within_budget < 0.7
+
+    def test_budget_headroom(self):
+        costs, categories = [100.0] * 5, ["meal"] * 5
+        generous = simulate_costs(costs, categories, budget=1000.0, seed=1)
+        tight = simulate_costs(costs, categories, budget=300.0, seed=1)
+        assert generous.probability_within_budget == 1.0
+        assert tight.probability_within_budget == 0.0
+
+    def test_no_volatility_is_deterministic(self):
+        report = simulate_costs([10.0, 20.0], ["meal", "culture"], budget=30.0,
+                                volatility={"meal": 0.0, "culture": 0.0}, seed=1)
+        assert report.p90_total == pytest.approx(30.0)
+
+    def test_simulation_mode(self):
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-10", 3000.0)
+        coordinator = CoordinatorAgent()
+        itinerary = coordinator.process_request(requirements)
+        assert itinerary.budget.risk is None
+
+        coordinator.budget_agent.simulate(requirements, itinerary.days, itinerary.budget)
+
+        risk = itinerary.budget.risk
+        assert risk.num_samples == 10_000
+        assert risk.p90_total >= itinerary.budget.total * 0.95
+        assert "Price Risk" in format_itinerary(itinerary)
+
+    @pytest.mark.perf
+    def test_simulation_is_fast(self):
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-10", 3000.0)
+        coordinator = CoordinatorAgent()
+        itinerary = coordinator.process_request(requirements)
+
+        start = time.perf_counter()
+        coordinator.budget_agent.simulate(requirements, itinerary.days, itinerary.budget)
+        assert time.perf_counter() - start < 0.5
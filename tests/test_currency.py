@@ -0,0 +1,68 @@
+"""
+Unit tests for multi-currency pricing
+"""
+
+import json
+
+import numpy as np
+import pytest
+from currency import FXTable, clear_fx_cache, convert_itineraries, format_amount, load_fx_table
+from trip_planner_agent import CoordinatorAgent, TripRequirements, format_itinerary
+
+
+@pytest.fixture
+def table():
+    return FXTable({"USD": 1.0, "EUR": 0.9, "JPY": 150.0})
+
+
+class TestFXTable:
+    """Test rate lookups and vectorized conversion"""
+
+    def test_convert_mixed_sources(self, table):
+        converted = table.convert([10.0, 9.0, 1500.0], ["USD", "EUR", "JPY"], "EUR")
+        assert np.allclose(converted, [9.0, 9.0, 9.0])
+        assert table.rate("EUR", "JPY") == pytest.approx(150.0 / 0.9)
+
+    def test_unknown_currency(self, table):
+        with pytest.raises(ValueError):
+            table.convert([1.0], "XYZ", "USD")
+
+    def test_cache_expiry(self, tmp_path):
+        path = tmp_path / "rates.json"
+        path.write_text(json.dumps({"base": "USD", "rates": {"USD": 1.0, "EUR": 0.9}}))
+        clear_fx_cache()
+        first = load_fx_table(str(path))
+        assert load_fx_table(str(path)) is first
+        assert load_fx_table(str(path), max_age_s=0) is not first
+
+    def test_format_amount(self):
+        assert format_amount(12.5, "EUR") == "€12.50"
+        assert format_amount(1200.4, "JPY") == "¥1200"
+        assert format_amount(3.0, "CHF") == "3.00 CHF"
+
+
+class TestItineraryConversion:
+    """Test converting whole itineraries"""
+
+    def test_round_trip(self, table):
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-03", 800.0)
+        itinerary = CoordinatorAgent().process_request(requirements)
+        euros, = convert_itineraries([itinerary], "EUR", table)
+
+        assert euros.budget.currency == "EUR"
+        assert euros.budget.total == pytest.approx(itinerary.budget.total * 0.9)
+        assert euros.days[0].activities[0].currency == "EUR"
+        assert euros.ledger.total == pytest.approx(euros.budget.total)
+        # The original is left untouched
+        assert itinerary.budget.currency == "USD"
+
+    def test_budget_in_user_currency(self):
+        requirements = TripRequirements("Tokyo", "2025-06-01", "2025-06-03", 150000.0,
+                                        currency="JPY")
+        itinerary = CoordinatorAgent().process_request(requirements)
+
+        assert itinerary.requirements.budget == 150000.0
+        assert itinerary.budget.currency == "JPY"
+        assert all(b.currency == "JPY" for b in itinerary.bookings)
+        assert itinerary.budget.within_budget == (itinerary.budget.total <= 150000.0)
+        assert "¥" in format_itinerary(itinerary)
@@ -0,0 +1,290 @@
+"""
+Unit tests for the evaluation harness
+"""
+
+import os
+import time
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import evaluation
+from evaluation import (
+    EVALUATION_SCENARIOS, METRIC_NAMES, RESOURCE_METRICS, AgentEvaluator, EvaluationCache,
+    ItineraryColumns, ResourceThresholds, ResultStream, instrumented, planner_fingerprint,
+    read_results, run_scenarios, score_columns, summarize_results
+)
+from trip_planner_agent import CoordinatorAgent, MemoryBank
+
+
+def scenarios(count):
+    base = [requirements for _, requirements in EVALUATION_SCENARIOS]
+    return [(f"Scenario {n}", replace(base[n % len(base)], budget=600.0 + 150 * n))
+            for n in range(count)]
+
+
+class TestParallelRunner:
+    """Test running scenarios in a process pool"""
+    
+    def test_parallel_matches_sequential(self):
+        progress = []
+        sequential = run_scenarios(scenarios(6), workers=1, progress=None)
+        parallel = run_scenarios(scenarios(6), workers=2,
+                                 progress=lambda done, total, passed: progress.append(done))
+        
+        assert [r.scenario_name for r in parallel] == [f"Scenario {n}" for n in range(6)]
+        assert [r.overall_score for r in parallel] == [r.overall_score for r in sequential]
+        assert progress == [1, 2, 3, 4, 5, 6]
+    
+    def test_scenarios_are_isolated(self, monkeypatch):
+        seen = []
+        original = MemoryBank.get_similar_trips
+        
+        def record(self, destination):
+            trips = original(self, destination)
+            seen.append(len(trips))
+            return trips
+        
+        monkeypatch.setattr(MemoryBank, "get_similar_trips", record)
+        repeated = [("Same trip", EVALUATION_SCENARIOS[0][1])] * 3
+        run_scenarios(repeated, workers=1, progress=None)
+        # A shared MemoryBank would have remembered the earlier runs
+        assert seen == [0, 0, 0]
+    
+    def test_cli_workers_flag(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(evaluation, "run_evaluation_suite",
+                            lambda workers=None, use_cache=True: calls.append((workers, use_cache)) or [])
+        assert evaluation.main([]) == 0
+        assert evaluation.main(["--workers", "3", "--no-cache"]) == 0
+        assert evaluation.main(["--workers", "0"]) == 2
+        assert calls == [(None, True), (3, False)]
+
+
+class TestBatchMetrics:
+    """Test scoring many itineraries at once"""
+    
+    def test_batch_matches_single_itinerary_metrics(self):
+        evaluator = AgentEvaluator()
+        itineraries = [evaluator.coordinator.process_request(requirements)
+                       for _, requirements in scenarios(8)]
+        # Exercise the over-budget and short-day branches too
+        itineraries[1].budget.total = itineraries[1].requirements.budget * 1.03
+        itineraries[2].budget.total = itineraries[2].requirements.budget * 1.4
+        itineraries[3].days[0].activities = itineraries[3].days[0].activities[:1]
+        itineraries[4].requirements.interests = []
+        
+        table = evaluator.evaluate_batch(itineraries)
+        
+        for row, itinerary in enumerate(itineraries):
+            metrics = [evaluator.evaluate_budget_adherence(itinerary),
+                       evaluator.evaluate_day_coverage(itinerary),
+                       evaluator.evaluate_activity_density(itinerary),
+                       evaluator.evaluate_preference_matching(itinerary),
+                       evaluator.evaluate_iteration_efficiency(itinerary)]
+            assert [m.name for m in metrics] == list(METRIC_NAMES)
+            assert np.allclose(table.scores[row], [m.score for m in metrics])
+            assert list(table.passed[row]) == [m.passed for m in metrics]
+            assert table.overall_score[row] == np.mean([m.score for m in metrics])
+            assert table.overall_passed[row] == (metrics[0].passed and metrics[1].passed)
+        assert table.summary()["Budget Adherence"]["pass_rate"] == 7 / 8
+    
+    @pytest.mark.perf
+    def test_scores_100k_itineraries_under_a_second(self):
+        rng = np.random.default_rng(0)
+        n = 100_000
+        planned = rng.integers(1, 8, n)
+        day_activities = rng.integers(1, 7, planned.sum())
+        per_itinerary = np.add.reduceat(day_activities, np.cumsum(planned) - planned)
+        columns = ItineraryColumns(
+            budget=rng.uniform(500, 5000, n),
+            total_cost=rng.uniform(400, 5500, n),
+            planned_days=planned,
+            expected_days=planned,
+            day_activities=day_activities,
+            has_interests=rng.random(n) < 0.9,
+            matching_activities=rng.binomial(per_itinerary, 0.4),
+            iterations=rng.integers(1, 4, n)
+        )
+        
+        start = time.perf_counter()
+        table = score_columns(columns)
+        
+        assert time.perf_counter() - start < 1.0
+        assert len(table) == n
+        assert ((table.scores >= 0) & (table.scores <= 1)).all()
+
+
+class TestResultStream:
+    """Test streaming results to JSONL as scenarios finish"""
+    
+    def test_each_result_is_on_disk_when_it_completes(self, tmp_path):
+        path = str(tmp_path / "results.jsonl")
+        lines_seen = []
+        
+        with ResultStream(path) as output:
+            def progress(done, total, passed):
+                with open(path) as f:
+                    lines_seen.append(len(f.readlines()))
+            results = run_scenarios(scenarios(4), workers=1, progress=progress, output=output)
+        
+        assert lines_seen == [1, 2, 3, 4]
+        records = list(read_results(path))
+        assert [r["index"] for r in records] == [0, 1, 2, 3]
+        assert [r["overall_score"] for r in records] == [r.overall_score for r in results]
+    
+    def test_summary_survives_a_crash_mid_write(self, tmp_path):
+        path = str(tmp_path / "results.jsonl")
+        with ResultStream(path) as output:
+            results = run_scenarios(scenarios(3), workers=1, progress=None, output=output)
+        with open(path, "a") as f:
+            f.write('{"index": 3, "name": "Scenario 3", "pass')  # Killed mid-record
+        
+        summary = summarize_results(path)
+        
+        assert summary["total_scenarios"] == 3
+        assert summary["passed"] == sum(r.passed for r in results)
+        assert summary["average_score"] == np.mean([r.overall_score for r in results])
+        assert set(summary["metrics"]) == set(METRIC_NAMES) | set(RESOURCE_METRICS)
+        latency = summary["metrics"]["Response Latency"]
+        assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"]
+        assert "p50" not in summary["metrics"]["Day Coverage"]
+    
+    def test_append_keeps_earlier_results(self, tmp_path):
+        path = str(tmp_path / "results.jsonl")
+        with ResultStream(path) as output:
+            run_scenarios(scenarios(1), workers=1, progress=None, output=output)
+        with ResultStream(path, append=True) as output:
+            run_scenarios(scenarios(2), workers=1, progress=None, output=output)
+        
+        assert summarize_results(path)["total_scenarios"] == 3
+
+
+class TestEvaluationCache:
+    """Test serving unchanged scenarios from the content-addressed cache"""
+    
+    def test_unchanged_scenarios_are_not_replanned(self, tmp_path, monkeypatch):
+        cache = EvaluationCache(str(tmp_path))
+        first = run_scenarios(scenarios(3), workers=1, progress=None, cache=cache)
+        
+        calls = []
+        original = CoordinatorAgent.process_request
+        
+        def record(self, requirements, *args, **kwargs):
+            calls.append(requirements)
+            return original(self, requirements, *args, **kwargs)
+        
+        monkeypatch.setattr(CoordinatorAgent, "process_request", record)
+        changed = scenarios(3)
+        changed[1] = ("Renamed", replace(changed[1][1], budget=5000.0))
+        changed[2] = ("Also renamed", changed[2][1])
+        second = run_scenarios(changed, workers=1, progress=None,
+                               cache=EvaluationCache(str(tmp_path)))
+        
+        assert [r.budget for r in calls] == [5000.0]
+        assert second[0].overall_score == first[0].overall_score
+        assert [r.scenario_name for r in second] == ["Scenario 0", "Renamed", "Also renamed"]
+    
+    def test_hits_leave_resource_percentiles_alone(self, tmp_path):
+        run_scenarios(scenarios(2), workers=1, progress=None, cache=EvaluationCache(str(tmp_path)))
+        path = str(tmp_path / "results.jsonl")
+        with ResultStream(path) as output:
+            results = run_scenarios(scenarios(2), workers=1, progress=None, output=output,
+                                    cache=EvaluationCache(str(tmp_path)))
+        
+        assert all(m.name not in RESOURCE_METRICS for r in results for m in r.metrics)
+        assert all(r.passed for r in results)
+        assert "Response Latency" not in summarize_results(path)["metrics"]
+    
+    def test_planner_changes_invalidate_entries(self, tmp_path):
+        cache = EvaluationCache(str(tmp_path), fingerprint="planner-v1")
+        run_scenarios(scenarios(2), workers=1, progress=None, cache=cache)
+        
+        same = EvaluationCache(str(tmp_path), fingerprint="planner-v1")
+        run_scenarios(scenarios(2), workers=1, progress=None, cache=same)
+        edited = EvaluationCache(str(tmp_path), fingerprint="planner-v2")
+        run_scenarios(scenarios(2), workers=1, progress=None, cache=edited)
+        
+        assert (same.hits, same.misses) == (2, 0)
+        assert (edited.hits, edited.misses) == (0, 2)
+    
+    def test_prune_drops_old_and_least_recently_used(self, tmp_path):
+        cache = EvaluationCache(str(tmp_path), fingerprint="planner-v1")
+        result = run_scenarios(scenarios(1), workers=1, progress=None)[0]
+        now = time.time()
+        for n, age_days in enumerate([40, 3, 2, 1]):
+            cache.put(f"entry{n}", result)
+            os.utime(tmp_path / f"entry{n}.pkl", (now - age_days * 86400,) * 2)
+        assert cache.get("entry1") is not None  # Now the most recently used
+        
+        pruned = EvaluationCache(str(tmp_path), fingerprint="planner-v1", max_entries=2)
+        assert sorted(os.listdir(tmp_path)) == ["entry1.pkl", "entry3.pkl"]
+        pruned.clear()
+        assert os.listdir(tmp_path) == []
+    
+    def test_fingerprint_is_stable(self):
+        assert planner_fingerprint() == planner_fingerprint()
+        assert len(planner_fingerprint()) == 64
+    
+    def test_fingerprint_covers_data_files(self, tmp_path):
+        rates = tmp_path / "fx_rates.json"
+        rates.write_text('{"EUR": 0.92}')
+        before = planner_fingerprint(str(tmp_path))
+        rates.write_text('{"EUR": 0.95}')
+        assert planner_fingerprint(str(tmp_path)) != before
+
+
+class TestResourceMetrics:
+    """Test latency, memory and tool-call metrics"""
+    
+    def test_metrics_reported_with_raw_values(self):
+        evaluator = AgentEvaluator(thresholds=ResourceThresholds(peak_memory_mb=64.0))
+        result = evaluator.evaluate_scenario(*scenarios(1)[0])
+        metrics = {m.name: m for m in result.metrics}
+        
+        for name in RESOURCE_METRICS:
+            assert metrics[name].passed
+            assert metrics[name].value > 0
+        assert "ItineraryPlanner.plan" in metrics["Slowest Agent Call"].details
+        assert "MockGoogleSearchTool.search" in metrics["Tool Calls"].details
+        # Quality score is unaffected by resource metrics
+        assert result.overall_score == np.mean([metrics[name].score for name in METRIC_NAMES])
+    
+    def test_exceeding_a_threshold_fails_the_scenario(self):
+        evaluator = AgentEvaluator(thresholds=ResourceThresholds(tool_calls=1))
+        result = evaluator.evaluate_scenario(*scenarios(1)[0])
+        metrics = {m.name: m for m in result.metrics}
+        
+        assert not result.passed
+        assert not metrics["Tool Calls"].passed
+        assert metrics["Tool Calls"].score == 1 / metrics["Tool Calls"].value
+        # Without a memory limit peak memory is still reported, and passes
+        assert metrics["Peak Memory"].passed and "no limit" in metrics["Peak Memory"].details
+    
+    def test_memory_is_traced_on_the_scored_run(self, monkeypatch):
+        calls = []
+        process_request = CoordinatorAgent.process_request
+        monkeypatch.setattr(CoordinatorAgent, "process_request",
+                            lambda self, *args, **kwargs: calls.append(self)
+                            or process_request(self, *args, **kwargs))
+        evaluator = AgentEvaluator(thresholds=ResourceThresholds(peak_memory_mb=64.0))
+        result = evaluator.evaluate_scenario(*scenarios(1)[0])
+        
+        assert calls == [evaluator.coordinator]
+        assert {m.name: m for m in result.metrics}["Peak Memory"].value > 0
+        
+        tight = AgentEvaluator(thresholds=ResourceThresholds(peak_memory_mb=1e-6))
+        result = tight.evaluate_scenario(*scenarios(1)[0])
+        assert not result.passed and not {m.name: m for m in result.metrics}["Peak Memory"].passed
+    
+    def test_instrumentation_is_removed_afterwards(self):
+        evaluator = AgentEvaluator()
+        coordinator = evaluator.coordinator
+        with instrumented(coordinator) as stats:
+            coordinator.process_request(scenarios(1)[0][1], max_iterations=1)
+        
+        assert stats.agent_ms["ItineraryPlanner.plan"]
+        assert stats.total_tool_calls >= 1
+        assert "plan" not in vars(coordinator.itinerary_agent)
+        assert "search" not in vars(coordinator.booking_agent.search_tool)
@@ -0,0 +1,81 @@
+"""
+Unit tests for the local hotel inventory
+"""
+
+import time
+
+import numpy as np
+import pytest
+from hotel_inventory import HotelInventory, HotelWeights, amenity_mask, generate_synthetic_inventory
+from trip_planner_agent import CoordinatorAgent, TripRequirements
+
+
+CITIES = {"Paris, France": (48.8566, 2.3522), "Tokyo, Japan": (35.6762, 139.6503)}
+
+
+@pytest.fixture(scope="module")
+def inventory():
+    return generate_synthetic_inventory(CITIES, properties_per_city=5000, seed=1)
+
+
+class TestHotelInventory:
+    """Test inventory indexes and top-k queries"""
+    
+    def test_price_range(self, inventory):
+        rows = inventory.in_price_range("Paris", 80.0, 120.0)
+        prices = inventory.prices[rows]
+        assert len(rows) and np.all((prices >= 80.0) & (prices <= 120.0))
+        assert np.all(np.diff(prices) >= 0)
+        assert all(inventory.properties[row].city == "Paris, France" for row in rows[:50])
+    
+    def test_top_rated(self, inventory):
+        ratings = inventory.ratings[inventory.top_rated("Tokyo", 20)]
+        assert np.all(np.diff(ratings) <= 0)
+        assert ratings[0] == inventory.ratings[inventory.in_price_range("Tokyo")].max()
+    
+    def test_search_matches_brute_force(self, inventory):
+        weights = HotelWeights(price=0.0, rating=1.0, preference=0.0)
+        rows = inventory.search("Paris", k=5, max_price=150.0, kinds=["hotel"],
+                                required_amenities=["pool", "wifi"], weights=weights)
+        
+        required = amenity_mask(["pool", "wifi"])
+        expected = [row for row in inventory.in_price_range("Paris", 0.0, 150.0)
+                    if inventory.properties[row].kind == "hotel"
+                    and inventory.amenity_masks[row] & required == required]
+        best = sorted(inventory.ratings[expected], reverse=True)[:5]
+        assert inventory.ratings[rows].tolist() == best
+    
+    @pytest.mark.perf
+    def test_query_latency(self, inventory):
+        inventory.search("Paris", k=5)
+        start = time.perf_counter()
+        for _ in range(100):
+            inventory.search("Paris", k=5, max_price=200.0,
+                             preferred_amenities=["wifi", "breakfast"])
+        assert (time.perf_counter() - start) / 100 < 0.005
+    
+    def test_jsonl_round_trip(self, inventory, tmp_path):
+        path = tmp_path / "stays.jsonl"
+        inventory.save_jsonl(str(path))
+        loaded = HotelInventory.from_jsonl(str(path))
+        assert loaded.properties == inventory.properties
+        assert loaded.top_rated("Paris", 3).tolist() == inventory.top_rated("Paris", 3).tolist()
+    
+    def test_unknown_amenity(self):
+        with pytest.raises(ValueError):
+            amenity_mask(["helipad"])
+    
+    def test_booking_agent_uses_inventory(self, inventory):
+        coordinator = CoordinatorAgent(hotel_inventory=inventory)
+        requirements = TripRequirements("Paris, France", "2025-06-01", "2025-06-04", 1200.0)
+        options = coordinator.booking_agent.find_options(requirements)
+        
+        stays = [o for o in options if o.type in ("hotel", "rental")]
+        assert stays and all(o.name.startswith("Paris") for o in stays)
+        hotels = [row for row in inventory.in_price_range("Paris")
+                  if inventory.properties[row].kind == "hotel"]
+        assert min(o.price for o in stays) == inventory.prices[hotels[0]]
+        assert any(o.type == "flight" for o in options)
+        
+        itinerary = coordinator.process_request(requirements)
+        assert itinerary.bookings[0].name.startswith("Paris")
@@ -0,0 +1,62 @@
+"""
+Unit tests for interest matching
+"""
+
+from interest_matcher import InterestMatcher, compile_interests, stem
+
+
+class TestInterestMatcher:
+    """Test the compiled interest matcher"""
+
+    def test_substring_matching_is_case_insensitive(self):
+        matcher = InterestMatcher(["Art", "theme parks", "food"])
+
+        assert matcher.matches("Modern ART gallery")
+        assert matcher.matches("A party downtown")  # Substrings count by default
+        assert not matcher.matches("Harbour cruise")
+        assert matcher.matching_interests("Theme Parks and Food Halls") == {"theme parks", "food"}
+
+    def test_shared_prefixes(self):
+        matcher = InterestMatcher(["art", "artisan", "architecture"], whole_words=True)
+
+        assert matcher.matches("Artisan market")
+        assert matcher.matches("Gothic architecture tour")
+        assert matcher.matching_interests("art and artisan stalls") == {"art", "artisan"}
+        assert not matcher.matches("Artist quarter")
+
+    def test_whole_words(self):
+        matcher = InterestMatcher(["art", "history"], whole_words=True)
+
+        assert matcher.matches("Street art walk")
+        assert matcher.matches("Local history, told by locals")
+        assert not matcher.matches("A party downtown")
+        assert not matcher.matches("Prehistory museum")
+
+    def test_stemming(self):
+        matcher = InterestMatcher(["museums", "theme parks", "shopping"], whole_words=True, stem=True)
+
+        assert matcher.matches("Visit the national museum")
+        assert matcher.matches("Day at the theme park")
+        assert matcher.matches("Shop for souvenirs")
+        assert not InterestMatcher(["museums"], whole_words=True).matches("The national museum")
+
+    def test_stem(self):
+        assert stem("museums") == stem("museum")
+        assert stem("dancing") == stem("dance")
+        assert stem("beaches") == stem("beach")
+        assert stem("cities") == stem("city")
+        assert stem("bus") == "bus"
+        assert stem("class") == "class"
+
+    def test_no_interests_match_nothing(self):
+        assert not InterestMatcher([]).matches("anything at all")
+        assert InterestMatcher([" "]).matching_interests("a b") == set()
+
+    def test_count(self):
+        matcher = compile_interests(["Art", "history", "food"])
+        assert matcher.count("Art and History Museum") == 2
+        assert matcher.count("City park") == 0
+
+    def test_compiled_matchers_are_shared(self):
+        assert compile_interests(["Food", "art"]) is compile_interests(["art", "food"])
+        assert compile_interests(["art"]) is not compile_interests(["art"], whole_words=True)
@@ -0,0 +1,119 @@
+"""
+Unit tests for incremental itinerary editing
+"""
+
+import pytest
+from currency import BASE_CURRENCY, load_fx_table
+from itinerary_editor import ItineraryEditor
+from trip_planner_agent import Activity, CoordinatorAgent, TripRequirements
+
+
+def total_from_parts(budget):
+    return budget.accommodation + budget.activities + budget.meals + budget.transportation
+
+
+@pytest.fixture
+def planned():
+    coordinator = CoordinatorAgent()
+    requirements = TripRequirements("Paris", "2025-06-01", "2025-06-05", 1500.0,
+                                    interests=["art"])
+    return coordinator, coordinator.process_request(requirements)
+
+
+class TestItineraryEditor:
+    """Test edit operations"""
+    
+    def test_replace_activity(self, planned):
+        coordinator, itinerary = planned
+        editor = ItineraryEditor(coordinator)
+        day = itinerary.days[1]
+        old = day.activities[0]
+        before = itinerary.budget.total
+        
+        editor.replace_activity(itinerary, 2, 0,
+                                Activity("Cooking class", "", 2.5, 80.0, "culture"))
+        
+        edited = itinerary.days[1]
+        assert edited.activities[0].name == "Cooking class"
+        assert edited.activities[0].time == old.time
+        assert edited.total_cost == pytest.approx(sum(a.cost for a in edited.activities))
+        assert itinerary.budget.total == pytest.approx(before + 80.0 - old.cost)
+        assert itinerary.budget.total == pytest.approx(total_from_parts(itinerary.budget))
+    
+    def test_drop_day_requeries_bookings(self, planned):
+        coordinator, itinerary = planned
+        editor = ItineraryEditor(coordinator)
+        calls = []
+        find_options = coordinator.booking_agent.find_options
+        coordinator.booking_agent.find_options = lambda req: calls.append(req) or find_options(req)
+        
+        editor.drop_day(itinerary, 2)
+        
+        assert [d.day_number for d in itinerary.days] == [1, 2, 3, 4]
+        assert [d.date for d in itinerary.days][-1] == "2025-06-04"
+        assert itinerary.requirements.end_date == "2025-06-04"
+        assert len(calls) == 1
+        assert itinerary.budget.total == pytest.approx(total_from_parts(itinerary.budget))
+        assert itinerary.budget.total == pytest.approx(
+            itinerary.budget.accommodation + itinerary.budget.transportation
+            + sum(d.total_cost for d in itinerary.days))
+    
+    def test_replace_does_not_requery(self, planned):
+        coordinator, itinerary = planned
+        editor = ItineraryEditor(coordinator)
+        coordinator.booking_agent.find_options = None  # Any call would fail
+        coordinator.itinerary_agent.plan = None
+        
+        editor.replace_activity(itinerary, 1, 0, Activity("Walk", "", 1.0, 0.0, "sightseeing"))
+        assert itinerary.days[0].activities[0].name == "Walk"
+    
+    def test_change_budget_repairs(self, planned):
+        coordinator, itinerary = planned
+        editor = ItineraryEditor(coordinator)
+        
+        editor.change_budget(itinerary, 900.0)
+        assert itinerary.requirements.budget == 900.0
+        assert itinerary.budget.within_budget
+        assert itinerary.budget.repair_steps > 0
+    
+    def test_change_budget_replaces_shortfall(self, planned):
+        coordinator, itinerary = planned
+        editor = ItineraryEditor(coordinator)
+        
+        editor.change_budget(itinerary, 100.0)
+        editor.change_budget(itinerary, 90.0)
+        assert sum("short of" in s for s in itinerary.budget.savings_suggestions) == 1
+        
+        editor.change_budget(itinerary, 5000.0)
+        assert itinerary.budget.savings_suggestions == []
+    
+    def test_edits_convert_currency(self):
+        coordinator = CoordinatorAgent()
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-05", 1500.0,
+                                        interests=["art"], currency="EUR")
+        itinerary = coordinator.process_request(requirements)
+        editor = ItineraryEditor(coordinator)
+        old = itinerary.days[1].activities[0]
+        before = itinerary.budget.total
+        
+        editor.replace_activity(itinerary, 2, 0, Activity("Cooking class", "", 2.5, 80.0, "culture"))
+        
+        in_euros = float(load_fx_table().convert(80.0, BASE_CURRENCY, "EUR"))
+        assert itinerary.days[1].activities[0].currency == "EUR"
+        assert itinerary.days[1].activities[0].cost == pytest.approx(in_euros)
+        assert itinerary.budget.total == pytest.approx(before + in_euros - old.cost)
+        
+        calls = []
+        find_options = coordinator.booking_agent.find_options
+        coordinator.booking_agent.find_options = lambda req: calls.append(req) or find_options(req)
+        editor.drop_day(itinerary, 2)
+        
+        assert calls[0].currency == BASE_CURRENCY
+        assert calls[0].budget == pytest.approx(
+            float(load_fx_table().convert(1500.0, "EUR", BASE_CURRENCY)))
+        assert all(b.currency == "EUR" for b in itinerary.bookings)
+    
+    def test_unknown_day(self, planned):
+        coordinator, itinerary = planned
+        with pytest.raises(ValueError):
+            ItineraryEditor(coordinator).drop_day(itinerary, 9)
@@ -0,0 +1,43 @@
+"""
+Unit tests for Pareto-front selection
+"""
+
+import numpy as np
+from pareto import dominance_matrix, non_dominated_sort, pareto_front
+
+
+class TestParetoFront:
+    """Test non-dominated sorting"""
+    
+    def test_dominance(self):
+        dominates = dominance_matrix(np.array([[1.0, 1.0], [2.0, 2.0], [1.0, 1.0]]))
+        assert dominates[0, 1]
+        assert not dominates[1, 0]
+        assert not dominates[0, 2]
+    
+    def test_ranks(self):
+        objectives = np.array([
+            [1.0, 5.0],
+            [2.0, 3.0],
+            [4.0, 1.0],
+            [3.0, 4.0],  # dominated by [2, 3]
+            [5.0, 5.0],  # dominated by everything above
+        ])
+        assert non_dominated_sort(objectives).tolist() == [0, 0, 0, 1, 2]
+    
+    def test_front_matches_brute_force(self):
+        rng = np.random.default_rng(4)
+        objectives = rng.integers(0, 10, (300, 3)).astype(float)
+        front = set(pareto_front(objectives))
+        
+        for i, point in enumerate(objectives):
+            dominated = np.any(np.all(objectives <= point, axis=1)
+                               & np.any(objectives < point, axis=1))
+            if dominated:
+                assert i not in front
+        front_points = {tuple(objectives[i]) for i in front}
+        undominated_points = {
+            tuple(p) for p in objectives
+            if not np.any(np.all(objectives <= p, axis=1) & np.any(objectives < p, axis=1))
+        }
+        assert front_points == undominated_points
@@ -0,0 +1,101 @@
+"""
+Unit tests for the local POI catalog
+"""
+
+import time
+
+import numpy as np
+import pytest
+from poi_catalog import POI, POICatalog, POISearchTool, generate_synthetic_catalog
+from trip_planner_agent import CoordinatorAgent, TripRequirements
+
+
+CITIES = {"Paris, France": (48.8566, 2.3522), "Tokyo, Japan": (35.6762, 139.6503)}
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return generate_synthetic_catalog(CITIES, pois_per_city=5000, seed=1)
+
+
+class TestPOICatalog:
+    """Test catalog indexes and queries"""
+    
+    def test_nearby_matches_brute_force(self, catalog):
+        lat, lon = CITIES["Paris, France"]
+        rows = catalog.nearby(lat, lon, 2.0, categories=["food"], max_price=30.0)
+        
+        everything = np.arange(len(catalog))
+        distances = catalog.distances_km(lat, lon, everything)
+        expected = everything[(distances <= 2.0)
+                              & (catalog.category_codes == catalog.categories.index("food"))
+                              & (catalog.prices <= 30.0)]
+        assert set(rows.tolist()) == set(expected.tolist())
+        assert np.all(np.diff(catalog.distances_km(lat, lon, rows)) >= 0)
+    
+    def test_interest_and_category_indexes(self, catalog):
+        museums = catalog.by_category("museum")
+        assert all(catalog.pois[row].category == "museum" for row in museums[:50])
+        art = catalog.by_interest("art")
+        assert all("art" in catalog.pois[row].interests for row in art[:50])
+    
+    def test_price_range(self, catalog):
+        rows = catalog.in_price_range(10.0, 20.0)
+        assert np.all((catalog.prices[rows] >= 10.0) & (catalog.prices[rows] <= 20.0))
+        assert len(rows) == np.count_nonzero((catalog.prices >= 10.0) & (catalog.prices <= 20.0))
+    
+    def test_jsonl_round_trip(self, tmp_path):
+        pois = [
+            POI(0, "Louvre", "Paris", "museum", 48.8606, 2.3376, 22.0, 4.8, ["art"]),
+            POI(1, "Cafe", "Paris", "cafe", 48.8600, 2.3400, 6.0, 4.1, ["food"]),
+        ]
+        path = tmp_path / "pois.jsonl"
+        POICatalog(pois).save_jsonl(str(path))
+        loaded = POICatalog.from_jsonl(str(path))
+        assert len(loaded) == 2
+        assert loaded.nearby(48.8606, 2.3376, 1.0, interest="art").tolist() == [0]
+    
+    @pytest.mark.perf
+    def test_query_is_fast(self, catalog):
+        lat, lon = CITIES["Tokyo, Japan"]
+        start = time.perf_counter()
+        for _ in range(100):
+            catalog.nearby(lat, lon, 2.0, categories=["food"], max_price=30.0)
+        assert (time.perf_counter() - start) / 100 < 0.005
+
+
+class TestPOISearchTool:
+    """Test the catalog-backed search tool"""
+    
+    def test_search_attractions(self, catalog):
+        tool = POISearchTool(catalog)
+        results = tool.search("top things to do in Paris, France", interests=["art"])
+        assert len(results) == 5
+        assert all(r["category"] not in ("food", "lodging") for r in results)
+        assert "art" in results[0]["snippet"]
+    
+    def test_destination_with_country(self):
+        bare = generate_synthetic_catalog({"Paris": CITIES["Paris, France"]}, pois_per_city=500)
+        results = POISearchTool(bare).search("top things to do in Paris, France")
+        assert len(results) == 5
+        assert len(POISearchTool(bare).search("best restaurants in paris")) == 5
+    
+    def test_unknown_city(self, catalog):
+        assert POISearchTool(catalog).search("hotels in Atlantis") == []
+    
+    def test_plugs_into_coordinator(self, catalog):
+        coordinator = CoordinatorAgent(search_tool=POISearchTool(catalog))
+        requirements = TripRequirements("Paris, France", "2025-06-01", "2025-06-04", 1500.0,
+                                        interests=["art", "history"])
+        itinerary = coordinator.process_request(requirements)
+        assert len(itinerary.days) == 4
+        assert all(len(day.activities) >= 3 for day in itinerary.days)
+    
+    def test_coordinator_handles_unknown_city(self, catalog):
+        coordinator = CoordinatorAgent(search_tool=POISearchTool(catalog))
+        requirements = TripRequirements("Lisbon, Portugal", "2025-06-01", "2025-06-03", 1200.0)
+        itinerary = coordinator.process_request(requirements)
+        assert len(itinerary.days) == 3
+        for day in itinerary.days:
+            meals = [a for a in day.activities if a.category == "meal"]
+            assert [a.cost for a in meals] == [30.0, 45.0]
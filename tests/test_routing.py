@@ -0,0 +1,65 @@
+"""
+Unit tests for itinerary routing
+"""
+
+import time
+
+import numpy as np
+import pytest
+from routing import (
+    haversine_km, haversine_matrix, nearest_neighbor_path, two_opt, optimize_route, travel_minutes
+)
+
+
+def path_length(path, dist):
+    return sum(dist[a, b] for a, b in zip(path, path[1:]))
+
+
+class TestHaversineMatrix:
+    """Test distance matrix"""
+    
+    def test_known_distance(self):
+        # Paris to London
+        dist = haversine_matrix([48.8566, 51.5074], [2.3522, -0.1278])
+        assert dist[0, 1] == pytest.approx(343.5, abs=1.0)
+        assert dist[1, 0] == dist[0, 1]
+        assert np.all(np.diag(dist) == 0)
+    
+    def test_one_to_many_matches_matrix(self):
+        lats, lons = [48.8566, 51.5074, 52.52], [2.3522, -0.1278, 13.405]
+        assert haversine_km(lats[0], lons[0], lats, lons) == pytest.approx(
+            haversine_matrix(lats, lons)[0])
+
+
+class TestRouteOptimization:
+    """Test nearest neighbor + 2-opt ordering"""
+    
+    def test_visits_every_point_once(self):
+        rng = np.random.default_rng(1)
+        dist = haversine_matrix(rng.uniform(48.8, 48.9, 30), rng.uniform(2.2, 2.4, 30))
+        route = optimize_route(dist)
+        assert route[0] == 0
+        assert sorted(route) == list(range(30))
+    
+    def test_two_opt_never_worse(self):
+        rng = np.random.default_rng(2)
+        dist = haversine_matrix(rng.uniform(48.8, 48.9, 40), rng.uniform(2.2, 2.4, 40))
+        greedy = nearest_neighbor_path(dist)
+        improved = two_opt(greedy, dist)
+        assert path_length(improved, dist) <= path_length(greedy, dist) + 1e-9
+    
+    def test_collinear_points(self):
+        lons = [0.0, 0.03, 0.01, 0.02]
+        dist = haversine_matrix([0.0] * 4, lons)
+        assert optimize_route(dist) == [0, 2, 3, 1]
+    
+    @pytest.mark.perf
+    def test_many_stops_fast(self):
+        rng = np.random.default_rng(3)
+        dist = haversine_matrix(rng.uniform(48.8, 48.9, 200), rng.uniform(2.2, 2.4, 200))
+        start = time.perf_counter()
+        optimize_route(dist)
+        assert time.perf_counter() - start < 2.0
+    
+    def test_travel_minutes(self):
+        assert travel_minutes(15.0) == pytest.approx(60.0)
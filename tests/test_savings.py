@@ -0,0 +1,51 @@
+"""
+Unit tests for ranked savings suggestions
+"""
+
+import pytest
+from savings import SubstitutionTable
+from trip_planner_agent import Activity, BookingOption, DayPlan
+
+
+def sample_days():
+    return [DayPlan(1, "2025-06-01", [
+        Activity("Morning: Art Museum", "09:00", 2.5, 40.0, "culture", "Modern art"),
+        Activity("Lunch at Bistro", "12:30", 1.0, 35.0, "meal"),
+        Activity("Afternoon: Boat Tour", "14:00", 2.0, 30.0, "sightseeing"),
+    ], 105.0)]
+
+
+HOTELS = [BookingOption("Downtown Hotel", "hotel", 120.0, 4.5),
+          BookingOption("Budget Inn", "hotel", 75.0, 3.8)]
+
+
+class TestSubstitutionTable:
+    """Test ranking of cheaper swaps"""
+
+    def test_ranked_by_saving_per_preference(self):
+        steps = list(SubstitutionTable().ranked(sample_days()))
+        ratios = [s.ratio for s in steps[:3]]
+        assert ratios == sorted(ratios, reverse=True)
+        assert steps[0].name == "Morning: Free museum hour"
+        assert steps[0].saving == pytest.approx(40.0)
+
+    def test_interests_protect_activities(self):
+        art_lover = SubstitutionTable().top(sample_days(), interests=["art"], limit=3)
+        # The art museum now loses the most preference, so it is suggested last
+        assert [s.name for s in art_lover] == [
+            "Lunch at Bistro (budget menu)",
+            "Afternoon: Self-guided walk",
+            "Morning: Free museum hour",
+        ]
+
+    def test_exhausting_reaches_cheapest(self):
+        steps = list(SubstitutionTable().ranked(sample_days(), nights=3,
+                                                accommodation=360.0, hotels=HOTELS))
+        assert sum(s.saving for s in steps) == pytest.approx(105.0 - 8.0 + 135.0)
+        assert any(s.name == "Budget Inn" and s.day_number is None for s in steps)
+
+    def test_top_one_per_slot(self):
+        top = SubstitutionTable().top(sample_days(), nights=3, accommodation=360.0,
+                                      hotels=HOTELS, limit=10)
+        slots = [(s.day_number, s.activity_index) for s in top]
+        assert len(slots) == len(set(slots)) == 4
@@ -0,0 +1,72 @@
+"""
+Unit tests for synthetic scenarios and the load-test harness
+"""
+
+import pytest
+
+from load_testing import run_load_test
+from scenario_generator import ScenarioDistribution, generate_scenarios
+
+
+class TestScenarioGenerator:
+    """Test seeded scenario generation"""
+
+    def test_same_seed_same_scenarios(self):
+        assert generate_scenarios(50, seed=7) == generate_scenarios(50, seed=7)
+        assert generate_scenarios(50, seed=7) != generate_scenarios(50, seed=8)
+
+    def test_scenarios_follow_distribution(self):
+        distribution = ScenarioDistribution(
+            destinations={"Rome, Italy": (1.0, 1.0)},
+            trip_days=(3, 4),
+            travelers={2: 1.0},
+            interests=("art", "food", "history"),
+            interests_per_trip=(2, 2),
+            accommodation={"hostel": 1.0}
+        )
+        scenarios = generate_scenarios(200, distribution, seed=1)
+
+        assert len(scenarios) == 200
+        for _, requirements in scenarios:
+            assert requirements.destination == "Rome, Italy"
+            assert requirements.num_days in (3, 4)
+            assert requirements.num_travelers == 2
+            assert len(set(requirements.interests)) == 2
+            assert requirements.accommodation_preference == "hostel"
+            assert requirements.budget > 0
+
+    def test_budget_scales_with_median(self):
+        cheap = generate_scenarios(300, ScenarioDistribution(daily_budget_median=100.0), seed=3)
+        lavish = generate_scenarios(300, ScenarioDistribution(daily_budget_median=400.0), seed=3)
+
+        mean = lambda scenarios: sum(r.budget for _, r in scenarios) / len(scenarios)
+        assert mean(lavish) == pytest.approx(4 * mean(cheap), rel=0.05)
+
+    def test_rejects_trips_longer_than_planner_allows(self):
+        with pytest.raises(ValueError):
+            generate_scenarios(1, ScenarioDistribution(trip_days=(2, 60)))
+
+
+class TestLoadTest:
+    """Test driving the coordinator at a target rate"""
+
+    def test_reports_throughput_and_percentiles(self):
+        requests = [r for _, r in generate_scenarios(12, ScenarioDistribution(trip_days=(2, 3)), seed=5)]
+        report = run_load_test(requests, target_rps=40.0, concurrency=4, max_iterations=1)
+
+        assert report.completed == 12
+        assert report.errors == 0
+        assert report.throughput_rps > 0
+        assert 0 < report.p50_ms <= report.p95_ms <= report.p99_ms <= report.max_ms
+
+    def test_counts_failed_requests(self):
+        class Failing:
+            def process_request(self, requirements, max_iterations=3):
+                raise RuntimeError("planner down")
+
+        requests = [r for _, r in generate_scenarios(5, seed=2)]
+        report = run_load_test(requests, target_rps=100.0, coordinator_factory=Failing)
+
+        assert report.errors == 5
+        assert report.completed == 0
+        assert report.p99_ms == 0.0
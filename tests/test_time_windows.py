@@ -0,0 +1,146 @@
+"""
+Unit tests for opening-hours and time-window constraints
+"""
+
+import time
+
+import numpy as np
+import pytest
+from poi_catalog import generate_synthetic_catalog, POISearchTool
+from time_windows import (
+    OpeningHoursIndex, check_day_plan, check_days_batch, check_plans_batch, repair_day_plan
+)
+from trip_planner_agent import (
+    Activity, DayPlan, TripRequirements, MemoryBank, ItineraryPlannerAgent,
+    MockCodeExecutionTool
+)
+
+
+def museum_index():
+    index = OpeningHoursIndex()
+    index.add("Museum", [(600, 1080)], weekdays=range(1, 7))  # closed Mondays
+    index.add("Bistro", [(690, 900), (1080, 1380)])
+    return index
+
+
+class TestOpeningHoursIndex:
+    """Test interval lookups"""
+    
+    def test_is_open(self):
+        index = museum_index()
+        museum, bistro = index.place_id("Museum"), index.place_id("Bistro")
+        result = index.is_open(
+            [museum, museum, museum, bistro, bistro, -1],
+            [2, 2, 0, 2, 2, 2],
+            [600, 540, 700, 720, 960, 0],
+            [750, 690, 800, 810, 1000, 1440]
+        )
+        assert result.tolist() == [True, False, False, True, False, True]
+    
+    def test_next_opening(self):
+        index = museum_index()
+        assert index.next_opening("Bistro", 3, 870, 90) == 1080
+        assert index.next_opening("Museum", 0, 600, 60) is None
+        assert index.next_opening("Unknown", 3, 500, 60) == 500
+
+
+class TestDayPlanChecks:
+    """Test validating and repairing day plans"""
+    
+    def day(self):
+        activities = [
+            Activity("Morning: Museum", "09:00", 2.5, 20.0, "sightseeing", place="Museum"),
+            Activity("Lunch at Bistro", "12:00", 1.5, 30.0, "meal", place="Bistro"),
+        ]
+        return DayPlan(1, "2025-06-03", activities, 50.0)
+    
+    def test_detects_violations(self):
+        kinds = {v.kind for v in check_day_plan(self.day(), museum_index(), weekday=1)}
+        assert kinds == {"closed"}
+    
+    def test_repair(self):
+        repaired = repair_day_plan(self.day(), museum_index(), weekday=1)
+        assert [a.time for a in repaired.activities] == ["10:00", "12:30"]
+        assert check_day_plan(repaired, museum_index(), weekday=1) == []
+    
+    def test_repair_drops_closed_visit(self):
+        repaired = repair_day_plan(self.day(), museum_index(), weekday=0)
+        assert [a.place for a in repaired.activities] == ["Bistro"]
+        assert repaired.total_cost == 30.0
+        assert "Skipped" in repaired.notes
+    
+    def test_batch_matches_single_checks(self):
+        index = museum_index()
+        rng = np.random.default_rng(5)
+        n = 20000
+        starts = np.sort(rng.integers(480, 1200, (n, 2)), axis=1)
+        ends = starts + rng.integers(30, 180, (n, 2))
+        place_ids = np.tile([index.place_id("Museum"), index.place_id("Bistro")], (n, 1))
+        mask = np.ones((n, 2), dtype=bool)
+        
+        valid = check_plans_batch(index, place_ids, starts, ends, mask, weekday=2)
+        
+        for row in range(50):
+            activities = [
+                Activity("Museum", f"{starts[row, 0] // 60:02d}:{starts[row, 0] % 60:02d}",
+                         (ends[row, 0] - starts[row, 0]) / 60, 0.0, "sightseeing", place="Museum"),
+                Activity("Bistro", f"{starts[row, 1] // 60:02d}:{starts[row, 1] % 60:02d}",
+                         (ends[row, 1] - starts[row, 1]) / 60, 0.0, "meal", place="Bistro"),
+            ]
+            expected = not check_day_plan(DayPlan(1, "", activities, 0.0), index, weekday=2)
+            assert valid[row] == expected
+    
+    @pytest.mark.perf
+    def test_batch_is_fast(self):
+        index = museum_index()
+        rng = np.random.default_rng(5)
+        n = 20000
+        starts = np.sort(rng.integers(480, 1200, (n, 2)), axis=1)
+        place_ids = np.tile([index.place_id("Museum"), index.place_id("Bistro")], (n, 1))
+        
+        begin = time.perf_counter()
+        check_plans_batch(index, place_ids, starts, starts + 60, np.ones((n, 2), dtype=bool), weekday=2)
+        assert time.perf_counter() - begin < 0.2
+
+
+class TestPlannerOpeningHours:
+    """Test that planned days respect opening hours from the search tool"""
+    
+    def test_catalog_plan_is_valid(self):
+        catalog = generate_synthetic_catalog({"Paris": (48.8566, 2.3522)}, pois_per_city=2000)
+        planner = ItineraryPlannerAgent(POISearchTool(catalog), MockCodeExecutionTool())
+        requirements = TripRequirements("Paris", "2025-06-02", "2025-06-08", 3000.0,
+                                        interests=["art", "food"])
+        days = planner.plan(requirements, MemoryBank())
+        
+        index = planner.opening_hours_for(requirements)
+        assert len(index) > 0
+        for day, day_date in zip(days, requirements.trip_dates()):
+            assert check_day_plan(day, index, day_date.weekday()) == []
+            assert [a.time for a in day.activities if a.category == "meal"][-1] == "19:00"
+            assert sum(a.category == "meal" for a in day.activities) == 2
+    
+    def test_variants_are_valid(self):
+        catalog = generate_synthetic_catalog({"Paris": (48.8566, 2.3522)}, pois_per_city=2000)
+        planner = ItineraryPlannerAgent(POISearchTool(catalog), MockCodeExecutionTool())
+        requirements = TripRequirements("Paris", "2025-06-02", "2025-06-05", 3000.0,
+                                        interests=["art"])
+        index = planner.opening_hours_for(requirements)
+        weekdays = [d.weekday() for d in requirements.trip_dates()]
+        
+        for days in planner.plan_variants(requirements):
+            assert check_days_batch(days, index, weekdays).all()
+            assert all(sum(a.category == "meal" for a in day.activities) == 2 for day in days)
+    
+    def test_meals_only_at_open_restaurants(self):
+        planner = ItineraryPlannerAgent(POISearchTool(generate_synthetic_catalog({})),
+                                        MockCodeExecutionTool())
+        index = museum_index()
+        index.add("Brunch Bar", [(480, 720)])
+        restaurants = [{"title": "Brunch Bar"}, {"title": "Bistro"}, {"title": "Museum"}]
+        
+        lunch, dinner = planner._build_meals(0, restaurants, index, weekday=0)
+        assert (lunch.place, dinner.place) == ("Bistro", "Bistro")
+        lunch, dinner = planner._build_meals(0, restaurants[:1], index, weekday=0)
+        assert lunch.place == dinner.place == planner.LOCAL_RESTAURANT
+        assert (lunch.cost, dinner.cost) == (planner.LUNCH_COST, planner.DINNER_COST)
@@ -2,12 +2,16 @@
 Unit tests for Trip Planner Agent
 """
 
+import time
+
 import pytest
 from trip_planner_agent import (
     TripRequirements, MemoryBank, SessionState,
     ItineraryPlannerAgent, BudgetAnalyzerAgent, BookingHelperAgent,
-    CoordinatorAgent, MockGoogleSearchTool, MockCodeExecutionTool
+    CoordinatorAgent, MockGoogleSearchTool, MockCodeExecutionTool,
+    clock_to_minutes
 )
+from routing import haversine_matrix
 
 
 class TestTripRequirements:
@@ -35,6 +39,27 @@ class TestTripRequirements:
         )
         assert len(req.interests) == 2
         assert "art" in req.interests
+    
+    def test_trip_length(self):
+        req = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-07",
+            budget=1000.0
+        )
+        assert req.num_days == 7
+        assert req.num_nights == 6
+        assert req.trip_dates()[-1].isoformat() == "2025-06-07"
+    
+    def test_invalid_date_range(self):
+        req = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-05",
+            end_date="2025-06-01",
+            budget=1000.0
+        )
+        with pytest.raises(ValueError):
+            req.trip_dates()
 
 
 class TestMemoryBank:
@@ -92,6 +117,13 @@ class TestMockTools:
         results = tool.search("hotels in Paris")
         assert len(results) > 0
     
+    def test_search_results_near_real_city(self):
+        results = MockGoogleSearchTool().search("top things to do in Paris, France")
+        lats = [r["lat"] for r in results]
+        lons = [r["lon"] for r in results]
+        # Within a few km of central Paris, not somewhere random on the globe
+        assert haversine_matrix(lats + [48.8566], lons + [2.3522])[-1].max() < 6.0
+    
     def test_code_execution(self):
         tool = MockCodeExecutionTool()
         result = tool.execute("calculate budget")
@@ -125,6 +157,96 @@ class TestItineraryPlannerAgent:
         assert len(days) == 3
         assert all(len(day.activities) > 0 for day in days)
         assert all(day.total_cost > 0 for day in days)
+    
+    def test_plan_follows_date_range(self):
+        search_tool = MockGoogleSearchTool()
+        agent = ItineraryPlannerAgent(search_tool, MockCodeExecutionTool())
+        calls = []
+        original_search = search_tool.search
+        search_tool.search = lambda *args, **kwargs: calls.append(args) or original_search(*args, **kwargs)
+        
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-28",
+            end_date="2025-07-11",
+            budget=5000.0
+        )
+        
+        days = agent.plan(requirements, MemoryBank())
+        assert len(days) == 14
+        assert days[0].date == "2025-06-28"
+        assert days[-1].date == "2025-07-11"
+        assert len(calls) == 2
+        
+        agent.plan(requirements, MemoryBank())
+        assert len(calls) == 2
+    
+    def test_search_cache_is_bounded(self):
+        agent = ItineraryPlannerAgent(MockGoogleSearchTool(), MockCodeExecutionTool())
+        agent.SEARCH_CACHE_SIZE = 2
+        trips = [TripRequirements(city, "2025-06-01", "2025-06-02", 1000.0)
+                 for city in ("Paris", "Rome", "Paris", "Tokyo")]
+        for requirements in trips:
+            agent.plan(requirements, MemoryBank())
+        
+        # Paris was used more recently than Rome, so Rome was dropped
+        assert [key[0] for key in agent._search_cache] == ["paris", "tokyo"]
+    
+    def test_plan_fits_tight_budget(self):
+        agent = ItineraryPlannerAgent(MockGoogleSearchTool(), MockCodeExecutionTool())
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-03",
+            budget=580.0,
+            interests=["art", "history"]
+        )
+        
+        days = agent.plan(requirements, MemoryBank())
+        discretionary = 580.0 - 120.0 * 2 - 100.0
+        assert sum(day.total_cost for day in days) <= discretionary
+        assert all(len(day.activities) >= 3 for day in days)
+    
+    def test_plan_inserts_travel_time(self):
+        agent = ItineraryPlannerAgent(MockGoogleSearchTool(), MockCodeExecutionTool())
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-14",
+            budget=5000.0
+        )
+        
+        for day in agent.plan(requirements, MemoryBank()):
+            assert all(a.latitude is not None for a in day.activities)
+            for previous, current in zip(day.activities, day.activities[1:]):
+                previous_end = clock_to_minutes(previous.time) + previous.duration_hours * 60
+                assert clock_to_minutes(current.time) >= previous_end + current.travel_minutes - 1
+    
+    def test_schedule_routes_many_stops(self):
+        from trip_planner_agent import Activity
+        
+        agent = ItineraryPlannerAgent(MockGoogleSearchTool(), MockCodeExecutionTool())
+        # Six short stops on a line east of the start, listed in a zig-zag order
+        offsets = [0.05, 0.01, 0.04, 0.02, 0.06, 0.03]
+        attractions = [Activity(name=f"Stop {n}", time="", duration_hours=1.0, cost=0.0,
+                                category="sightseeing", latitude=48.85, longitude=2.30 + offset)
+                       for n, offset in enumerate(offsets)]
+        meals = [Activity(name=name, time="", duration_hours=1.0, cost=0.0, category="meal",
+                          latitude=48.85, longitude=2.30 + offset)
+                 for name, offset in (("Lunch", 0.035), ("Dinner", 0.0))]
+        
+        day = agent._schedule_day(attractions, meals, (48.85, 2.30))
+        stops = [a for a in day if a.category != "meal"]
+        
+        assert len(day) == 8
+        assert sorted(a.name.split(": ")[-1] for a in stops) == sorted(a.name for a in attractions)
+        assert [a.name for a in day if a.category == "meal"] == ["Lunch", "Dinner"]
+        # Each leg of the day moves steadily east: no doubling back between stops
+        morning = [a.longitude for a in day[:day.index(next(a for a in day if a.name == "Lunch"))]]
+        assert morning == sorted(morning)
+        for previous, current in zip(day, day[1:]):
+            previous_end = clock_to_minutes(previous.time) + previous.duration_hours * 60
+            assert clock_to_minutes(current.time) >= previous_end + current.travel_minutes - 1
 
 
 class TestBudgetAnalyzerAgent:
@@ -162,6 +284,55 @@ class TestBudgetAnalyzerAgent:
         breakdown = agent.analyze(requirements, days)
         assert breakdown.total > 0
         assert isinstance(breakdown.within_budget, bool)
+    
+    def test_repair_fits_budget(self):
+        planner = ItineraryPlannerAgent(MockGoogleSearchTool(), MockCodeExecutionTool())
+        agent = BudgetAnalyzerAgent(MockCodeExecutionTool())
+        bookings = BookingHelperAgent(MockGoogleSearchTool()).find_options(
+            TripRequirements("Paris", "2025-06-01", "2025-06-04", 0.0))
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-04",
+            budget=500.0
+        )
+        
+        days = planner.plan(requirements, MemoryBank())
+        breakdown = agent.analyze(requirements, days, bookings=bookings)
+        assert not breakdown.within_budget
+        assert any("Budget Inn" in s for s in breakdown.savings_suggestions)
+        
+        breakdown = agent.repair(requirements, days, breakdown, bookings)
+        assert breakdown.within_budget
+        assert breakdown.repair_steps == len(breakdown.repairs) > 0
+        assert "Budget Inn at $" in breakdown.repairs[0]
+        assert "/night (saves $" in breakdown.repairs[0]
+        assert breakdown.savings_suggestions == []  # The swaps suggested before are made
+        assert breakdown.total == pytest.approx(
+            breakdown.accommodation + breakdown.activities
+            + breakdown.meals + breakdown.transportation)
+        assert breakdown.total == pytest.approx(
+            breakdown.accommodation + breakdown.transportation
+            + sum(day.total_cost for day in days))
+    
+    def test_repair_reports_infeasible_budget(self):
+        planner = ItineraryPlannerAgent(MockGoogleSearchTool(), MockCodeExecutionTool())
+        agent = BudgetAnalyzerAgent(MockCodeExecutionTool())
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-04",
+            budget=100.0
+        )
+        
+        days = planner.plan(requirements, MemoryBank())
+        breakdown = agent.repair(requirements, days, agent.analyze(requirements, days), [])
+        assert not breakdown.within_budget
+        assert all(a.cost <= agent.BUDGET_MEAL_COST for day in days for a in day.activities)
+        assert "short of the cheapest possible plan" in breakdown.savings_suggestions[-1]
+        
+        agent.repair(requirements, days, breakdown, [])
+        assert sum("short of" in s for s in breakdown.savings_suggestions) == 1
 
 
 class TestBookingHelperAgent:
@@ -216,6 +387,113 @@ class TestCoordinatorAgent:
         assert itinerary.budget.total > 0
         assert len(itinerary.bookings) > 0
         assert itinerary.iteration_count <= 2
+    
+    def test_over_budget_converges_in_one_iteration(self):
+        coordinator = CoordinatorAgent()
+        
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-07",
+            budget=900.0
+        )
+        
+        itinerary = coordinator.process_request(requirements, max_iterations=3)
+        assert itinerary.iteration_count == 1
+        assert itinerary.budget.within_budget
+        assert itinerary.budget.repair_steps > 0
+    
+    def test_retries_booking_search_without_lodging(self):
+        coordinator = CoordinatorAgent()
+        find_options = coordinator.booking_agent.find_options
+        calls = []
+        
+        def flaky(requirements):
+            calls.append(requirements)
+            return [] if len(calls) == 1 else find_options(requirements)
+        coordinator.booking_agent.find_options = flaky
+        
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-03", 1500.0)
+        itinerary = coordinator.process_request(requirements, max_iterations=3)
+        assert itinerary.iteration_count == 2
+        assert any(b.type == "hotel" for b in itinerary.bookings)
+        
+        calls.clear()
+        itinerary = coordinator.process_request(requirements, max_iterations=1)
+        assert len(calls) == 1 and itinerary.bookings == []
+    
+    def test_anytime_returns_best_so_far(self):
+        coordinator = CoordinatorAgent()
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-05",
+            budget=1500.0,
+            interests=["art"]
+        )
+        
+        itinerary = coordinator.process_request_anytime(requirements, time_budget_s=5.0)
+        assert itinerary.partial_sections == []
+        assert itinerary.search_completion == 1.0
+        assert len(itinerary.days) == 5
+        assert itinerary.budget.within_budget
+    
+    def test_anytime_marks_pending_bookings(self):
+        class SlowHotelSearch(MockGoogleSearchTool):
+            def search(self, query, interests=None, num_results=5):
+                if "hotel" in query:
+                    time.sleep(1.0)
+                return super().search(query, interests, num_results)
+        
+        coordinator = CoordinatorAgent(search_tool=SlowHotelSearch())
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-03",
+            budget=1500.0
+        )
+        
+        # The hotel search takes longer than the whole time budget
+        itinerary = coordinator.process_request_anytime(requirements, time_budget_s=0.3)
+        assert itinerary.partial_sections == ["bookings"]
+        assert itinerary.bookings == []
+        assert len(itinerary.days) == 3
+    
+    def test_process_request_alternatives(self):
+        coordinator = CoordinatorAgent()
+        
+        requirements = TripRequirements(
+            destination="Paris",
+            start_date="2025-06-01",
+            end_date="2025-06-05",
+            budget=1500.0,
+            interests=["art", "history"]
+        )
+        
+        alternatives = coordinator.process_request_alternatives(requirements)
+        assert 1 < len(alternatives) <= 3
+        assert alternatives[0].label.startswith("cheapest")
+        assert all(len(a.days) == 5 for a in alternatives)
+        costs = [a.budget.total for a in alternatives]
+        assert costs[0] == min(costs)
+    
+    def test_alternatives_keep_every_label(self):
+        coordinator = CoordinatorAgent()
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-14", 3000.0,
+                                        interests=["art", "food"])
+        
+        alternatives = coordinator.process_request_alternatives(requirements)
+        labels = [label for a in alternatives for label in a.label.split(", ")]
+        assert {"cheapest", "best match", "most relaxed"} <= set(labels)
+        assert len(labels) == len(set(labels))
+    
+    def test_variants_do_not_share_activity_lists(self):
+        planner = CoordinatorAgent().itinerary_agent
+        requirements = TripRequirements("Paris", "2025-06-01", "2025-06-03", 1500.0)
+        variants = planner.plan_variants(requirements)
+        
+        lists = [id(day.activities) for days in variants for day in days]
+        assert len(lists) == len(set(lists))
 
 
 if __name__ == "__main__":